@@ -0,0 +1,67 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks rodam a partir da raiz do projeto:
+
+    python -m benchmarks.bench_principal_cache
+"""
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Sequence
+
+from tortoise import Tortoise
+
+BENCH_MODELS = ['src.models.user']
+
+
+@asynccontextmanager
+async def bench_database(
+    db_url: str = 'sqlite://:memory:', models: Sequence[str] = ()
+):
+    """Inicializa o Tortoise num banco isolado para o benchmark."""
+    await Tortoise.init(
+        db_url=db_url,
+        modules={'models': list(models or BENCH_MODELS)},
+    )
+    await Tortoise.generate_schemas()
+    try:
+        yield
+    finally:
+        await Tortoise.close_connections()
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 em milissegundos."""
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else []
+
+    def pick(p: int) -> float:
+        return (cuts[p - 1] if cuts else ordered[0]) * 1000
+
+    return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99)}
+
+
+def report(title: str, operations: int, elapsed: float, **extra) -> None:
+    """Imprime uma linha de resultado padronizada."""
+    rate = operations / elapsed if elapsed else float('inf')
+    details = ' '.join(
+        f'{key}={value:.3f}' if isinstance(value, float) else f'{key}={value}'
+        for key, value in extra.items()
+    )
+    print(f'{title:<40} {operations:>9} ops  {rate:>12.1f} ops/s  {details}')
+
+
+class Timer:
+    """Cronômetro simples baseado em perf_counter."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
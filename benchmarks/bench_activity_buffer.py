@@ -0,0 +1,202 @@
+"""
+Visualizações e favoritos: vazão de ingestão (eventos/s) com o buffer
+write-behind x uma escrita no banco por evento, no SQLite em arquivo.
+
+Os eventos seguem uma distribuição de cauda longa (poucos serviços e
+usuários concentram a maior parte), então muitas chaves se repetem e são
+consolidadas no buffer. No fim, confere que nenhuma visualização se
+perdeu e mede o histórico recente (banco + buffer).
+
+    python -m benchmarks.bench_activity_buffer
+    BENCH_EVENTS=1000000 python -m benchmarks.bench_activity_buffer
+
+Retorna código de saída 1 se o total gravado não bater com o anotado.
+"""
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from tortoise import connections
+from tortoise.expressions import F
+
+from benchmarks._common import Timer, bench_database, percentiles, report
+from src.models.activity import Favorite, ServiceView
+from src.services_g_turismo.activity import ActivityBuffer
+
+EVENTS = int(os.getenv('BENCH_EVENTS', '200000'))
+DIRECT_EVENTS = int(os.getenv('BENCH_DIRECT_EVENTS', '5000'))
+USERS = 20000
+SERVICES = 5000
+FAVORITE_RATIO = 0.05
+YIELD_EVERY = 100   # eventos por "requisição" antes de ceder o event loop
+HISTORY_SAMPLES = 500
+NOW = '2025-01-01 00:00:00+00:00'
+
+# (usuário, serviço, favorito: None = visualização)
+Event = Tuple[int, int, object]
+
+
+def events(count: int, seed: int) -> List[Event]:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        user_id = min(int(rng.paretovariate(1.2)), USERS)
+        service_id = min(int(rng.paretovariate(1.1)), SERVICES)
+        if rng.random() < FAVORITE_RATIO:
+            result.append((user_id, service_id, rng.random() < 0.7))
+        else:
+            result.append((user_id, service_id, None))
+    return result
+
+
+def seed(path: str) -> None:
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        'INSERT INTO users (username, email, password, email_search_hash, '
+        'status, verified_account, created_in, updated_in) '
+        'VALUES (?, ?, ?, ?, 1, 1, ?, ?)',
+        (
+            (f'viajante{i}', f'v{i}@example.com', 'x', f'v{i}', NOW, NOW)
+            for i in range(USERS)
+        ),
+    )
+    connection.executemany(
+        'INSERT INTO services (kind, title, description, city, price, '
+        'currency, duration_days, published, created_in, updated_in, '
+        'owner_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            ('tour', f'Serviço {i}', '', 'Recife', '150.00', 'BRL', 1, 1,
+             NOW, NOW, 1)
+            for i in range(SERVICES)
+        ),
+    )
+    connection.commit()
+    connection.close()
+
+
+async def direct_writes(stream: List[Event]) -> None:
+    """Uma escrita (autocommit) por evento, como sem o buffer."""
+    for user_id, service_id, favorite in stream:
+        now = datetime.now(timezone.utc)
+        if favorite is None:
+            updated = await ServiceView.filter(
+                user_id=user_id, service_id=service_id
+            ).update(views=F('views') + 1, last_viewed_in=now)
+            if not updated:
+                await ServiceView.create(
+                    user_id=user_id,
+                    service_id=service_id,
+                    views=1,
+                    last_viewed_in=now,
+                )
+        elif favorite:
+            await Favorite.get_or_create(
+                user_id=user_id,
+                service_id=service_id,
+                defaults={'created_in': now},
+            )
+        else:
+            await Favorite.filter(
+                user_id=user_id, service_id=service_id
+            ).delete()
+
+
+async def buffered_writes(
+    buffer: ActivityBuffer, stream: List[Event]
+) -> None:
+    """Rotas anotando no buffer; a gravação roda em background."""
+    for position, (user_id, service_id, favorite) in enumerate(stream, 1):
+        if favorite is None:
+            buffer.record_view(user_id, service_id)
+        else:
+            buffer.set_favorite(user_id, service_id, favorite)
+        if position % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+
+
+async def main() -> int:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_activity.sqlite3')
+    stream = events(EVENTS, 5)
+    views = sum(1 for _, _, favorite in stream if favorite is None)
+
+    # Só a anotação em memória (custo na rota)
+    memory = ActivityBuffer(max_pending=EVENTS)
+    with Timer() as timer:
+        for user_id, service_id, favorite in stream:
+            if favorite is None:
+                memory.record_view(user_id, service_id)
+            else:
+                memory.set_favorite(user_id, service_id, favorite)
+    report('anotação no buffer (memória)', EVENTS, timer.elapsed)
+    print(
+        f'  {memory.pending} chaves para {EVENTS} eventos '
+        f'({EVENTS / max(1, memory.pending):.1f} eventos por linha)'
+    )
+
+    async with bench_database(
+        db_url=f'sqlite://{path}',
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.activity',
+        ],
+    ):
+        seed(path)
+
+        direct = events(DIRECT_EVENTS, 9)
+        with Timer() as timer:
+            await direct_writes(direct)
+        report('escrita direta por evento', DIRECT_EVENTS, timer.elapsed)
+        await ServiceView.all().delete()
+        await Favorite.all().delete()
+
+        buffer = ActivityBuffer(max_pending=EVENTS)
+        started = time.perf_counter()
+        buffer.start()
+        await buffered_writes(buffer, stream)
+        accepted = time.perf_counter() - started
+        # Inclui a gravação final (como no desligamento)
+        await buffer.stop()
+        durable = time.perf_counter() - started
+        report('buffer write-behind (resposta)', EVENTS, accepted)
+        report(
+            'buffer write-behind (até gravar)',
+            EVENTS,
+            durable,
+            linhas=buffer.flushed,
+            falhas=buffer.failed,
+        )
+
+        # Histórico com eventos ainda no buffer
+        rng = random.Random(11)
+        for user_id, service_id, _ in events(EVENTS // 10, 13):
+            buffer.record_view(user_id, service_id)
+        timings = []
+        for _ in range(HISTORY_SAMPLES):
+            user_id = min(int(rng.paretovariate(1.2)), USERS)
+            start = time.perf_counter()
+            await buffer.recent_history(user_id, 20)
+            timings.append(time.perf_counter() - start)
+        report(
+            'histórico recente (banco + buffer)',
+            HISTORY_SAMPLES,
+            sum(timings),
+            **percentiles(timings),
+        )
+
+        rows = await connections.get('default').execute_query_dict(
+            'SELECT COALESCE(SUM(views), 0) AS total FROM service_views'
+        )
+        written = int(rows[0]['total'])
+        print(f'  visualizações gravadas: {written} de {views}')
+        return 0 if written == views else 1
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
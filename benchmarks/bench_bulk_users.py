@@ -0,0 +1,82 @@
+"""
+Linhas/s da importação em massa (bulk_create em lotes) x o caminho da API
+(exists + User.create por linha), e da exportação em streaming.
+
+As senhas já vêm com hash para medir só o caminho do banco; o custo do
+bcrypt escala com o número de processos do pool.
+
+    python -m benchmarks.bench_bulk_users
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+from benchmarks._common import Timer, bench_database, report
+from src.auth.bulk_users import export_users, import_users
+from src.global_utils.hashed_email import create_email_search_hash
+from src.models.user import User
+
+ROWS = 20000
+ONE_BY_ONE_ROWS = 2000
+FAKE_HASH = '$2b$12$' + 'x' * 53
+
+
+def write_ndjson(path: str, rows: int, prefix: str) -> None:
+    with open(path, 'w') as handle:
+        for i in range(rows):
+            record = {
+                'username': f'{prefix}{i}',
+                'email': f'{prefix}{i}@example.com',
+                'password_hash': FAKE_HASH,
+            }
+            handle.write(json.dumps(record) + '\n')
+
+
+async def one_by_one(rows: int) -> None:
+    for i in range(rows):
+        email = f'single{i}@example.com'
+        if await User.by_email(email).exists():
+            continue
+        await User.create(
+            username=f'single{i}',
+            email=email,
+            password=FAKE_HASH,
+            email_search_hash=create_email_search_hash(email),
+        )
+
+
+async def main() -> None:
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'bench_bulk.sqlite3')
+
+    async with bench_database(db_url=f'sqlite://{db_path}'):
+        with Timer() as timer:
+            await one_by_one(ONE_BY_ONE_ROWS)
+        report('uma linha por vez (API)', ONE_BY_ONE_ROWS, timer.elapsed)
+
+        source = os.path.join(workdir, 'users.ndjson')
+        write_ndjson(source, ROWS, 'bulk')
+        result = await import_users(source, pre_hashed=True)
+        report(
+            'importação em lotes',
+            result.read,
+            result.elapsed,
+            inseridos=result.inserted,
+        )
+
+        # Reimportar o mesmo arquivo: tudo vira duplicado
+        result = await import_users(source, pre_hashed=True)
+        report(
+            'reimportação (duplicados)',
+            result.read,
+            result.elapsed,
+            duplicados=result.duplicated,
+        )
+
+        result = await export_users(os.path.join(workdir, 'export.ndjson'))
+        report('exportação em streaming', result.read, result.elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
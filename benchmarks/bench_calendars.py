@@ -0,0 +1,167 @@
+"""
+Busca por datas de viagem sobre 1M de serviços: calendários em bitmap
+(matriz NumPy N x 46 por ano) x tabela com uma linha por dia no SQLite
+(GROUP BY ... HAVING COUNT(*) = dias).
+
+    python -m benchmarks.bench_calendars
+    BENCH_ROWS=200000 BENCH_SQL_ROWS=5000 python -m benchmarks.bench_calendars
+"""
+import os
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from benchmarks._common import Timer, percentiles, report
+from src.services_g_turismo.calendars import (CALENDAR_BYTES, CALENDAR_DAYS,
+                                              CalendarIndex, day_index)
+
+ROWS = int(os.getenv('BENCH_ROWS', '1000000'))
+SQL_ROWS = int(os.getenv('BENCH_SQL_ROWS', '20000'))
+SAMPLES = 50
+SQL_SAMPLES = 5
+YEARS = (2025, 2026)
+AVAILABLE_RATIO = 0.9
+UPDATES = 20000
+
+RANGES: List[Tuple[str, date, date]] = [
+    ('fim de semana', date(2025, 11, 14), date(2025, 11, 17)),
+    ('uma semana', date(2025, 7, 5), date(2025, 7, 12)),
+    ('réveillon (vira o ano)', date(2025, 12, 20), date(2026, 1, 5)),
+    ('um mês', date(2026, 1, 5), date(2026, 2, 5)),
+]
+# Janela gravada na tabela por dia (cobre as faixas acima no SQL)
+SQL_FIRST_DAY = date(2025, 7, 1)
+SQL_DAYS = 220
+
+
+def random_calendars(rows: int, seed: int) -> np.ndarray:
+    """Bitmaps aleatórios (rows x 46), gerados em lotes para poupar memória."""
+    rng = np.random.default_rng(seed)
+    packed = np.empty((rows, CALENDAR_BYTES), dtype=np.uint8)
+    for first in range(0, rows, 100000):
+        last = min(rows, first + 100000)
+        bits = rng.random((last - first, CALENDAR_DAYS)) < AVAILABLE_RATIO
+        packed[first:last] = np.packbits(bits, axis=1, bitorder='little')
+    return packed
+
+
+def load_index(calendars: dict, rows: int) -> CalendarIndex:
+    index = CalendarIndex(capacity=rows)
+    for year, packed in calendars.items():
+        for service_id in range(1, rows + 1):
+            index.set(service_id, year, packed[service_id - 1].tobytes())
+    return index
+
+
+def build_sql(rows: int, calendars: dict) -> sqlite3.Connection:
+    connection = sqlite3.connect(':memory:')
+    connection.execute(
+        'CREATE TABLE service_inventory (service_id INTEGER, day TEXT, '
+        'remaining INTEGER, PRIMARY KEY (service_id, day)) WITHOUT ROWID'
+    )
+    connection.execute(
+        'CREATE INDEX idx_inventory_day ON service_inventory (day, remaining)'
+    )
+
+    bits = {
+        year: np.unpackbits(packed[:rows], axis=1, bitorder='little')
+        for year, packed in calendars.items()
+    }
+
+    def generate():
+        for offset in range(SQL_DAYS):
+            day = SQL_FIRST_DAY + timedelta(days=offset)
+            column = bits[day.year][:, day_index(day)]
+            iso = day.isoformat()
+            for service_id in range(1, rows + 1):
+                yield service_id, iso, int(column[service_id - 1])
+
+    connection.executemany(
+        'INSERT INTO service_inventory VALUES (?, ?, ?)', generate()
+    )
+    connection.commit()
+    return connection
+
+
+SQL_QUERY = """
+SELECT service_id FROM service_inventory
+WHERE day >= ? AND day < ? AND remaining > 0
+GROUP BY service_id
+HAVING COUNT(*) = ?
+"""
+
+
+def sample(label: str, samples: int, func: Callable[[], object]) -> object:
+    timings = []
+    result = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    report(label, samples, sum(timings), **percentiles(timings))
+    return result
+
+
+def main() -> None:
+    calendars = {
+        year: random_calendars(ROWS, seed) for seed, year in enumerate(YEARS)
+    }
+    with Timer() as timer:
+        index = load_index(calendars, ROWS)
+    report('carga dos bitmaps', ROWS * len(YEARS), timer.elapsed)
+    megabytes = sum(m.nbytes for m in index.years.values()) / 2**20
+    print(
+        f'  {CALENDAR_BYTES} bytes por serviço/ano; '
+        f'{megabytes:.1f} MiB para {ROWS} serviços x {len(YEARS)} anos'
+    )
+
+    for label, start, end in RANGES:
+        found = sample(
+            f'bitmap NumPy: {label}',
+            SAMPLES,
+            lambda: index.available(start, end),
+        )
+        sample(
+            f'  + bitmap das facetas: {label}',
+            SAMPLES,
+            lambda: index.available_bitmap(start, end),
+        )
+        print(f'  {len(found)} serviços disponíveis')
+
+    # Atualização incremental de um serviço (o que a reserva dispara)
+    rng = np.random.default_rng(7)
+    bitmap = random_calendars(1, 99)[0].tobytes()
+    targets = rng.integers(1, ROWS + 1, UPDATES)
+    with Timer() as timer:
+        for service_id in targets.tolist():
+            index.set(service_id, YEARS[0], bitmap)
+    report('atualização em memória', UPDATES, timer.elapsed)
+
+    # Mesma busca numa tabela com uma linha por dia (amostra menor)
+    with Timer() as timer:
+        connection = build_sql(SQL_ROWS, calendars)
+    report('carga da tabela por dia (SQL)', SQL_ROWS * SQL_DAYS, timer.elapsed)
+    small = load_index(calendars, SQL_ROWS)
+
+    for label, start, end in RANGES:
+        days = (end - start).days
+        sample(
+            f'SQL por dia ({SQL_ROWS}): {label}',
+            SQL_SAMPLES,
+            lambda: connection.execute(
+                SQL_QUERY, (start.isoformat(), end.isoformat(), days)
+            ).fetchall(),
+        )
+        sample(
+            f'bitmap NumPy ({SQL_ROWS}): {label}',
+            SAMPLES,
+            lambda: small.available(start, end),
+        )
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
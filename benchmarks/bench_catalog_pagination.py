@@ -0,0 +1,101 @@
+"""
+Latência da listagem do catálogo na página 1 e na página 10.000:
+paginação por cursor (keyset) x OFFSET. Mede também o streaming NDJSON.
+
+    python -m benchmarks.bench_catalog_pagination
+"""
+import asyncio
+import time
+from decimal import Decimal
+
+from benchmarks._common import Timer, bench_database, percentiles, report
+from src.models.service import Service, ServiceKind
+from src.models.user import User
+from src.services_g_turismo.catalog import (SERVICE_FIELDS, list_services,
+                                            published_services,
+                                            stream_services)
+
+PAGE_SIZE = 20
+DEEP_PAGE = 10000
+ROWS = PAGE_SIZE * (DEEP_PAGE + 1)
+SAMPLES = 50
+KINDS = list(ServiceKind)
+
+
+async def seed() -> None:
+    owner = await User.create(
+        username='agencia',
+        email='agencia@example.com',
+        password='x',
+        email_search_hash='agencia',
+    )
+    batch = 5000
+    for start in range(0, ROWS, batch):
+        await Service.bulk_create(
+            [
+                Service(
+                    owner_id=owner.id,
+                    kind=KINDS[i % len(KINDS)],
+                    title=f'Serviço {i}',
+                    city=f'Cidade {i % 50}',
+                    price=Decimal('100.00'),
+                )
+                for i in range(start, min(start + batch, ROWS))
+            ]
+        )
+
+
+async def offset_page(page: int) -> list:
+    return (
+        await published_services()
+        .order_by('-id')
+        .offset(page * PAGE_SIZE)
+        .limit(PAGE_SIZE)
+        .values(*SERVICE_FIELDS)
+    )
+
+
+async def sample(label: str, func) -> None:
+    samples = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    report(label, SAMPLES, sum(samples), **percentiles(samples))
+
+
+async def main() -> None:
+    async with bench_database(
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.review',
+        ]
+    ):
+        await seed()
+
+        # Cursor da página 10.000: o id logo acima da primeira linha dela
+        top_id = (await Service.all().order_by('-id').first()).id
+        deep_cursor = top_id - DEEP_PAGE * PAGE_SIZE + 1
+
+        await sample(
+            'keyset página 1', lambda: list_services(None, PAGE_SIZE)
+        )
+        await sample(
+            f'keyset página {DEEP_PAGE}',
+            lambda: list_services(deep_cursor, PAGE_SIZE),
+        )
+        await sample('OFFSET página 1', lambda: offset_page(0))
+        await sample(
+            f'OFFSET página {DEEP_PAGE}', lambda: offset_page(DEEP_PAGE)
+        )
+
+        with Timer() as timer:
+            lines = 0
+            async for chunk in stream_services():
+                lines += chunk.count('\n')
+        report('streaming NDJSON (catálogo inteiro)', lines, timer.elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
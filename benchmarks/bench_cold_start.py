@@ -0,0 +1,63 @@
+"""
+Tempo de startup por worker: generate_schemas a cada boot (antes) x
+migrate() com a checagem de versão de uma linha (depois).
+
+    python -m benchmarks.bench_cold_start
+"""
+import asyncio
+import os
+import tempfile
+
+from tortoise import Tortoise
+
+from benchmarks._common import Timer, report
+from src.database.init_database import TORTOISE_ORM
+from src.database.migrations import migrate
+
+WORKERS = 8
+
+
+def config(path: str) -> dict:
+    return {
+        'connections': {
+            'default': {
+                'engine': 'src.database.backends.sqlite',
+                'credentials': {'file_path': path},
+            }
+        },
+        'apps': TORTOISE_ORM['apps'],
+    }
+
+
+async def boot(path: str, use_migrations: bool) -> None:
+    await Tortoise.init(config=config(path))
+    try:
+        if use_migrations:
+            await migrate()
+        else:
+            await Tortoise.generate_schemas()
+    finally:
+        await Tortoise.close_connections()
+
+
+async def main() -> None:
+    for label, use_migrations in (
+        ('generate_schemas', False),
+        ('migrate (versão)', True),
+    ):
+        path = os.path.join(tempfile.mkdtemp(), 'bench_boot.sqlite3')
+        # Primeiro boot cria o banco; os seguintes simulam os workers
+        await boot(path, use_migrations)
+        with Timer() as timer:
+            for _ in range(WORKERS):
+                await boot(path, use_migrations)
+        report(
+            f'startup por worker ({label})',
+            WORKERS,
+            timer.elapsed,
+            ms_por_worker=timer.elapsed / WORKERS * 1000,
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
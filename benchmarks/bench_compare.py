@@ -0,0 +1,89 @@
+"""
+Tempo de resposta do /service/compare conforme N cresce: uma consulta
+IN (...) + pontuação vetorizada (NumPy).
+
+    python -m benchmarks.bench_compare
+"""
+import asyncio
+import random
+import time
+from decimal import Decimal
+
+from benchmarks._common import bench_database, percentiles, report
+from src.models.service import Service, ServiceKind
+from src.models.user import User
+from src.services_g_turismo.catalog import services_by_ids
+from src.services_g_turismo.compare import compare_services, score_matrix
+
+ROWS = 20000
+SAMPLES = 50
+SIZES = (2, 10, 50, 100, 300)
+AMENITIES = [
+    'wifi', 'piscina', 'cafe-da-manha', 'estacionamento', 'ar-condicionado',
+    'pet-friendly', 'academia', 'traslado', 'guia-bilingue', 'seguro',
+]
+
+
+async def seed() -> None:
+    rng = random.Random(11)
+    owner = await User.create(
+        username='agencia',
+        email='agencia@example.com',
+        password='x',
+        email_search_hash='agencia',
+    )
+    await Service.bulk_create(
+        [
+            Service(
+                owner_id=owner.id,
+                kind=rng.choice(list(ServiceKind)),
+                title=f'Serviço {i}',
+                city='Recife',
+                price=Decimal(rng.randint(50, 5000)),
+                duration_days=rng.randint(1, 10),
+                amenities=rng.sample(AMENITIES, rng.randint(0, 6)),
+                latitude=rng.uniform(-9, -7),
+                longitude=rng.uniform(-36, -34),
+            )
+            for i in range(ROWS)
+        ],
+        batch_size=5000,
+    )
+
+
+async def sample(label: str, func) -> None:
+    timings = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    report(label, SAMPLES, sum(timings), **percentiles(timings))
+
+
+async def main() -> None:
+    async with bench_database(
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.review',
+        ]
+    ):
+        await seed()
+        rng = random.Random(5)
+
+        for size in SIZES:
+            ids = rng.sample(range(1, ROWS + 1), size)
+            rows = await services_by_ids(ids)
+
+            async def scoring_only() -> None:
+                score_matrix(rows, -8.05, -34.9)
+
+            await sample(f'pontuação NumPy (N={size})', scoring_only)
+            await sample(
+                f'compare completo (N={size})',
+                lambda: compare_services(ids, -8.05, -34.9),
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
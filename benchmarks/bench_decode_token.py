@@ -0,0 +1,28 @@
+"""
+Decodificações por segundo do DecodeToken, com e sem o cache de tokens.
+
+    python -m benchmarks.bench_decode_token
+"""
+from benchmarks._common import Timer, report
+from src.service.jwt.auth import create_access_token
+from src.service.jwt.jwt_decode_token import (VERIFIED_TOKEN_CACHE,
+                                              DecodeToken)
+
+ITERATIONS = 50000
+
+
+def main() -> None:
+    token = create_access_token('1')
+    default_size = VERIFIED_TOKEN_CACHE.maxsize
+
+    for label, maxsize in (('sem cache', 0), ('com cache', default_size)):
+        VERIFIED_TOKEN_CACHE.clear()
+        VERIFIED_TOKEN_CACHE.maxsize = maxsize
+        with Timer() as timer:
+            for _ in range(ITERATIONS):
+                DecodeToken(token)
+        report(f'DecodeToken ({label})', ITERATIONS, timer.elapsed)
+
+
+if __name__ == '__main__':
+    main()
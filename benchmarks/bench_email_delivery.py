@@ -0,0 +1,70 @@
+"""
+Mensagens/s entregues a um servidor SMTP local (aiosmtpd).
+
+Compara uma conexão por mensagem (comportamento antigo do EmailSender) com a
+fila de entrega usando sessões persistentes.
+
+    pip install aiosmtpd
+    python -m benchmarks.bench_email_delivery
+"""
+import asyncio
+
+from aiosmtpd.controller import Controller
+
+from benchmarks._common import Timer, report
+from src.service.send_email.delivery import (EmailDeliveryQueue, EmailJob,
+                                             SMTPSession)
+
+MESSAGES = 2000
+HOST, PORT = '127.0.0.1', 8025
+SERVER = {'host': HOST, 'port': PORT, 'ssl': False}
+SENDER = 'bench@example.com'
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 OK'
+
+
+def one_connection_per_message(count: int) -> None:
+    for i in range(count):
+        session = SMTPSession('local', SERVER, SENDER, None)
+        session.send_batch([EmailJob(f'user{i}@example.com', 'Código', '1234')])
+        session.close()
+
+
+async def main() -> None:
+    handler = CountingHandler()
+    controller = Controller(handler, hostname=HOST, port=PORT)
+    controller.start()
+    try:
+        with Timer() as timer:
+            await asyncio.to_thread(one_connection_per_message, MESSAGES // 10)
+        report('uma conexão por mensagem', MESSAGES // 10, timer.elapsed)
+
+        queue = EmailDeliveryQueue(workers=2, batch_size=100)
+        queue.start({'local': SERVER}, SENDER, None)
+        handler.received = 0
+
+        with Timer() as timer:
+            for i in range(MESSAGES):
+                queue.enqueue(f'user{i}@example.com', 'Código', '1234')
+            await queue.join()
+        report(
+            'fila + sessão persistente',
+            MESSAGES,
+            timer.elapsed,
+            received=handler.received,
+            **queue.stats(),
+        )
+        await queue.stop()
+    finally:
+        controller.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
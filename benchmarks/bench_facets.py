@@ -0,0 +1,144 @@
+"""
+Latência de consultas com várias facetas: bitmaps em memória x um
+GROUP BY por faceta no SQLite, num catálogo sintético.
+
+    python -m benchmarks.bench_facets
+    BENCH_ROWS=1000000 python -m benchmarks.bench_facets
+"""
+import asyncio
+import os
+import random
+import time
+from decimal import Decimal
+
+from tortoise import connections
+
+from benchmarks._common import Timer, bench_database, percentiles, report
+from src.models.service import Service, ServiceKind
+from src.models.user import User
+from src.services_g_turismo.facets import FacetIndex
+
+ROWS = int(os.getenv('BENCH_ROWS', '500000'))
+SAMPLES = 200
+SQL_SAMPLES = 10
+KINDS = list(ServiceKind)
+CITIES = [f'Cidade {i}' for i in range(200)]
+
+FILTERS = [
+    {'kind': ['tour']},
+    {'kind': ['tour', 'lodging'], 'price': ['100-300']},
+    {'kind': ['package'], 'duration': ['4-7'], 'destination': ['Cidade 7']},
+    {
+        'kind': ['tour', 'guide'],
+        'price': ['0-100', '100-300'],
+        'duration': ['1', '2-3'],
+        'destination': ['Cidade 1', 'Cidade 2', 'Cidade 3'],
+    },
+]
+
+# Contagens por faceta com os filtros das outras facetas, como a API
+_GROUP_BY = {
+    'kind': 'kind',
+    'price': "CASE WHEN CAST(price AS REAL) < 100 THEN '0-100' "
+    "WHEN CAST(price AS REAL) < 300 THEN '100-300' "
+    "WHEN CAST(price AS REAL) < 1000 THEN '300-1000' ELSE '1000+' END",
+    'duration': "CASE WHEN duration_days < 2 THEN '1' "
+    "WHEN duration_days < 4 THEN '2-3' "
+    "WHEN duration_days < 8 THEN '4-7' ELSE '8+' END",
+    'destination': 'city',
+}
+
+
+async def seed() -> None:
+    rng = random.Random(3)
+    owner = await User.create(
+        username='agencia',
+        email='agencia@example.com',
+        password='x',
+        email_search_hash='agencia',
+    )
+    batch = 10000
+    for start in range(0, ROWS, batch):
+        await Service.bulk_create(
+            [
+                Service(
+                    owner_id=owner.id,
+                    kind=rng.choice(KINDS),
+                    title=f'Serviço {i}',
+                    city=rng.choice(CITIES),
+                    price=Decimal(rng.randint(30, 3000)),
+                    duration_days=rng.randint(1, 14),
+                )
+                for i in range(start, min(start + batch, ROWS))
+            ]
+        )
+
+
+async def group_by_counts(filters: dict) -> dict:
+    connection = connections.get('default')
+    counts = {}
+    for facet, expression in _GROUP_BY.items():
+        where, params = ['published = 1'], []
+        for other, values in filters.items():
+            if other == facet:
+                continue
+            marks = ', '.join('?' for _ in values)
+            where.append(f'({_GROUP_BY[other]}) IN ({marks})')
+            params.extend(values)
+        _, rows = await connection.execute_query(
+            f'SELECT {expression} AS value, COUNT(*) FROM services '
+            f'WHERE {" AND ".join(where)} GROUP BY value',
+            params,
+        )
+        counts[facet] = dict(tuple(row) for row in rows)
+    return counts
+
+
+async def sample(label: str, samples: int, func) -> None:
+    timings = []
+    for i in range(samples):
+        filters = FILTERS[i % len(FILTERS)]
+        start = time.perf_counter()
+        await func(filters)
+        timings.append(time.perf_counter() - start)
+    report(label, samples, sum(timings), **percentiles(timings))
+
+
+async def main() -> None:
+    async with bench_database(
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.review',
+        ]
+    ):
+        await seed()
+
+        index = FacetIndex()
+        with Timer() as timer:
+            await index.rebuild()
+        report('carga do índice de facetas', ROWS, timer.elapsed)
+
+        async def bitmap_query(filters: dict) -> None:
+            matched, _ = index.query(filters)
+            index.page(matched, 20)
+
+        await sample('bitmaps (contagens + página)', SAMPLES, bitmap_query)
+        await sample('GROUP BY por faceta', SQL_SAMPLES, group_by_counts)
+
+        with Timer() as timer:
+            for service_id in range(1, 10001):
+                index.upsert(
+                    {
+                        'id': service_id,
+                        'kind': 'tour',
+                        'price': Decimal('150'),
+                        'duration_days': 2,
+                        'city': 'Cidade 0',
+                    }
+                )
+        report('edição incremental (upsert)', 10000, timer.elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Consultas/s da busca "perto de mim" num conjunto de 1M de pontos:
+R*Tree + haversine vetorizado (NumPy) x varredura ingênua da tabela com
+distância calculada linha a linha.
+
+    python -m benchmarks.bench_geo_near
+    BENCH_ROWS=200000 python -m benchmarks.bench_geo_near
+"""
+import asyncio
+import math
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from tortoise import connections
+
+from benchmarks._common import bench_database, percentiles, report
+from src.database.migrations import SERVICE_GEO_INDEX
+from src.database.router import READ_TARGETS
+from src.services_g_turismo.geo import EARTH_RADIUS_KM, services_near
+
+ROWS = int(os.getenv('BENCH_ROWS', '1000000'))
+SAMPLES = 200
+NAIVE_SAMPLES = 3
+RADIUS_KM = 10.0
+
+# Pontos espalhados pelo litoral e interior do Brasil
+LAT_RANGE = (-33.0, -3.0)
+LON_RANGE = (-60.0, -35.0)
+
+
+def seed(path: str, rows: int) -> None:
+    """Insere direto pelo sqlite3 (os triggers alimentam o R*Tree)."""
+    rng = random.Random(7)
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "INSERT INTO users (username, email, password, email_search_hash, "
+        "status, verified_account, created_in, updated_in) VALUES "
+        "('agencia', 'agencia@example.com', 'x', 'agencia', 1, 1, "
+        "'2025-01-01', '2025-01-01')"
+    )
+    connection.executemany(
+        'INSERT INTO services (kind, title, description, city, price, '
+        'currency, published, created_in, updated_in, owner_id, latitude, '
+        'longitude) VALUES '
+        "('lodging', 'Pousada', '', 'Cidade', '90.00', 'BRL', 1, "
+        "'2025-01-01', '2025-01-01', 1, ?, ?)",
+        (
+            (rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE))
+            for _ in range(rows)
+        ),
+    )
+    connection.commit()
+    connection.close()
+
+
+def haversine(lat1, lon1, lat2, lon2) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+async def naive_scan(lat: float, lon: float) -> list:
+    rows = await connections.get('default').execute_query_dict(
+        'SELECT id, latitude, longitude FROM services WHERE published = 1'
+    )
+    hits = [
+        (haversine(lat, lon, row['latitude'], row['longitude']), row['id'])
+        for row in rows
+    ]
+    return sorted(hit for hit in hits if hit[0] <= RADIUS_KM)[:20]
+
+
+async def sample(label: str, samples: int, func) -> None:
+    rng = random.Random(1)
+    timings = []
+    for _ in range(samples):
+        lat, lon = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+        start = time.perf_counter()
+        await func(lat, lon)
+        timings.append(time.perf_counter() - start)
+    report(label, samples, sum(timings), **percentiles(timings))
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_geo.sqlite3')
+
+    async with bench_database(
+        db_url=f'sqlite://{path}',
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.review',
+        ],
+    ):
+        # Banco único: as leituras vão para 'default'
+        READ_TARGETS.names = []
+        await SERVICE_GEO_INDEX(connections.get('default'))
+        seed(path, ROWS)
+
+        await sample(
+            f'R*Tree + NumPy (raio {RADIUS_KM:.0f} km)',
+            SAMPLES,
+            lambda lat, lon: services_near(lat, lon, 20, RADIUS_KM),
+        )
+        await sample(
+            'R*Tree + NumPy (20 mais próximos)',
+            SAMPLES,
+            lambda lat, lon: services_near(lat, lon, 20),
+        )
+        await sample('varredura ingênua', NAIVE_SAMPLES, naive_scan)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Latência (p99) de uma rota leve durante uma tempestade de logins.
+
+Compara o bcrypt síncrono no event loop com o pool de hash.
+
+    python -m benchmarks.bench_login_storm
+"""
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks._common import percentiles
+from src.service.jwt.auth import (get_hashed_password, verify_password,
+                                  verify_password_async)
+
+LOGINS = 200
+PINGS = 400
+PASSWORD = 'senha-de-benchmark'
+
+
+def build_app(hashed: str, use_pool: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post('/login')
+    async def login():
+        if use_pool:
+            ok = await verify_password_async(PASSWORD, hashed)
+        else:
+            ok = verify_password(PASSWORD, hashed)
+        return {'ok': ok}
+
+    @app.get('/ping')
+    async def ping():
+        return {'pong': True}
+
+    return app
+
+
+async def storm(client: httpx.AsyncClient) -> dict:
+    latencies = []
+    status_codes = {}
+
+    async def login():
+        response = await client.post('/login')
+        status_codes[response.status_code] = (
+            status_codes.get(response.status_code, 0) + 1
+        )
+
+    async def ping():
+        start = time.perf_counter()
+        await client.get('/ping')
+        latencies.append(time.perf_counter() - start)
+
+    async def pinger():
+        for _ in range(PINGS):
+            await ping()
+            await asyncio.sleep(0.001)
+
+    await asyncio.gather(pinger(), *(login() for _ in range(LOGINS)))
+    return {**percentiles(latencies), 'status': status_codes}
+
+
+async def main() -> None:
+    hashed = get_hashed_password(PASSWORD)
+
+    for label, use_pool in (('bcrypt no event loop', False), ('pool', True)):
+        transport = httpx.ASGITransport(app=build_app(hashed, use_pool))
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://bench'
+        ) as client:
+            result = await storm(client)
+        print(
+            f'{label:<24} /ping p50={result["p50"]:.2f}ms '
+            f'p95={result["p95"]:.2f}ms p99={result["p99"]:.2f}ms '
+            f'logins={result["status"]}'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
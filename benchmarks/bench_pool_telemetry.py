@@ -0,0 +1,62 @@
+"""
+Telemetria do pool sob carga, usando a engine SQLite instrumentada.
+
+Cada conexão SQLite atende uma consulta por vez, então ela se comporta como
+um pool de tamanho 1: a espera e os timeouts aparecem com pouca carga.
+
+    DB_POOL_ACQUIRE_TIMEOUT=0.05 python -m benchmarks.bench_pool_telemetry
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+from tortoise import Tortoise, connections
+
+from benchmarks._common import Timer, report
+from src.database.backends.instrumented import PoolAcquireTimeout
+
+QUERIES = 5000
+CONCURRENCY = 200
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_pool.sqlite3')
+    await Tortoise.init(
+        config={
+            'connections': {
+                'default': {
+                    'engine': 'src.database.backends.sqlite',
+                    'credentials': {'file_path': path},
+                }
+            },
+            'apps': {
+                'models': {
+                    'models': ['src.models.user'],
+                    'default_connection': 'default',
+                }
+            },
+        }
+    )
+    connection = connections.get('default')
+    timeouts = 0
+
+    async def worker():
+        nonlocal timeouts
+        for _ in range(QUERIES // CONCURRENCY):
+            try:
+                await connection.execute_query('SELECT 1')
+            except PoolAcquireTimeout:
+                timeouts += 1
+
+    try:
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        report('SELECT 1 concorrente', QUERIES, timer.elapsed, timeouts=timeouts)
+        print(json.dumps(connection.pool_snapshot(), indent=2))
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
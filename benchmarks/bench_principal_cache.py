@@ -0,0 +1,75 @@
+"""
+Requests/s de uma rota autenticada com e sem o cache de usuários.
+
+    python -m benchmarks.bench_principal_cache
+"""
+import asyncio
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from benchmarks._common import Timer, bench_database, report
+from src.auth.schemas import SystemUser
+from src.models.user import User
+from src.service.jwt.auth import create_access_token
+from src.service.jwt.depends import get_current_user
+from src.service.jwt.principal_cache import PRINCIPAL_CACHE
+
+REQUESTS = 5000
+CONCURRENCY = 50
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/me')
+    async def me(current_user: SystemUser = Depends(get_current_user)):
+        return {'id': current_user.id}
+
+    return app
+
+
+async def run_load(client: httpx.AsyncClient, token: str) -> None:
+    headers = {'Authorization': f'Bearer {token}'}
+    queue = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            response = await client.get('/me', headers=headers)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+
+async def main() -> None:
+    async with bench_database():
+        user = await User.create(
+            username='bench',
+            email='bench@example.com',
+            password='x',
+            email_search_hash='bench-hash',
+        )
+        token = create_access_token(str(user.id))
+        transport = httpx.ASGITransport(app=build_app())
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://bench'
+        ) as client:
+            for label, maxsize in (('sem cache', 0), ('com cache', 10000)):
+                PRINCIPAL_CACHE.clear()
+                PRINCIPAL_CACHE.maxsize = maxsize
+                with Timer() as timer:
+                    await run_load(client, token)
+                report(
+                    f'get_current_user ({label})',
+                    REQUESTS,
+                    timer.elapsed,
+                    **PRINCIPAL_CACHE.stats(),
+                )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
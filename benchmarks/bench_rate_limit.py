@@ -0,0 +1,44 @@
+"""
+Custo por requisição do limitador: aceitas (SQLite) x rejeitadas (memória).
+
+As aceitas incluem a ida e volta à thread que consulta o SQLite.
+
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import os
+import tempfile
+
+from benchmarks._common import Timer, report
+from src.service.rate_limit.limiter import BucketStore, RateLimiter
+
+ITERATIONS = 100000
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_rate_limit.db')
+    store = BucketStore(path)
+
+    # Cada chave nova tem fichas: todas as requisições vão ao SQLite
+    allowed = RateLimiter('bench-allowed', '1000000/1', store)
+    with Timer() as timer:
+        for i in range(ITERATIONS // 10):
+            await allowed.check(str(i % 1000))
+    per_hit = timer.elapsed / (ITERATIONS // 10) * 1e6
+    report('aceitas (SQLite)', ITERATIONS // 10, timer.elapsed, us=per_hit)
+
+    # Uma única chave estourada: rejeições servidas da memória
+    rejected = RateLimiter('bench-rejected', '1/3600', store)
+    await rejected.check('attacker')
+    await rejected.check('attacker')
+    with Timer() as timer:
+        for _ in range(ITERATIONS):
+            await rejected.check('attacker')
+    per_hit = timer.elapsed / ITERATIONS * 1e6
+    report('rejeitadas (memória)', ITERATIONS, timer.elapsed, us=per_hit)
+
+    store.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Vazão de leitura conforme réplicas SQLite são adicionadas.
+
+As réplicas são cópias do arquivo primário (mesmo passo de cópia de
+`python -m src.database.router`).
+
+    python -m benchmarks.bench_read_replicas
+"""
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+from tortoise import Tortoise
+
+from benchmarks._common import Timer, report
+from src.database import router as replica_router
+from src.database.init_database import sqlite_pragmas
+from src.models.user import User
+
+READS = 20000
+CONCURRENCY = 64
+
+
+def config(primary: str, replicas: list) -> dict:
+    pragmas = sqlite_pragmas()
+    connections = {
+        'default': {
+            'engine': 'src.database.backends.sqlite',
+            'credentials': {'file_path': primary, **pragmas},
+        }
+    }
+    for index, path in enumerate(replicas):
+        connections[f'replica_{index}'] = {
+            'engine': 'src.database.backends.sqlite',
+            'credentials': {'file_path': path, **pragmas, 'query_only': 'ON'},
+        }
+    return {
+        'connections': connections,
+        'apps': {
+            'models': {
+                'models': ['src.models.user'],
+                'default_connection': 'default',
+            }
+        },
+        'routers': ['src.database.router.ReplicaRouter'],
+    }
+
+
+async def seed(primary: str) -> None:
+    await Tortoise.init(config=config(primary, []))
+    await Tortoise.generate_schemas()
+    await User.bulk_create(
+        [
+            User(
+                username=f'user{i}', email=f'user{i}@example.com',
+                password='x', email_search_hash=f'hash-{i}',
+            )
+            for i in range(1000)
+        ]
+    )
+    await Tortoise.close_connections()
+
+
+async def main() -> None:
+    folder = tempfile.mkdtemp()
+    primary = os.path.join(folder, 'primary.sqlite3')
+    await seed(primary)
+
+    for count in (0, 1, 2, 4):
+        replicas = [
+            os.path.join(folder, f'replica_{i}.sqlite3') for i in range(count)
+        ]
+        source = sqlite3.connect(primary)
+        for path in replicas:
+            target = sqlite3.connect(path)
+            source.backup(target)
+            target.close()
+        source.close()
+
+        await Tortoise.init(config=config(primary, replicas))
+        replica_router.READ_TARGETS.names = [
+            f'replica_{i}' for i in range(count)
+        ]
+
+        async def reader(offset: int):
+            for i in range(READS // CONCURRENCY):
+                await User.get_or_none(id=(offset + i) % 1000 + 1)
+
+        try:
+            with Timer() as timer:
+                await asyncio.gather(*(reader(i) for i in range(CONCURRENCY)))
+        finally:
+            await Tortoise.close_connections()
+        report(f'leituras com {count} réplicas', READS, timer.elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Modelo de serviços parecidos: tempo de construção (matriz esparsa +
+cosseno item-item em blocos) e latência da consulta no arquivo mapeado em
+memória, com interações sintéticas.
+
+    python -m benchmarks.bench_recommendations
+    BENCH_USERS=50000 BENCH_ITEMS=10000 python -m benchmarks.bench_recommendations
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks._common import Timer, percentiles, report
+from src.services_g_turismo.recommendation_build import (SIMILAR_TOP_K,
+                                                         interaction_matrix,
+                                                         top_k_similar)
+from src.services_g_turismo.recommendations import (SimilarityModel,
+                                                    write_model)
+
+USERS = int(os.getenv('BENCH_USERS', '200000'))
+ITEMS = int(os.getenv('BENCH_ITEMS', '50000'))
+PER_USER = 15
+CLUSTERS = 200
+LOOKUPS = 100000
+
+
+def synthetic_interactions(seed: int = 13):
+    """
+    Usuários com um "destino preferido" (cluster de serviços) e
+    popularidade em cauda longa dentro do cluster.
+    """
+    rng = np.random.default_rng(seed)
+    per_cluster = max(1, ITEMS // CLUSTERS)
+    total = USERS * PER_USER
+
+    users = np.repeat(np.arange(1, USERS + 1), PER_USER)
+    home = rng.integers(0, CLUSTERS, USERS).repeat(PER_USER)
+    # 20% das interações fora do destino preferido
+    wander = rng.random(total) < 0.2
+    cluster = np.where(wander, rng.integers(0, CLUSTERS, total), home)
+    offset = np.minimum(rng.zipf(1.5, total) - 1, per_cluster - 1)
+    services = cluster * per_cluster + offset + 1
+    weights = rng.choice(np.array([0.5, 1.0, 1.5, 2.0], np.float32), total)
+    return users, services, weights
+
+
+def main() -> None:
+    users, services, weights = synthetic_interactions()
+    path = os.path.join(tempfile.mkdtemp(), 'similar_services.bin')
+
+    with Timer() as timer:
+        matrix, item_ids = interaction_matrix(users, services, weights)
+    report('matriz esparsa (CSR)', len(users), timer.elapsed, nnz=matrix.nnz)
+
+    with Timer() as timer:
+        neighbors, scores = top_k_similar(matrix, item_ids, SIMILAR_TOP_K)
+    report(
+        f'cosseno item-item top-{SIMILAR_TOP_K}', len(item_ids), timer.elapsed
+    )
+
+    with Timer() as timer:
+        size = write_model(path, item_ids, neighbors, scores)
+    report('gravação do arquivo', 1, timer.elapsed, MiB=size / 2**20)
+
+    model = SimilarityModel(path)
+    with Timer() as timer:
+        model.load()
+    report('abertura (mmap, sem cópia)', 1, timer.elapsed)
+
+    with Timer() as timer:
+        with open(path, 'rb') as source:
+            copied = np.frombuffer(source.read(), np.uint8)
+    report('leitura completa (cópia por worker)', 1, timer.elapsed)
+    del copied
+
+    rng = np.random.default_rng(1)
+    targets = rng.choice(item_ids, LOOKUPS).tolist()
+    timings = []
+    for service_id in targets:
+        start = time.perf_counter()
+        model.similar(service_id, 10)
+        timings.append(time.perf_counter() - start)
+    stats = percentiles(timings)
+    report('consulta /similar (mmap)', LOOKUPS, sum(timings), **stats)
+    print(
+        f'  p50 {stats["p50"] * 1000:.1f} µs, p99 {stats["p99"] * 1000:.1f} µs'
+    )
+
+
+if __name__ == '__main__':
+    main()
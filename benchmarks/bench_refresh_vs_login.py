@@ -0,0 +1,44 @@
+"""
+Vazão de /auth/refresh comparada com /auth/login.
+
+    python -m benchmarks.bench_refresh_vs_login
+"""
+import asyncio
+
+from benchmarks._common import Timer, bench_database, report
+from src.auth.utils import checking_account, rotate_refresh_token
+from src.global_utils.hashed_email import create_email_search_hash
+from src.models.user import User
+from src.service.jwt.auth import create_refresh_token, get_hashed_password
+
+ITERATIONS = 300
+PASSWORD = 'senha-de-benchmark'
+
+
+async def main() -> None:
+    async with bench_database(
+        models=['src.models.user', 'src.models.token']
+    ):
+        user = await User.create(
+            username='bench',
+            email='bench@example.com',
+            password=get_hashed_password(PASSWORD),
+            email_search_hash=create_email_search_hash('bench@example.com'),
+        )
+
+        with Timer() as timer:
+            for _ in range(ITERATIONS):
+                await checking_account(
+                    {'email': 'bench@example.com', 'password': PASSWORD}
+                )
+        report('login (bcrypt)', ITERATIONS, timer.elapsed)
+
+        token = create_refresh_token(str(user.id))
+        with Timer() as timer:
+            for _ in range(ITERATIONS):
+                token = (await rotate_refresh_token(token))['refresh_token']
+        report('refresh (rotação)', ITERATIONS, timer.elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,190 @@
+"""
+Teste de estresse das reservas: milhares de pedidos simultâneos disputando
+as mesmas vagas. Confere, dia a dia, que nada foi vendido além da
+capacidade e que as retenções expiradas voltam ao estoque.
+
+Para comparação, o mesmo ataque contra o padrão ingênuo "lê o estoque,
+depois save()" mostra quantas vagas ele vende a mais.
+
+    python -m benchmarks.bench_reservations
+    BENCH_RESERVATIONS=20000 python -m benchmarks.bench_reservations
+
+Retorna código de saída 1 se houver overbooking no motor de reservas.
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from benchmarks._common import Timer, bench_database, report
+from src.models.reservation import Inventory, Reservation, ReservationStatus
+from src.models.service import Service, ServiceKind
+from src.models.user import User
+from src.services_g_turismo.reservations import RESERVATIONS
+
+REQUESTS = int(os.getenv('BENCH_RESERVATIONS', '5000'))
+CAPACITY = 200
+DAYS = 30
+FIRST_DAY = date(2025, 12, 1)
+
+Request = Tuple[date, date, int]
+
+
+def requests(seed: int) -> List[Request]:
+    """Pedidos de 1 a 5 noites, 1 a 3 vagas, concentrados no feriado."""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(REQUESTS):
+        offset = min(int(rng.expovariate(1 / 6)), DAYS - 1)
+        start = FIRST_DAY + timedelta(days=offset)
+        nights = min(rng.randint(1, 5), DAYS - offset)
+        result.append(
+            (start, start + timedelta(days=nights), rng.randint(1, 3))
+        )
+    return result
+
+
+async def create_service(owner_id: int, title: str) -> int:
+    service = await Service.create(
+        owner_id=owner_id,
+        kind=ServiceKind.LODGING,
+        title=title,
+        city='Porto de Galinhas',
+        price=Decimal('450'),
+    )
+    await RESERVATIONS.set_capacity(
+        service.id, FIRST_DAY, FIRST_DAY + timedelta(days=DAYS), CAPACITY
+    )
+    return service.id
+
+
+async def oversold_days(service_id: int, sold: Dict[date, int]) -> int:
+    """Vagas vendidas além da capacidade, somadas em todos os dias."""
+    rows = await Inventory.filter(service_id=service_id).values(
+        'day', 'capacity', 'remaining'
+    )
+    excess = 0
+    for row in rows:
+        excess += max(0, sold.get(row['day'], 0) - row['capacity'])
+        # O estoque gravado também precisa bater com o vendido
+        if row['capacity'] - row['remaining'] != sold.get(row['day'], 0):
+            excess += abs(
+                row['capacity'] - row['remaining'] - sold.get(row['day'], 0)
+            )
+    return excess
+
+
+def count_sold(granted: List[Request]) -> Dict[date, int]:
+    sold: Counter = Counter()
+    for start, end, quantity in granted:
+        for i in range((end - start).days):
+            sold[start + timedelta(days=i)] += quantity
+    return sold
+
+
+async def naive_reserve(service_id: int, request: Request) -> bool:
+    """O padrão a evitar: lê o restante, decide em Python, grava com save()."""
+    start, end, quantity = request
+    rows = await Inventory.filter(
+        service_id=service_id, day__gte=start, day__lt=end
+    )
+    if len(rows) != (end - start).days or any(
+        row.remaining < quantity for row in rows
+    ):
+        return False
+    for row in rows:
+        row.remaining -= quantity
+        await row.save(update_fields=['remaining'])
+    return True
+
+
+async def main() -> int:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_reservations.sqlite3')
+
+    async with bench_database(
+        db_url=f'sqlite://{path}',
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.reservation',
+        ],
+    ):
+        user = await User.create(
+            username='viajante',
+            email='viajante@example.com',
+            password='x',
+            email_search_hash='viajante',
+        )
+        engine_service = await create_service(user.id, 'Pousada (CAS)')
+        naive_service = await create_service(user.id, 'Pousada (ingênuo)')
+        batch = requests(seed=9)
+
+        # --- Motor de reservas (UPDATE condicional) ---
+        with Timer() as timer:
+            results = await asyncio.gather(
+                *(
+                    RESERVATIONS.reserve(
+                        engine_service, user.id, start, end, quantity
+                    )
+                    for start, end, quantity in batch
+                )
+            )
+        granted = [
+            request
+            for request, result in zip(batch, results)
+            if result is not None
+        ]
+        report(
+            'reservas simultâneas (CAS)',
+            len(batch),
+            timer.elapsed,
+            aceitas=len(granted),
+            recusadas=len(batch) - len(granted),
+        )
+        engine_excess = await oversold_days(
+            engine_service, count_sold(granted)
+        )
+        print(f'  vagas vendidas além da capacidade (CAS): {engine_excess}')
+
+        # --- Padrão ingênuo (lê e depois save()) ---
+        with Timer() as timer:
+            naive_results = await asyncio.gather(
+                *(naive_reserve(naive_service, request) for request in batch)
+            )
+        naive_granted = [
+            request for request, ok in zip(batch, naive_results) if ok
+        ]
+        report(
+            'reservas simultâneas (ingênuo)',
+            len(batch),
+            timer.elapsed,
+            aceitas=len(naive_granted),
+        )
+        naive_excess = await oversold_days(
+            naive_service, count_sold(naive_granted)
+        )
+        print(f'  vagas vendidas além da capacidade (ingênuo): {naive_excess}')
+
+        # --- Expiração das retenções ---
+        await Reservation.filter(
+            service_id=engine_service, status=ReservationStatus.HELD
+        ).update(expires_in=datetime.now(timezone.utc) - timedelta(seconds=1))
+        with Timer() as timer:
+            expired = await RESERVATIONS.sweep()
+        report('expiração das retenções', expired, timer.elapsed)
+
+        leaked = await Inventory.filter(
+            service_id=engine_service, remaining__lt=CAPACITY
+        ).count()
+        print(f'  dias com vagas não devolvidas: {leaked}')
+
+    return 1 if engine_excess or leaked else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
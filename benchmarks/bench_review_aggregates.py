@@ -0,0 +1,177 @@
+"""
+Listagem com nota: agregado `service_ratings` x AVG() sobre `reviews`
+(10M de avaliações por padrão), além da vazão de escrita de avaliações
+(cada uma atualiza o agregado na mesma transação) e do tempo da
+reconciliação completa.
+
+    python -m benchmarks.bench_review_aggregates
+    BENCH_REVIEWS=1000000 python -m benchmarks.bench_review_aggregates
+"""
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from tortoise import connections
+
+from benchmarks._common import Timer, bench_database, percentiles, report
+from src.models.review import ServiceRating
+from src.services_g_turismo.catalog import list_services
+from src.services_g_turismo.reviews import (REVIEW_PRIOR_MEAN,
+                                             REVIEW_PRIOR_WEIGHT,
+                                             reconcile_ratings, submit_review)
+
+REVIEWS = int(os.getenv('BENCH_REVIEWS', '10000000'))
+PER_SERVICE = 100
+SERVICES = max(1, REVIEWS // PER_SERVICE)
+SAMPLES = 200
+AVG_SAMPLES = 5
+WRITES = 2000
+NOW = '2025-01-01 00:00:00+00:00'
+
+AVG_PAGE_SQL = """
+SELECT s.id, s.title, s.price, AVG(r.stars) AS rating,
+    COUNT(r.id) AS review_count
+FROM services s
+LEFT JOIN reviews r ON r.service_id = s.id
+WHERE s.published = 1 AND s.id < ?
+GROUP BY s.id
+ORDER BY s.id DESC
+LIMIT 21
+"""
+
+AVG_TOP_SQL = """
+SELECT service_id, AVG(stars) AS rating
+FROM reviews
+GROUP BY service_id
+ORDER BY rating DESC
+LIMIT 20
+"""
+
+BACKFILL_SQL = f"""
+INSERT INTO service_ratings (service_id, count, total, stars_1, stars_2,
+    stars_3, stars_4, stars_5, average, score, updated_in)
+SELECT service_id, COUNT(*), SUM(stars),
+    SUM(stars = 1), SUM(stars = 2), SUM(stars = 3), SUM(stars = 4),
+    SUM(stars = 5), AVG(stars),
+    ({REVIEW_PRIOR_WEIGHT} * {REVIEW_PRIOR_MEAN} + SUM(stars))
+        / ({REVIEW_PRIOR_WEIGHT} + COUNT(*)),
+    '{NOW}'
+FROM reviews
+GROUP BY service_id
+"""
+
+
+def seed(path: str) -> None:
+    """Insere direto pelo sqlite3: PER_SERVICE avaliações por serviço."""
+    rng = random.Random(21)
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        'INSERT INTO users (username, email, password, email_search_hash, '
+        'status, verified_account, created_in, updated_in) '
+        'VALUES (?, ?, ?, ?, 1, 1, ?, ?)',
+        (
+            (f'viajante{i}', f'v{i}@example.com', 'x', f'v{i}', NOW, NOW)
+            for i in range(PER_SERVICE + 1)
+        ),
+    )
+    connection.executemany(
+        'INSERT INTO services (kind, title, description, city, price, '
+        'currency, duration_days, published, created_in, updated_in, '
+        'owner_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            ('tour', f'Serviço {i}', '', 'Recife', '150.00', 'BRL', 1, 1,
+             NOW, NOW, 1)
+            for i in range(SERVICES)
+        ),
+    )
+    # O último usuário fica sem avaliações (usado nas escritas)
+    connection.executemany(
+        'INSERT INTO reviews (service_id, user_id, stars, comment, '
+        'created_in, updated_in) VALUES (?, ?, ?, ?, ?, ?)',
+        (
+            (i // PER_SERVICE + 1, i % PER_SERVICE + 1,
+             rng.choices((1, 2, 3, 4, 5), (1, 1, 2, 4, 6))[0], '', NOW, NOW)
+            for i in range(REVIEWS)
+        ),
+    )
+    connection.commit()
+    connection.close()
+
+
+async def sample(label: str, samples: int, func) -> None:
+    rng = random.Random(3)
+    timings = []
+    for _ in range(samples):
+        cursor = rng.randint(22, SERVICES + 1)
+        start = time.perf_counter()
+        await func(cursor)
+        timings.append(time.perf_counter() - start)
+    report(label, samples, sum(timings), **percentiles(timings))
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_reviews.sqlite3')
+
+    async with bench_database(
+        db_url=f'sqlite://{path}',
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.review',
+        ],
+    ):
+        with Timer() as timer:
+            seed(path)
+        report('carga das avaliações', REVIEWS, timer.elapsed)
+
+        connection = connections.get('default')
+        with Timer() as timer:
+            await connection.execute_script(BACKFILL_SQL)
+        report('backfill do agregado (GROUP BY)', SERVICES, timer.elapsed)
+
+        await sample(
+            'página com nota: agregado',
+            SAMPLES,
+            lambda cursor: list_services(cursor=cursor),
+        )
+        await sample(
+            'página com nota: AVG() GROUP BY',
+            SAMPLES,
+            lambda cursor: connection.execute_query_dict(
+                AVG_PAGE_SQL, [cursor]
+            ),
+        )
+        await sample(
+            'mais bem avaliados: agregado',
+            SAMPLES,
+            lambda _: ServiceRating.all().order_by('-score').limit(20),
+        )
+        await sample(
+            'mais bem avaliados: AVG() GROUP BY',
+            AVG_SAMPLES,
+            lambda _: connection.execute_query_dict(AVG_TOP_SQL),
+        )
+
+        rng = random.Random(8)
+        writer = PER_SERVICE + 1
+        targets = rng.sample(range(1, SERVICES + 1), min(WRITES, SERVICES))
+        with Timer() as timer:
+            for service_id in targets:
+                await submit_review(service_id, writer, rng.randint(1, 5))
+        report('avaliação + agregado (transação)', len(targets), timer.elapsed)
+
+        with Timer() as timer:
+            drifted = await reconcile_ratings()
+        report(
+            'reconciliação completa',
+            SERVICES,
+            timer.elapsed,
+            divergentes=drifted,
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Busca textual num catálogo sintético (1M de serviços por padrão):
+FTS5 + BM25 x `LIKE '%termo%'`.
+
+    python -m benchmarks.bench_service_search
+    BENCH_ROWS=200000 python -m benchmarks.bench_service_search
+"""
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from tortoise import connections
+
+from benchmarks._common import Timer, bench_database, percentiles, report
+from src.database.migrations import SERVICE_SEARCH_INDEX
+from src.database.router import READ_TARGETS
+from src.models.service import Service
+from src.services_g_turismo.search import search_services
+
+ROWS = int(os.getenv('BENCH_ROWS', '1000000'))
+SAMPLES = 200
+LIKE_SAMPLES = 5
+
+WORDS = [
+    'praia', 'passeio', 'jangada', 'mergulho', 'trilha', 'cachoeira',
+    'pousada', 'hotel', 'fazenda', 'catamarã', 'ilha', 'serra', 'sertão',
+    'mangue', 'dunas', 'buggy', 'gastronomia', 'histórico', 'museu',
+    'ecoturismo', 'aventura', 'família', 'romântico', 'piscina', 'café',
+]
+CITIES = [
+    ('Recife', 'PE'), ('Ipojuca', 'PE'), ('Maceió', 'AL'),
+    ('Maragogi', 'AL'), ('Natal', 'RN'), ('Fortaleza', 'CE'),
+    ('São Paulo', 'SP'), ('Florianópolis', 'SC'), ('Gramado', 'RS'),
+    ('Bonito', 'MS'), ('Belém', 'PA'), ('Manaus', 'AM'),
+]
+QUERIES = ['praia', 'sao paulo', 'cachoeira trilha', 'catamara', 'museu hist']
+
+
+def seed(path: str, rows: int) -> None:
+    """Insere direto pelo sqlite3 (os triggers alimentam o FTS5)."""
+    rng = random.Random(42)
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "INSERT INTO users (username, email, password, email_search_hash, "
+        "status, verified_account, created_in, updated_in) VALUES "
+        "('agencia', 'agencia@example.com', 'x', 'agencia', 1, 1, "
+        "'2025-01-01', '2025-01-01')"
+    )
+
+    def generate():
+        for i in range(rows):
+            city, state = CITIES[i % len(CITIES)]
+            title = ' '.join(rng.sample(WORDS, 3)).capitalize()
+            description = ' '.join(rng.choices(WORDS, k=20))
+            yield (
+                'tour', title, description, city, state, '150.00', 'BRL',
+                1, '2025-01-01', '2025-01-01', 1,
+            )
+
+    connection.executemany(
+        'INSERT INTO services (kind, title, description, city, state, '
+        'price, currency, published, created_in, updated_in, owner_id) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        generate(),
+    )
+    connection.commit()
+    connection.close()
+
+
+async def sample(label: str, samples: int, func) -> None:
+    timings = []
+    for i in range(samples):
+        start = time.perf_counter()
+        await func(QUERIES[i % len(QUERIES)])
+        timings.append(time.perf_counter() - start)
+    report(label, samples, sum(timings), **percentiles(timings))
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'bench_search.sqlite3')
+
+    async with bench_database(
+        db_url=f'sqlite://{path}',
+        models=[
+            'src.models.user',
+            'src.models.service',
+            'src.models.review',
+        ],
+    ):
+        # Banco único: as leituras vão para 'default'
+        READ_TARGETS.names = []
+        await SERVICE_SEARCH_INDEX(connections.get('default'))
+
+        with Timer() as timer:
+            seed(path, ROWS)
+        report('carga + indexação FTS5', ROWS, timer.elapsed)
+
+        await sample(
+            'FTS5 + BM25 (página 1)',
+            SAMPLES,
+            lambda text: search_services(text),
+        )
+
+        async def deep_page(text: str) -> None:
+            _, cursor = await search_services(text)
+            for _ in range(4):
+                if cursor is None:
+                    return
+                _, cursor = await search_services(text, cursor)
+
+        await sample('FTS5 + BM25 (5 páginas)', SAMPLES // 5, deep_page)
+
+        async def like_scan(text: str) -> list:
+            return (
+                await Service.filter(
+                    published=True, description__icontains=text.split()[0]
+                )
+                .order_by('-id')
+                .limit(20)
+            )
+
+        await sample("LIKE '%termo%'", LIKE_SAMPLES, like_scan)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
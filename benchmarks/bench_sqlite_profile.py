@@ -0,0 +1,90 @@
+"""
+Leituras e escritas concorrentes: configuração antiga (uma conexão, sem
+PRAGMAs) x perfil de produção (WAL, mmap, cache e pool de leitores).
+
+    python -m benchmarks.bench_sqlite_profile
+"""
+import asyncio
+import os
+import tempfile
+
+from tortoise import Tortoise
+
+from benchmarks._common import Timer, report
+from src.database.init_database import READER_PREFIX, sqlite_connections
+from src.models.user import User
+
+WRITES = 2000
+READS = 20000
+READERS = 16
+
+
+def legacy_config(path: str) -> dict:
+    return {
+        'connections': {
+            'default': {
+                'engine': 'tortoise.backends.sqlite',
+                'credentials': {'file_path': path},
+            }
+        },
+        'apps': {
+            'models': {
+                'models': ['src.models.user'],
+                'default_connection': 'default',
+            }
+        },
+    }
+
+
+def tuned_config(path: str) -> dict:
+    config = legacy_config(path)
+    config['connections'] = sqlite_connections(path)
+    return config
+
+
+async def workload(reader_names) -> float:
+    await Tortoise.generate_schemas()
+    first = await User.create(
+        username='seed', email='seed@example.com', password='x',
+        email_search_hash='seed',
+    )
+    readers = [Tortoise.get_connection(name) for name in reader_names]
+
+    async def writer():
+        for i in range(WRITES):
+            await User.create(
+                username=f'user{i}', email=f'user{i}@example.com',
+                password='x', email_search_hash=f'hash-{i}',
+            )
+
+    async def reader(index: int):
+        connection = readers[index % len(readers)] if readers else None
+        for _ in range(READS // READERS):
+            query = User.filter(id=first.id)
+            if connection is not None:
+                query = query.using_db(connection)
+            await query.first()
+
+    with Timer() as timer:
+        await asyncio.gather(writer(), *(reader(i) for i in range(READERS)))
+    return timer.elapsed
+
+
+async def main() -> None:
+    for label, build in (('antiga', legacy_config), ('perfil', tuned_config)):
+        path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        config = build(path)
+        await Tortoise.init(config=config)
+        try:
+            names = [
+                name for name in config['connections']
+                if name.startswith(READER_PREFIX)
+            ]
+            elapsed = await workload(names)
+        finally:
+            await Tortoise.close_connections()
+        report(f'leitura+escrita ({label})', WRITES + READS, elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Tempo até a primeira requisição: importa o `main`, roda o lifespan e
+atende um GET, cada amostra num processo novo (como um worker reciclado).
+
+Compara a mediana com benchmarks/startup_baseline.json e sai com código 1
+se piorar além da tolerância. Sem baseline (ou com --update-baseline), a
+medição atual vira a nova baseline.
+
+A baseline não é versionada (está no .gitignore): os tempos dependem da
+máquina, então cada máquina grava a sua na primeira execução e só
+compara consigo mesma.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --update-baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'startup_baseline.json')
+
+# Executado em cada processo filho; imprime os tempos em JSON
+_CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    client.get('/openapi.json')
+    first_request = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_request_s': first_request - start,
+}))
+"""
+
+
+def sample(workdir: str) -> dict:
+    env = {
+        **os.environ,
+        'DB_NAME_DEV_LOCAL': os.path.join(workdir, 'bench_startup.sqlite3'),
+        'RATE_LIMIT_DB': os.path.join(workdir, 'rate_limit.db'),
+        'MIGRATIONS_LOCK_FILE': os.path.join(workdir, 'migrations.lock'),
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', _CHILD],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=float(os.getenv('STARTUP_TOLERANCE', '1.25')),
+        help='razão máxima aceita entre a mediana atual e a baseline',
+    )
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    # Primeiro boot cria o banco; as amostras medem o startup a quente
+    sample(workdir)
+    samples = [sample(workdir) for _ in range(args.runs)]
+
+    current = {
+        key: statistics.median(s[key] for s in samples)
+        for key in ('import_s', 'first_request_s')
+    }
+    for key, value in current.items():
+        print(f'{key:<20} {value * 1000:>10.1f} ms (mediana de {args.runs})')
+
+    if args.update_baseline or not os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'w') as baseline_file:
+            json.dump(current, baseline_file, indent=2)
+        print(f'[OK] Baseline gravada em {BASELINE_FILE}')
+        return 0
+
+    with open(BASELINE_FILE) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    status = 0
+    for key, value in current.items():
+        limit = baseline[key] * args.tolerance
+        if value > limit:
+            print(
+                f'[FAIL] {key}: {value * 1000:.1f} ms > '
+                f'{limit * 1000:.1f} ms (baseline x {args.tolerance})'
+            )
+            status = 1
+    if not status:
+        print('[OK] Startup dentro da tolerância.')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Tokens emitidos/s e verificados/s: python-jose (antes) x TokenCodec (depois).
+
+    python -m benchmarks.bench_token_codec
+"""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from jose import jwt
+
+from benchmarks._common import Timer, report
+from config import JWT_ALGORITHM, JWT_SECRET_KEY
+from src.service.jwt.codec import ACCESS_TOKEN_CODEC
+
+ITERATIONS = 50000
+
+
+def jose_issue(subject: str) -> str:
+    expire = datetime.now(ZoneInfo('America/Sao_Paulo')) + timedelta(
+        minutes=30
+    )
+    return jwt.encode(
+        {'exp': expire, 'sub': subject},
+        str(JWT_SECRET_KEY),
+        str(JWT_ALGORITHM),
+    )
+
+
+def jose_verify(token: str) -> dict:
+    return jwt.decode(
+        token, str(JWT_SECRET_KEY), algorithms=[str(JWT_ALGORITHM)]
+    )
+
+
+def main() -> None:
+    with Timer() as timer:
+        for i in range(ITERATIONS):
+            jose_issue(str(i))
+    report('emitir (python-jose)', ITERATIONS, timer.elapsed)
+
+    with Timer() as timer:
+        for i in range(ITERATIONS):
+            ACCESS_TOKEN_CODEC.issue(i, 1800)
+    report('emitir (TokenCodec)', ITERATIONS, timer.elapsed)
+
+    token = jose_issue('1')
+    with Timer() as timer:
+        for _ in range(ITERATIONS):
+            jose_verify(token)
+    report('verificar (python-jose)', ITERATIONS, timer.elapsed)
+
+    with Timer() as timer:
+        for _ in range(ITERATIONS):
+            ACCESS_TOKEN_CODEC.decode(token)
+    report('verificar (TokenCodec)', ITERATIONS, timer.elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Operações/s de emissão e verificação de códigos.
+
+    python -m benchmarks.bench_verification_codes
+"""
+import asyncio
+
+from benchmarks._common import Timer, bench_database, report
+from src.models.user import User
+from src.service.send_email.verification_codes import VERIFICATION_CODES
+
+USERS = 2000
+
+
+async def main() -> None:
+    async with bench_database(
+        models=['src.models.user', 'src.models.verification_code']
+    ):
+        await User.bulk_create(
+            [
+                User(
+                    username=f'user{i}',
+                    email=f'user{i}@example.com',
+                    password='x',
+                    email_search_hash=f'hash-{i}',
+                )
+                for i in range(USERS)
+            ]
+        )
+        ids = [user.id for user in await User.all().only('id')]
+
+        with Timer() as timer:
+            for user_id in ids:
+                await VERIFICATION_CODES.issue(user_id, '1234')
+        report('emitir código', len(ids), timer.elapsed)
+
+        with Timer() as timer:
+            for user_id in ids:
+                await VERIFICATION_CODES.consume(user_id, '9999')
+        report('verificar (código errado)', len(ids), timer.elapsed)
+
+        with Timer() as timer:
+            for user_id in ids:
+                assert await VERIFICATION_CODES.consume(user_id, '1234')
+        report('verificar (código certo)', len(ids), timer.elapsed)
+
+        with Timer() as timer:
+            deleted = await VERIFICATION_CODES.sweep()
+        report('varredura em lote', deleted, timer.elapsed)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
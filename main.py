@@ -1,27 +1,56 @@
+# Instalado antes dos imports pesados para medir o custo de cada módulo
+from src.global_utils import startup_profiler
+
+startup_profiler.install()
+
 import os
 from contextlib import asynccontextmanager
 
 import uvicorn
-from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from tortoise import Tortoise
 
 from config import APP_NAME, UVICORN_WORKERS
-from src.database.init_database import TORTOISE_ORM
+from src.database.backends.instrumented import PoolAcquireTimeout
+from src.database.init_database import get_tortoise_config
+from src.database.migrations import migrate
+from src.global_utils.background import (start_background_tasks,
+                                         stop_background_tasks)
+from src.global_utils.env import load_env
 from src.included.included_routers import register_all_routes
+from src.service.jwt.password_pool import PASSWORD_POOL
+from src.service.send_email.send_verification_code import (
+    start_email_delivery, stop_email_delivery)
+from src.services_g_turismo.activity import ACTIVITY
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia o ciclo de vinda da aplicação"""
-    load_dotenv()
+    load_env()
+
+    with startup_profiler.phase('tortoise.init'):
+        await Tortoise.init(config=get_tortoise_config())
+    with startup_profiler.phase('migrate'):
+        # Uma consulta de versão; só um worker aplica migrações pendentes
+        await migrate()
 
-    await Tortoise.init(config=TORTOISE_ORM)
-    await Tortoise.generate_schemas()
+    with startup_profiler.phase('background'):
+        start_email_delivery()
+        start_background_tasks()
+        ACTIVITY.start()
+
+    startup_profiler.report()
 
     yield
 
+    await stop_background_tasks()
+    # Grava favoritos/visualizações pendentes antes de fechar o banco
+    await ACTIVITY.stop()
+    await stop_email_delivery()
+    PASSWORD_POOL.shutdown()
     await Tortoise.close_connections()
 
 
@@ -37,7 +66,9 @@ class Server:
         )
 
         self.setup_middlewares()
-        self.start_routes()
+        self.setup_exception_handlers()
+        with startup_profiler.phase('routes'):
+            self.start_routes()
 
     def setup_middlewares(self):
         """Configuração dos Middlewares, incluindo o CORS"""
@@ -56,6 +87,20 @@ class Server:
             allow_headers=['*'],  # Permite todos os cabeçalhos
         )
 
+    def setup_exception_handlers(self):
+        """Converte falhas de infraestrutura em respostas HTTP"""
+
+        @self.app.exception_handler(PoolAcquireTimeout)
+        async def pool_timeout_handler(
+            request: Request, exc: PoolAcquireTimeout
+        ):
+            # Pool de conexões esgotado: o cliente deve tentar de novo
+            return JSONResponse(
+                status_code=503,
+                content={'detail': 'Banco de dados ocupado. Tente novamente.'},
+                headers={'Retry-After': '1'},
+            )
+
     def start_routes(self):
         """
         start_routes: Responsavel por registra
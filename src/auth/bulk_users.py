@@ -0,0 +1,342 @@
+"""
+Importação/exportação de usuários em massa (migração de agências parceiras).
+
+Os arquivos são lidos e escritos em streaming, um lote por vez, então o
+uso de memória não depende do tamanho do arquivo.
+
+    python -m src.auth.bulk_users import usuarios.ndjson
+    python -m src.auth.bulk_users import usuarios.csv --pre-hashed
+    python -m src.auth.bulk_users export usuarios.ndjson
+
+Cada linha traz `username`, `email` e `password` (texto puro, com hash no
+pool de processos) ou `password_hash` (bcrypt já calculado, usado como
+está; linhas com hash em formato desconhecido são rejeitadas). A
+exportação grava `password_hash`, então o arquivo exportado pode
+ser reimportado sem recalcular o bcrypt.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import (Any, AsyncIterator, Dict, Iterable, Iterator,
+                    List, Optional, TextIO)
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from config import PASSWORD_CONTEXT
+from src.global_utils.hashed_email import create_email_search_hash
+from src.models.user import User
+from src.service.jwt.auth import get_hashed_password
+
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '1000'))
+# Senhas enviadas por vez a cada processo do pool
+HASH_CHUNK_SIZE = 16
+
+EXPORT_FIELDS = [
+    'id',
+    'username',
+    'email',
+    'password_hash',
+    'status',
+    'verified_account',
+    'created_in',
+]
+
+
+@dataclass
+class BulkReport:
+    read: int = 0
+    inserted: int = 0
+    duplicated: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def file_format(path: str, forced: Optional[str] = None) -> str:
+    """'csv' ou 'ndjson' (pela extensão, se não for informado)."""
+    if forced:
+        return forced
+    return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+
+def read_records(handle: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Gera um dicionário por linha, sem carregar o arquivo inteiro."""
+    if fmt == 'csv':
+        yield from csv.DictReader(handle)
+        return
+
+    for line in handle:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def chunked(
+    records: Iterable[Dict[str, Any]], size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _as_bool(value: Any, default: bool) -> bool:
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'sim', 'yes')
+
+
+async def _hash_passwords(
+    executor: Optional[ProcessPoolExecutor], passwords: List[str]
+) -> List[str]:
+    if not passwords:
+        return []
+    if executor is None:
+        return [get_hashed_password(password) for password in passwords]
+
+    # executor.map envia as senhas em blocos (menos IPC por senha); a
+    # espera fica numa thread para não bloquear o event loop
+    return await asyncio.to_thread(
+        lambda: list(
+            executor.map(
+                get_hashed_password, passwords, chunksize=HASH_CHUNK_SIZE
+            )
+        )
+    )
+
+
+async def import_chunk(
+    chunk: List[Dict[str, Any]],
+    report: BulkReport,
+    executor: Optional[ProcessPoolExecutor],
+    pre_hashed: bool = False,
+) -> None:
+    """Deduplica, calcula os hashes e insere um lote numa transação."""
+    report.read += len(chunk)
+
+    # 1. Hash de busca em lote + duplicados dentro do próprio lote
+    by_hash: Dict[str, Dict[str, Any]] = {}
+    for record in chunk:
+        email = (record.get('email') or '').strip()
+        if not email or not record.get('username'):
+            report.invalid += 1
+            continue
+        search_hash = create_email_search_hash(email)
+        if search_hash in by_hash:
+            report.duplicated += 1
+            continue
+        by_hash[search_hash] = {**record, 'email': email}
+
+    if not by_hash:
+        return
+
+    # 2. Duplicados já gravados: uma consulta pelo índice único por lote
+    existing = set(
+        await User.filter(
+            email_search_hash__in=list(by_hash)
+        ).values_list('email_search_hash', flat=True)
+    )
+    report.duplicated += len(existing)
+    pending = {h: r for h, r in by_hash.items() if h not in existing}
+
+    # 3. Senhas: hash já calculado ou bcrypt no pool de processos
+    to_hash: List[str] = []
+    for search_hash, record in list(pending.items()):
+        if pre_hashed and record.get('password'):
+            record['password_hash'] = record['password']
+        if record.get('password_hash'):
+            # Hash desconhecido faria o login falhar com erro 500
+            if not PASSWORD_CONTEXT.identify(record['password_hash']):
+                report.invalid += 1
+                del pending[search_hash]
+            continue
+        if not record.get('password'):
+            report.invalid += 1
+            del pending[search_hash]
+            continue
+        to_hash.append(search_hash)
+
+    hashed = await _hash_passwords(
+        executor, [pending[h]['password'] for h in to_hash]
+    )
+    for search_hash, password_hash in zip(to_hash, hashed):
+        pending[search_hash]['password_hash'] = password_hash
+
+    users = [
+        User(
+            username=record['username'],
+            email=record['email'],
+            password=record['password_hash'],
+            status=_as_bool(record.get('status'), True),
+            email_search_hash=search_hash,
+            verified_account=_as_bool(record.get('verified_account'), False),
+        )
+        for search_hash, record in pending.items()
+    ]
+    if not users:
+        return
+
+    # 4. Inserção em lote; conflitos de corrida com a API são ignorados
+    hashes = [user.email_search_hash for user in users]
+    async with in_transaction('default') as connection:
+        query = User.filter(email_search_hash__in=hashes).using_db(connection)
+        before = await query.count()
+        await User.bulk_create(
+            users,
+            batch_size=len(users),
+            ignore_conflicts=True,
+            using_db=connection,
+        )
+        inserted = await query.count() - before
+    report.inserted += inserted
+    report.duplicated += len(users) - inserted
+
+
+async def import_users(
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    pre_hashed: bool = False,
+) -> BulkReport:
+    report = BulkReport()
+    fmt = file_format(path, fmt)
+    start = time.perf_counter()
+
+    executor = (
+        None if pre_hashed else ProcessPoolExecutor(max_workers=workers)
+    )
+    try:
+        with open(path, newline='', encoding='utf-8') as handle:
+            for chunk in chunked(read_records(handle, fmt), chunk_size):
+                await import_chunk(chunk, report, executor, pre_hashed)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+async def iter_users(
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Percorre a tabela por faixas de id (keyset), um lote por consulta."""
+    last_id = 0
+    while True:
+        rows = (
+            await User.filter(id__gt=last_id)
+            .order_by('id')
+            .limit(chunk_size)
+            .values(
+                'id',
+                'username',
+                'email',
+                'password',
+                'status',
+                'verified_account',
+                'created_in',
+            )
+        )
+        if not rows:
+            return
+        for row in rows:
+            row['password_hash'] = row.pop('password')
+            row['created_in'] = (
+                row['created_in'].isoformat() if row['created_in'] else None
+            )
+            yield row
+        last_id = rows[-1]['id']
+
+
+async def export_users(
+    path: str, fmt: Optional[str] = None, chunk_size: int = BULK_CHUNK_SIZE
+) -> BulkReport:
+    report = BulkReport()
+    fmt = file_format(path, fmt)
+    start = time.perf_counter()
+
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = None
+        if fmt == 'csv':
+            writer = csv.DictWriter(handle, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+
+        async for row in iter_users(chunk_size):
+            if writer is not None:
+                writer.writerow(row)
+            else:
+                handle.write(json.dumps(row, ensure_ascii=False) + '\n')
+            report.read += 1
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def print_report(action: str, report: BulkReport) -> None:
+    print(
+        f'[OK] {action}: {report.read} linhas em {report.elapsed:.1f}s '
+        f'({report.rows_per_second:.0f} linhas/s) - inseridos '
+        f'{report.inserted}, duplicados {report.duplicated}, '
+        f'inválidos {report.invalid}'
+    )
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from src.database.init_database import get_tortoise_config
+
+    await Tortoise.init(config=get_tortoise_config())
+    try:
+        if args.action == 'import':
+            report = await import_users(
+                args.path,
+                args.format,
+                args.chunk_size,
+                args.workers,
+                args.pre_hashed,
+            )
+            print_report('Importação', report)
+        else:
+            report = await export_users(
+                args.path, args.format, args.chunk_size
+            )
+            print_report('Exportação', report)
+    finally:
+        await Tortoise.close_connections()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=['csv', 'ndjson'])
+    parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE)
+    parser.add_argument(
+        '--workers', type=int, help='processos do bcrypt (padrão: CPUs)'
+    )
+    parser.add_argument(
+        '--pre-hashed',
+        action='store_true',
+        help='a coluna password já contém o hash bcrypt',
+    )
+    asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
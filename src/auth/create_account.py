@@ -3,7 +3,7 @@ from typing import Any, Dict
 from fastapi import HTTPException, status
 from src.auth.exceptions import EMAIL_ALREADY_EXISTS,  ERROR_MISSING_FIELDS
 from src.models.user import User
-from src.service.jwt.auth import get_hashed_password, verify_password
+from src.service.jwt.auth import get_hashed_password_async, verify_password
 from src.global_utils.hashed_email import (create_email_search_hash, get_hashed_email,
                                     verify_email)
 
@@ -16,9 +16,7 @@ async def create_account(target) -> Dict[str, Any]:
             raise ERROR_MISSING_FIELDS
 
 
-        user = await User.filter(
-            email_search_hash=create_email_search_hash(target.get('email'))
-        ).exists()
+        user = await User.by_email(target.get('email')).exists()
         if user:
             raise EMAIL_ALREADY_EXISTS
 
@@ -27,10 +25,15 @@ async def create_account(target) -> Dict[str, Any]:
         # por email. Para verifica a conta acesser a rota (verified_account)
         if isinstance(target, dict):
 
+            # bcrypt roda no pool para não travar o event loop
+            hashed_password = await get_hashed_password_async(
+                target.get('password')
+            )
+
             create = await User.create(
                 username=target.get('username'),
                 email=target.get('email'),
-                password=get_hashed_password(target.get('password')),
+                password=hashed_password,
                 status=target.get('status'),
                 email_search_hash=create_email_search_hash(
                     target.get('email')
@@ -44,6 +47,10 @@ async def create_account(target) -> Dict[str, Any]:
                 'status': True,
             }
 
+    except HTTPException:
+        # Erros conhecidos (409, 503 do pool de hash) seguem como estão
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
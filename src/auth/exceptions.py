@@ -17,3 +17,71 @@ EMAIL_ALREADY_EXISTS = HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail='Este endereço de e-mail já está cadastrado.',
             )
+
+# Pool de hash de senhas saturado: falha rápido em vez de enfileirar
+ERROR_PASSWORD_POOL_BUSY = HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Servidor ocupado. Tente novamente em instantes.',
+                headers={'Retry-After': '1'},
+            )
+
+# Refresh token já utilizado (rotação de uso único)
+ERROR_REFRESH_TOKEN_REUSED = HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Refresh token já utilizado. Faça login novamente.',
+            )
+
+# Serviço do catálogo inexistente ou não publicado
+ERROR_SERVICE_NOT_FOUND = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Serviço não encontrado.',
+            )
+
+# Cursor de paginação adulterado ou de outra consulta
+ERROR_INVALID_CURSOR = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Cursor de paginação inválido.',
+            )
+
+# Lista de ids da comparação vazia, inválida ou longa demais
+ERROR_INVALID_COMPARE_IDS = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Informe de 2 a 300 ids de serviços separados por vírgula.',
+            )
+
+# Usuário sem avaliação no serviço (remoção)
+ERROR_REVIEW_NOT_FOUND = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Avaliação não encontrada.',
+            )
+
+# Inventário do serviço alterado por quem não é o dono
+ERROR_NOT_SERVICE_OWNER = HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail='Apenas o dono do serviço pode alterar o inventário.',
+            )
+
+# Faixa de datas vazia, invertida ou longa demais
+ERROR_INVALID_DATE_RANGE = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Faixa de datas inválida.',
+            )
+
+# Avaliação disputada por escritas simultâneas (deadlock/banco travado)
+ERROR_REVIEW_CONFLICT = HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail='Avaliação em atualização. Tente novamente.',
+                headers={'Retry-After': '1'},
+            )
+
+# Algum dia da faixa pedida sem vagas suficientes
+ERROR_SOLD_OUT = HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail='Sem vagas para as datas escolhidas.',
+            )
+
+# Reserva inexistente, de outro usuário ou já encerrada/expirada
+ERROR_RESERVATION_NOT_FOUND = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Reserva não encontrada ou já encerrada.',
+            )
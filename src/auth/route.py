@@ -4,10 +4,15 @@ from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from src.auth.create_account import create_account
 from src.auth.exceptions import ERROR_SEND_EMAIL
-from src.auth.schemas import CrateUser, LoginResponse
+from src.auth.schemas import (CrateUser, LoginResponse, RefreshRequest,
+                              RefreshResponse)
 from src.auth.utils import checking_account as validate_account
+from src.auth.utils import rotate_refresh_token
 from src.auth.schemas import SystemUser
 from src.service.jwt.depends import get_current_user
+from src.service.rate_limit.depends import (limit_login,
+                                            limit_send_code_account,
+                                            limit_send_code_ip)
 from src.service.send_email.send_verification_code import (
     activating_the_account_with_a_code, send_code_email)
 
@@ -15,7 +20,10 @@ router = APIRouter(tags=['Authentication'])
 
 
 @router.post(
-    '/login', response_model=LoginResponse, status_code=status.HTTP_200_OK
+    '/login',
+    response_model=LoginResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(limit_login)],
 )
 async def login(target: OAuth2PasswordRequestForm = Depends()):
     """Rota responsável por autenticar um usuário se o mesmo tiver uma conta."""
@@ -31,6 +39,15 @@ async def login(target: OAuth2PasswordRequestForm = Depends()):
     return verify_auth
 
 
+@router.post(
+    '/refresh', response_model=RefreshResponse, status_code=status.HTTP_200_OK
+)
+async def refresh(target: RefreshRequest):
+    """Renova os tokens sem exigir login (o refresh token é de uso único)."""
+
+    return await rotate_refresh_token(target.refresh_token)
+
+
 @router.post('/register', status_code=status.HTTP_201_CREATED)
 async def register(target: CrateUser):
     """Responsavel por cadastra uma conta de um usuario"""
@@ -52,6 +69,10 @@ async def register(target: CrateUser):
 
     O código será utilizado para verificar a conta do usuário.
     """,
+    dependencies=[
+        Depends(limit_send_code_ip),
+        Depends(limit_send_code_account),
+    ],
 )
 async def send_code_for_email(
     current_user: SystemUser = Depends(get_current_user),
@@ -83,7 +104,7 @@ async def comfim_account_with_code(
 ):
 
     activate_account = await activating_the_account_with_a_code(
-        target_account=current_user.email, code=code
+        target_account=current_user.email, code=code, user_id=current_user.id
     )
 
     if activate_account:
@@ -11,6 +11,19 @@ class LoginResponse(BaseModel):
     photo_profile: str                  # Foto de perfil
 
 
+class RefreshRequest(BaseModel):
+    """Corpo da rota de renovação de tokens"""
+
+    refresh_token: str
+
+
+class RefreshResponse(BaseModel):
+    """Novo par de tokens (o refresh token anterior deixa de valer)"""
+
+    access_token: str
+    refresh_token: str
+
+
 class CrateUser(BaseModel):
     """Schemas para cria uma conta"""
     username: str
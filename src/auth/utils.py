@@ -1,17 +1,20 @@
 from typing import Any, Dict
 from fastapi import HTTPException, status
 
+from src.auth.exceptions import ERROR_REFRESH_TOKEN_REUSED
 from src.auth.schemas import LoginResponse
 from src.models.user import User
 from src.service.jwt.auth import (create_access_token, create_refresh_token,
-                                  verify_password)
+                                  decode_refresh_token, verify_password_async)
+from src.service.jwt.principal_cache import get_cached_principal
+from src.service.jwt.revocation import REVOCATION_STORE
 from src.global_utils.hashed_email import create_email_search_hash
 
 
 async def checking_account(target: Dict[str, Any]):
     try:
-        #    Usamos .get_or_none() para obter o objeto do usuário ou None.
-        user = await User.filter(email=target.get('email')).first()
+        #    Busca pelo hash indexado do email (evita full scan na tabela)
+        user = await User.by_email(str(target.get('email'))).first()
 
         #  Se o usuário não for encontrado (user é None)
         if user is None:
@@ -19,7 +22,9 @@ async def checking_account(target: Dict[str, Any]):
             return None
 
         # 3. Verifica a senha (user agora é o objeto com o atributo .password)
-        if not verify_password(str(target.get('password')), user.password):
+        if not await verify_password_async(
+            str(target.get('password')), user.password
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail='Credenciais inválidas: senha incorreta',
@@ -51,3 +56,33 @@ async def checking_account(target: Dict[str, Any]):
         )
 
 
+async def rotate_refresh_token(refresh_token: str) -> Dict[str, str]:
+    """
+    Troca um refresh token válido por um novo par de tokens.
+
+    O refresh token recebido é consumido (uso único): uma segunda tentativa
+    com o mesmo token é rejeitada.
+    """
+    payload = decode_refresh_token(refresh_token)
+    jti = payload['jti']
+
+    if REVOCATION_STORE.is_revoked(jti):
+        raise ERROR_REFRESH_TOKEN_REUSED
+
+    if not await REVOCATION_STORE.consume(jti, float(payload['exp'])):
+        raise ERROR_REFRESH_TOKEN_REUSED
+
+    user_id = int(payload['sub'])
+    cached = get_cached_principal(user_id)
+    # Só um usuário ativo em cache dispensa a consulta
+    if cached is None or not cached.status:
+        if not await User.filter(id=user_id, status=True).exists():
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Usuário não encontrado ou desativado.',
+            )
+
+    return {
+        'access_token': create_access_token(str(user_id)),
+        'refresh_token': create_refresh_token(str(user_id)),
+    }
@@ -0,0 +1,119 @@
+import asyncio
+import bisect
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Limites (em ms) dos baldes do histograma de espera por conexão
+WAIT_BUCKETS_MS: List[float] = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000]
+
+ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '5'))
+
+
+class PoolAcquireTimeout(Exception):
+    """Nenhuma conexão ficou livre dentro de DB_POOL_ACQUIRE_TIMEOUT."""
+
+
+class PoolStats:
+    """Contadores de uso de uma conexão/pool do Tortoise."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.acquired += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.histogram[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f'<={bucket}ms' for bucket in WAIT_BUCKETS_MS] + [
+            f'>{WAIT_BUCKETS_MS[-1]}ms'
+        ]
+        return {
+            'in_use': self.in_use,
+            'waiting': self.waiting,
+            'acquired': self.acquired,
+            'timeouts': self.timeouts,
+            'wait_avg_ms': round(self.wait_total_ms / self.acquired, 3)
+            if self.acquired
+            else 0.0,
+            'wait_max_ms': round(self.wait_max_ms, 3),
+            'wait_histogram': dict(zip(labels, self.histogram)),
+        }
+
+
+# Estatísticas por nome de conexão ('default', 'reader_0', ...)
+POOL_STATS: Dict[str, PoolStats] = {}
+
+
+def pool_stats(name: str) -> PoolStats:
+    stats = POOL_STATS.get(name)
+    if stats is None:
+        stats = POOL_STATS[name] = PoolStats(name)
+    return stats
+
+
+class InstrumentedAcquire:
+    """
+    Envolve o context manager de `acquire_connection` do Tortoise: mede a
+    espera, aplica o timeout de aquisição e (MySQL) faz o pre-ping.
+    """
+
+    def __init__(self, inner: Any, client: Any) -> None:
+        self._inner = inner
+        self._client = client
+        self._stats = pool_stats(client.connection_name)
+
+    async def __aenter__(self) -> Any:
+        start = time.perf_counter()
+        self._stats.waiting += 1
+        try:
+            connection = await asyncio.wait_for(
+                self._inner.__aenter__(), timeout=ACQUIRE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            self._stats.timeouts += 1
+            raise PoolAcquireTimeout(
+                f'Timeout ao obter conexão "{self._stats.name}" '
+                f'({ACQUIRE_TIMEOUT}s)'
+            )
+        finally:
+            self._stats.waiting -= 1
+
+        self._stats.record_wait((time.perf_counter() - start) * 1000)
+        self._stats.in_use += 1
+
+        try:
+            await self._client.pre_ping(connection)
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+
+        return connection
+
+    async def __aexit__(self, *exc: Any) -> Optional[bool]:
+        self._stats.in_use -= 1
+        return await self._inner.__aexit__(*exc)
+
+
+class InstrumentedClientMixin:
+    """Mixin para os clients do Tortoise (ver backends/mysql.py e sqlite.py)."""
+
+    connection_name: str
+
+    def acquire_connection(self) -> InstrumentedAcquire:
+        return InstrumentedAcquire(super().acquire_connection(), self)
+
+    async def pre_ping(self, connection: Any) -> None:
+        """Validação da conexão antes do uso (sobrescrito no MySQL)."""
+
+    def pool_snapshot(self) -> Dict[str, Any]:
+        return pool_stats(self.connection_name).snapshot()
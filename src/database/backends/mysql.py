@@ -0,0 +1,32 @@
+"""Engine MySQL do Tortoise com pre-ping, timeout de aquisição e telemetria."""
+import os
+
+from tortoise.backends.mysql.client import MySQLClient
+
+from src.database.backends.instrumented import InstrumentedClientMixin
+
+PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+
+class InstrumentedMySQLClient(InstrumentedClientMixin, MySQLClient):
+    async def pre_ping(self, connection) -> None:
+        # Reabre conexões derrubadas pelo servidor (wait_timeout, failover)
+        if PRE_PING:
+            await connection.ping(reconnect=True)
+
+    def pool_snapshot(self):
+        snapshot = super().pool_snapshot()
+        pool = getattr(self, '_pool', None)
+        snapshot.update(
+            minsize=self.pool_minsize,
+            maxsize=self.pool_maxsize,
+            size=pool.size if pool is not None else 0,
+            idle=pool.freesize if pool is not None else 0,
+        )
+        if pool is not None:
+            # Inclui conexões presas em transações (que não passam pelo wrapper)
+            snapshot['in_use'] = pool.size - pool.freesize
+        return snapshot
+
+
+client_class = InstrumentedMySQLClient
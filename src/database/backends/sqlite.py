@@ -0,0 +1,16 @@
+"""Engine SQLite do Tortoise com telemetria de conexão."""
+from tortoise.backends.sqlite.client import SqliteClient
+
+from src.database.backends.instrumented import InstrumentedClientMixin
+
+
+class InstrumentedSqliteClient(InstrumentedClientMixin, SqliteClient):
+    """Cada conexão SQLite é única: `in_use` é 0 ou 1 e a espera é o lock."""
+
+    def pool_snapshot(self):
+        snapshot = super().pool_snapshot()
+        snapshot.update(size=1, idle=1 - min(snapshot['in_use'], 1))
+        return snapshot
+
+
+client_class = InstrumentedSqliteClient
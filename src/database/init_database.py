@@ -1,18 +1,116 @@
+import math
 import os
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
-from dotenv import load_dotenv
 from tortoise import Tortoise
 from tortoise.exceptions import ConfigurationError, DBConnectionError
 
+from src.global_utils.env import load_env
 # Assumindo que 'src.ultils.logs' contém o LOGGER configurado
 from src.global_utils.logs import LOGGER
 
-load_dotenv()
+load_env()
 
 # --- Configuração de Constantes (Melhor Prática) ---
 # Caminho padrão para o arquivo SQLite local, se não for definido no .env
-DEFAULT_SQLITE_PATH = 'local_db.sqlite'
+DEFAULT_SQLITE_PATH = 'g_turismo.db'
+
+# Prefixo das conexões somente leitura do SQLite (ver src/database/read_pool.py)
+READER_PREFIX = 'reader_'
+# Prefixo das réplicas de leitura (ver src/database/router.py)
+REPLICA_PREFIX = 'replica_'
+
+
+def replica_list(variable: str) -> list:
+    """Lista separada por vírgulas no .env (arquivos ou hosts de réplicas)."""
+    items = os.getenv(variable, '').split(',')
+    return [item.strip() for item in items if item.strip()]
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """
+    Perfil de desempenho do SQLite, aplicado como PRAGMA em cada conexão
+    aberta pelo Tortoise.
+
+    - WAL: leitores não bloqueiam o escritor (e vice-versa).
+    - synchronous=NORMAL: seguro com WAL, sem fsync a cada commit.
+    - mmap_size / cache_size / temp_store / busy_timeout vêm do .env.
+    """
+    return {
+        'journal_mode': 'WAL',
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Valor negativo = tamanho em KiB (aqui 64 MiB por conexão)
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-65536')),
+        'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000')),
+    }
+
+
+def mysql_pool_size() -> Tuple[int, int]:
+    """
+    Tamanho do pool MySQL por worker.
+
+    DB_POOL_TARGET_CONCURRENCY é o total de consultas simultâneas desejado
+    para a aplicação inteira; ele é dividido entre os UVICORN_WORKERS.
+    DB_POOL_MINSIZE / DB_POOL_MAXSIZE sobrescrevem o cálculo.
+    """
+    workers = max(1, int(os.getenv('UVICORN_WORKERS', '1')))
+    target = int(os.getenv('DB_POOL_TARGET_CONCURRENCY', '40'))
+
+    maxsize = int(
+        os.getenv('DB_POOL_MAXSIZE', str(max(2, math.ceil(target / workers))))
+    )
+    minsize = int(os.getenv('DB_POOL_MINSIZE', str(max(1, maxsize // 4))))
+
+    server_limit = os.getenv('DB_MAX_CONNECTIONS')
+    if server_limit and workers * maxsize > int(server_limit):
+        LOGGER.warning(
+            f'[FAIL] {workers} workers x {maxsize} conexões excedem '
+            f'DB_MAX_CONNECTIONS={server_limit}'
+        )
+
+    return min(minsize, maxsize), maxsize
+
+
+def sqlite_connections(file_path: str) -> Dict[str, Any]:
+    """
+    Uma conexão de escrita ('default') e um pool de conexões somente
+    leitura (`query_only`), cada uma na sua própria thread do aiosqlite.
+    """
+    engine = 'src.database.backends.sqlite'
+    pragmas = sqlite_pragmas()
+
+    connections = {
+        'default': {
+            'engine': engine,
+            'credentials': {'file_path': file_path, **pragmas},
+        }
+    }
+
+    for index in range(int(os.getenv('SQLITE_READERS', '4'))):
+        connections[f'{READER_PREFIX}{index}'] = {
+            'engine': engine,
+            'credentials': {
+                'file_path': file_path,
+                **pragmas,
+                'query_only': 'ON',
+            },
+        }
+
+    # Réplicas: cópias do arquivo principal (DB_REPLICAS=a.db,b.db)
+    for index, replica_path in enumerate(replica_list('DB_REPLICAS')):
+        connections[f'{REPLICA_PREFIX}{index}'] = {
+            'engine': engine,
+            'credentials': {
+                'file_path': replica_path,
+                **pragmas,
+                'query_only': 'ON',
+            },
+        }
+
+    return connections
 
 
 def sqlite_config() -> Dict[str, Any]:
@@ -55,7 +153,8 @@ def sqlite_config() -> Dict[str, Any]:
         DB_HOST = os.getenv('DB_HOST_PROD', 'localhost')
         DB_PORT = os.getenv('DB_PORT_PROD', '3306')
 
-        ENGINE = 'tortoise.backends.mysql'
+        # Engine do Tortoise com telemetria e pre-ping (src/database/backends)
+        ENGINE = 'src.database.backends.mysql'
 
     else:   # ENVIRONMENT == 'DEVELOPMENT'
         # ----------------------------------------------------
@@ -75,7 +174,7 @@ def sqlite_config() -> Dict[str, Any]:
         # DB_HOST = None  apenas se estive em produção
         # DB_PORT = None  apenas se estive em produção
 
-        ENGINE = 'tortoise.backends.sqlite'
+        ENGINE = 'src.database.backends.sqlite'
 
         LOGGER.info(
             f' [OK] Usando **DEVELOPMENT (SQLite)**. Arquivo: {DB_NAME}'
@@ -109,13 +208,13 @@ def sqlite_config() -> Dict[str, Any]:
     # 3. Retorno da Configuração do Tortoise
     # ----------------------------------------------------
 
-    # No caso do SQLite, o Tortoise prefere a chave 'db_url' no credentials ou connection
-    # O Tortoise simplifica a conexão SQLite usando 'db_url' ou 'database' como o nome/caminho do arquivo.
-    # Vou usar o formato `db_url` que é mais universal e limpa a configuração de credenciais desnecessárias.
+    # No caso do SQLite usamos 'file_path' + PRAGMAs nas credenciais: o
+    # Tortoise aplica cada chave extra como `PRAGMA chave=valor` ao conectar.
 
-    if ENGINE == 'tortoise.backends.sqlite':
-        connection_credentials = {'db_url': DB_URL}
+    if ENGINE == 'src.database.backends.sqlite':
+        connections = sqlite_connections(DB_NAME)
     else:   # MySQL, etc.
+        pool_minsize, pool_maxsize = mysql_pool_size()
         connection_credentials = {
             'host': DB_HOST,
             'port': int(DB_PORT) if DB_PORT else 3306,
@@ -124,38 +223,73 @@ def sqlite_config() -> Dict[str, Any]:
             'database': DB_NAME,
             'charset': 'utf8mb4',
             'autocommit': True,
-            'minsize': 1,
-            'maxsize': 5,
+            'minsize': pool_minsize,
+            'maxsize': pool_maxsize,
+            # Recicla conexões antes do wait_timeout do servidor
+            'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
             'sql_mode': 'STRICT_TRANS_TABLES',
             'connect_timeout': 30,  # Timeout de conexão
         }
-
-    return {
-        'connections': {
+        connections = {
             'default': {
-                'engine': ENGINE,  # Dinâmico: sqlite ou mysql
+                'engine': ENGINE,
                 'credentials': connection_credentials,
-                'credentials': {'file_path': 'g_turismo.db'},
             }
-        },
+        }
+
+        # Réplicas MySQL: mesmas credenciais, outro host (DB_REPLICA_HOSTS)
+        for index, host in enumerate(replica_list('DB_REPLICA_HOSTS')):
+            connections[f'{REPLICA_PREFIX}{index}'] = {
+                'engine': ENGINE,
+                'credentials': {**connection_credentials, 'host': host},
+            }
+
+    return {
+        'connections': connections,
         'apps': {
             'models': {
                 'models': [
                     'src.models.user',
+                    'src.models.token',
+                    'src.models.verification_code',
+                    'src.models.service',
+                    'src.models.review',
+                    'src.models.reservation',
+                    'src.models.calendar',
+                    'src.models.activity',
                 ],
                 'default_connection': 'default',
             }
         },
+        # Leituras vão para réplicas/leitores, escritas para 'default'
+        'routers': ['src.database.router.ReplicaRouter'],
         'use_tz': True,
         'timezone': 'America/Sao_Paulo',
     }
 
 
-TORTOISE_ORM = sqlite_config()
+@lru_cache(maxsize=None)
+def get_tortoise_config() -> Dict[str, Any]:
+    """
+    Configuração do Tortoise, montada no primeiro uso (e não na importação).
+
+    Importar este módulo não lê credenciais nem escreve no log; quem precisa
+    da configuração chama esta função ou acessa `TORTOISE_ORM`.
+    """
+    return sqlite_config()
+
+
+def __getattr__(name: str) -> Any:
+    # `from src.database.init_database import TORTOISE_ORM` continua
+    # funcionando, mas a configuração só é montada quando for pedida
+    if name == 'TORTOISE_ORM':
+        return get_tortoise_config()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 async def init_database() -> bool:
     """Inicializa o Tortoise ORM."""
+    TORTOISE_ORM = get_tortoise_config()
 
     engine_name = TORTOISE_ORM['connections']['default']['engine'].split('.')[
         -1
@@ -185,9 +319,11 @@ async def init_database() -> bool:
             LOGGER.error(f'[FAIL] Falha ao testar conexão {db_type}: {e}')
             return False
 
-        # Cria as tabelas se não existirem
-        await Tortoise.generate_schemas()
-        LOGGER.info('[OK] Tabelas criadas/verificadas!')
+        # Aplica migrações pendentes (import tardio: migrations usa o LOGGER)
+        from src.database.migrations import migrate
+
+        applied = await migrate()
+        LOGGER.info(f'[OK] Tabelas verificadas! ({applied} migrações)')
 
         print_database_info()
         return True
@@ -202,7 +338,7 @@ async def init_database() -> bool:
         creds = TORTOISE_ORM['connections']['default']['credentials']
 
         if db_type == 'SQLite':
-            info = f'Arquivo: {creds.get("db_url", "N/A")}'
+            info = f'Arquivo: {creds.get("file_path", "N/A")}'
         else:
             info = f'Host: {creds.get("host")}:{creds.get("port")}, DB: {creds.get("database")}, User: {creds.get("user")}'
 
@@ -229,6 +365,7 @@ async def close_database():
 
 def print_database_info():
     """Exibe informações de conexão do DB para o log."""
+    TORTOISE_ORM = get_tortoise_config()
     conn_config = TORTOISE_ORM['connections']['default']
     creds = conn_config['credentials']
     engine_name = conn_config['engine'].split('.')[-1]
@@ -237,7 +374,7 @@ def print_database_info():
     LOGGER.info('-----------------------------------------')
 
     if db_type == 'SQLite':
-        db_path = creds.get('db_url', 'N/A').replace('sqlite://', '')
+        db_path = creds.get('file_path', 'N/A')
         LOGGER.info(f'📦 [OK] Conectado a **{db_type}**:')
         LOGGER.info(f'   - Caminho do Arquivo: {db_path}')
     else:   # MySQL
@@ -0,0 +1,364 @@
+"""
+Versionamento do schema do banco.
+
+A versão aplicada fica numa tabela de uma linha (`schema_version`). No
+startup cada worker faz uma única consulta: se a versão já é a mais nova,
+nenhum trabalho de schema é feito. Caso contrário, um único worker (sob um
+lock de arquivo, ou GET_LOCK no MySQL) aplica as migrações pendentes em
+ordem; os demais esperam o lock, relêem a versão e seguem.
+
+Para alterar o schema, acrescente uma `Migration` ao final de MIGRATIONS.
+
+    python -m src.database.migrations
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+from tortoise import BaseDBAsyncClient, Tortoise, connections
+from tortoise.transactions import in_transaction
+
+from src.global_utils.logs import LOGGER
+
+try:
+    import fcntl
+except ImportError:   # Windows: sem lock entre processos
+    fcntl = None
+
+MIGRATIONS_LOCK_FILE = os.getenv(
+    'MIGRATIONS_LOCK_FILE', '.schema_migrations.lock'
+)
+
+
+MigrationFunc = Callable[[BaseDBAsyncClient], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: MigrationFunc
+
+
+def sql_migration(*statements: str) -> MigrationFunc:
+    """Migração formada por instruções SQL executadas em ordem."""
+
+    async def apply(connection: BaseDBAsyncClient) -> None:
+        for statement in statements:
+            await connection.execute_script(statement)
+
+    return apply
+
+
+def dialect_migration(**statements_by_dialect: List[str]) -> MigrationFunc:
+    """
+    Migração com SQL específico por banco (`sqlite=[...]`, `mysql=[...]`).
+    Bancos sem instruções na lista são ignorados.
+    """
+
+    async def apply(connection: BaseDBAsyncClient) -> None:
+        dialect = connection.capabilities.dialect
+        for statement in statements_by_dialect.get(dialect, []):
+            await connection.execute_script(statement)
+
+    return apply
+
+
+def add_columns(table: str, **types_by_column: Dict[str, str]) -> MigrationFunc:
+    """
+    Acrescenta colunas a uma tabela existente, pulando as que já existem
+    (num banco novo a migração 'create_missing_tables' já cria a tabela com
+    as colunas atuais do model).
+
+        add_columns('services', latitude={'sqlite': 'REAL', 'mysql': 'DOUBLE'})
+    """
+
+    async def apply(connection: BaseDBAsyncClient) -> None:
+        dialect = connection.capabilities.dialect
+        if dialect == 'sqlite':
+            _, rows = await connection.execute_query(
+                f'PRAGMA table_info({table})'
+            )
+            existing = {dict(row)['name'] for row in rows}
+        else:
+            _, rows = await connection.execute_query(
+                'SELECT COLUMN_NAME AS name FROM information_schema.COLUMNS '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [table],
+            )
+            existing = {dict(row)['name'] for row in rows}
+
+        for column, types in types_by_column.items():
+            if column not in existing:
+                await connection.execute_script(
+                    f'ALTER TABLE {table} ADD COLUMN {column} {types[dialect]}'
+                )
+
+    return apply
+
+
+def combine(*migrations: MigrationFunc) -> MigrationFunc:
+    """Uma migração formada por outras, aplicadas em ordem."""
+
+    async def apply(connection: BaseDBAsyncClient) -> None:
+        for migration in migrations:
+            await migration(connection)
+
+    return apply
+
+
+async def create_missing_tables(connection: BaseDBAsyncClient) -> None:
+    """Cria as tabelas/índices dos models que ainda não existem."""
+    await Tortoise.generate_schemas(safe=True)
+
+
+# Busca textual do catálogo (src/services_g_turismo/search.py). No SQLite,
+# uma tabela FTS5 de conteúdo externo mantida por triggers; no MySQL, um
+# índice FULLTEXT (a collation utf8mb4 padrão já ignora acentos).
+_SERVICES_FTS_COLUMNS = 'title, description, city, state'
+_SERVICES_FTS_NEW = 'new.id, new.title, new.description, new.city, new.state'
+_SERVICES_FTS_OLD = 'old.id, old.title, old.description, old.city, old.state'
+
+SERVICE_SEARCH_INDEX = dialect_migration(
+    sqlite=[
+        'CREATE VIRTUAL TABLE IF NOT EXISTS services_fts USING fts5('
+        f"{_SERVICES_FTS_COLUMNS}, content='services', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER IF NOT EXISTS services_fts_ai AFTER INSERT ON '
+        'services BEGIN INSERT INTO services_fts(rowid, '
+        f'{_SERVICES_FTS_COLUMNS}) VALUES ({_SERVICES_FTS_NEW}); END',
+        'CREATE TRIGGER IF NOT EXISTS services_fts_ad AFTER DELETE ON '
+        'services BEGIN INSERT INTO services_fts(services_fts, rowid, '
+        f"{_SERVICES_FTS_COLUMNS}) VALUES ('delete', {_SERVICES_FTS_OLD}); "
+        'END',
+        'CREATE TRIGGER IF NOT EXISTS services_fts_au AFTER UPDATE OF '
+        f'{_SERVICES_FTS_COLUMNS} ON services BEGIN '
+        f'INSERT INTO services_fts(services_fts, rowid, {_SERVICES_FTS_COLUMNS}) '
+        f"VALUES ('delete', {_SERVICES_FTS_OLD}); "
+        f'INSERT INTO services_fts(rowid, {_SERVICES_FTS_COLUMNS}) '
+        f'VALUES ({_SERVICES_FTS_NEW}); END',
+        # Indexa os serviços que já existiam
+        "INSERT INTO services_fts(services_fts) VALUES ('rebuild')",
+    ],
+    mysql=[
+        'ALTER TABLE services ADD FULLTEXT INDEX services_fulltext '
+        '(title, description, city, state)',
+    ],
+)
+
+
+# Busca por proximidade (src/services_g_turismo/geo.py). No SQLite, um
+# R*Tree com a caixa de cada serviço (um ponto: min = max), mantido por
+# triggers; no MySQL, o índice (latitude, longitude) do model faz o
+# pré-filtro por faixa de latitude.
+_RTREE_INSERT = (
+    'INSERT INTO services_rtree (id, min_lat, max_lat, min_lon, max_lon) '
+    'SELECT new.id, new.latitude, new.latitude, new.longitude, '
+    'new.longitude WHERE new.latitude IS NOT NULL '
+    'AND new.longitude IS NOT NULL;'
+)
+
+SERVICE_GEO_INDEX = combine(
+    add_columns(
+        'services',
+        latitude={'sqlite': 'REAL', 'mysql': 'DOUBLE'},
+        longitude={'sqlite': 'REAL', 'mysql': 'DOUBLE'},
+    ),
+    dialect_migration(
+        sqlite=[
+            'CREATE INDEX IF NOT EXISTS idx_services_lat_lon '
+            'ON services (latitude, longitude)',
+            'CREATE VIRTUAL TABLE IF NOT EXISTS services_rtree USING '
+            'rtree(id, min_lat, max_lat, min_lon, max_lon)',
+            'CREATE TRIGGER IF NOT EXISTS services_rtree_ai AFTER INSERT ON '
+            f'services BEGIN {_RTREE_INSERT} END',
+            'CREATE TRIGGER IF NOT EXISTS services_rtree_au AFTER UPDATE OF '
+            'latitude, longitude ON services BEGIN '
+            'DELETE FROM services_rtree WHERE id = old.id; '
+            f'{_RTREE_INSERT} END',
+            'CREATE TRIGGER IF NOT EXISTS services_rtree_ad AFTER DELETE ON '
+            'services BEGIN DELETE FROM services_rtree WHERE id = old.id; END',
+            'INSERT OR REPLACE INTO services_rtree '
+            '(id, min_lat, max_lat, min_lon, max_lon) '
+            'SELECT id, latitude, latitude, longitude, longitude '
+            'FROM services WHERE latitude IS NOT NULL '
+            'AND longitude IS NOT NULL',
+        ],
+        mysql=[
+            'CREATE INDEX idx_services_lat_lon '
+            'ON services (latitude, longitude)',
+        ],
+    ),
+)
+
+# Facetas (src/services_g_turismo/facets.py): duração dos serviços e índice
+# em updated_in para a sincronização incremental entre workers
+SERVICE_FACETS = combine(
+    add_columns(
+        'services',
+        duration_days={
+            'sqlite': 'SMALLINT NOT NULL DEFAULT 1',
+            'mysql': 'SMALLINT NOT NULL DEFAULT 1',
+        },
+    ),
+    dialect_migration(
+        sqlite=[
+            'CREATE INDEX IF NOT EXISTS idx_services_updated_in '
+            'ON services (updated_in)',
+        ],
+        mysql=[
+            'CREATE INDEX idx_services_updated_in ON services (updated_in)',
+        ],
+    ),
+)
+
+
+async def backfill_service_calendars(connection: BaseDBAsyncClient) -> None:
+    """Calendários em bitmap do inventário já existente."""
+    from src.services_g_turismo.calendars import backfill_calendars
+
+    await backfill_calendars(connection)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'schema inicial (models registrados)', create_missing_tables),
+    Migration(2, 'catálogo de serviços', create_missing_tables),
+    Migration(3, 'busca textual de serviços', SERVICE_SEARCH_INDEX),
+    Migration(4, 'coordenadas e R*Tree de serviços', SERVICE_GEO_INDEX),
+    Migration(5, 'duração e sincronização de facetas', SERVICE_FACETS),
+    Migration(
+        6,
+        'comodidades dos serviços',
+        add_columns(
+            'services', amenities={'sqlite': 'JSON NULL', 'mysql': 'JSON NULL'}
+        ),
+    ),
+    Migration(7, 'avaliações e agregados', create_missing_tables),
+    Migration(8, 'inventário por dia e reservas', create_missing_tables),
+    Migration(
+        9,
+        'calendários de disponibilidade em bitmap',
+        combine(create_missing_tables, backfill_service_calendars),
+    ),
+    Migration(
+        10, 'favoritos e histórico de visualizações', create_missing_tables
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+async def _ensure_version_table(connection: BaseDBAsyncClient) -> None:
+    await connection.execute_script(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        ' id INT NOT NULL PRIMARY KEY,'
+        ' version INT NOT NULL,'
+        ' applied_in VARCHAR(32) NOT NULL'
+        ')'
+    )
+
+
+async def current_version(connection: BaseDBAsyncClient) -> int:
+    """Versão aplicada (0 se o banco nunca foi migrado)."""
+    try:
+        _, rows = await connection.execute_query(
+            'SELECT version FROM schema_version WHERE id = 1'
+        )
+    except Exception:
+        # Tabela ainda não existe
+        return 0
+    return int(dict(rows[0])['version']) if rows else 0
+
+
+async def _set_version(connection: BaseDBAsyncClient, version: int) -> None:
+    mark = '?' if connection.capabilities.dialect == 'sqlite' else '%s'
+    applied_in = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    updated, _ = await connection.execute_query(
+        f'UPDATE schema_version SET version = {mark}, applied_in = {mark} '
+        'WHERE id = 1',
+        [version, applied_in],
+    )
+    if not updated:
+        await connection.execute_query(
+            'INSERT INTO schema_version (id, version, applied_in) '
+            f'VALUES (1, {mark}, {mark})',
+            [version, applied_in],
+        )
+
+
+@asynccontextmanager
+async def _migration_lock(
+    connection: BaseDBAsyncClient,
+) -> AsyncIterator[None]:
+    """Garante que só um worker aplica migrações por vez."""
+    if connection.capabilities.dialect == 'mysql':
+        # GET_LOCK pertence à sessão: a transação prende uma única conexão
+        async with in_transaction('default') as session:
+            await session.execute_query(
+                "SELECT GET_LOCK('schema_migrations', 300)"
+            )
+            try:
+                yield
+            finally:
+                await session.execute_query(
+                    "SELECT RELEASE_LOCK('schema_migrations')"
+                )
+        return
+
+    lock_file = open(MIGRATIONS_LOCK_FILE, 'a+')
+    try:
+        if fcntl is not None:
+            await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+
+async def migrate() -> int:
+    """
+    Aplica as migrações pendentes e retorna quantas foram aplicadas.
+
+    Caminho rápido: uma consulta de uma linha quando o schema está em dia.
+    """
+    connection = connections.get('default')
+
+    if await current_version(connection) >= LATEST_VERSION:
+        return 0
+
+    async with _migration_lock(connection):
+        await _ensure_version_table(connection)
+
+        # Outro worker pode ter migrado enquanto esperávamos o lock
+        version = await current_version(connection)
+        pending = [m for m in MIGRATIONS if m.version > version]
+
+        for migration in pending:
+            LOGGER.info(
+                f'[OK] Aplicando migração {migration.version}: '
+                f'{migration.name}'
+            )
+            await migration.apply(connection)
+            await _set_version(connection, migration.version)
+
+    return len(pending)
+
+
+async def _run() -> None:
+    from src.database.init_database import TORTOISE_ORM
+
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        applied = await migrate()
+        print(f'[OK] {applied} migrações aplicadas (versão {LATEST_VERSION}).')
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == '__main__':
+    asyncio.run(_run())
@@ -0,0 +1,361 @@
+"""
+Auditoria de planos de execução (EXPLAIN QUERY PLAN).
+
+Cada consulta ORM emitida pela aplicação deve estar registrada em
+`QUERY_PLAN_CASES`. A auditoria monta as tabelas num SQLite em memória,
+roda `EXPLAIN QUERY PLAN` em cada consulta e acusa as que caem num
+full scan de tabela.
+
+Uso (retorna código de saída 1 se houver regressão):
+
+    python -m src.database.query_plan
+"""
+import asyncio
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from tortoise import Tortoise
+from tortoise.expressions import F
+from tortoise.functions import Count
+
+from src.models.activity import Favorite, ServiceView
+from src.models.calendar import ServiceCalendar
+from src.models.reservation import (Inventory, Reservation,
+                                    ReservationStatus)
+from src.models.review import Review, ServiceRating
+from src.models.service import Service, ServiceKind
+from src.models.token import RevokedToken
+from src.models.user import User
+from src.models.verification_code import VerificationCode
+from src.services_g_turismo.geo import SQLITE_BOX_SQL
+from src.services_g_turismo.search import SQLITE_SEARCH_SQL
+
+
+@dataclass(frozen=True)
+class QueryPlanCase:
+    """Uma consulta da aplicação e se ela pode (de propósito) varrer a tabela."""
+
+    name: str
+    build: Callable[[], Any]
+    allow_scan: bool = False
+
+
+@dataclass(frozen=True)
+class RawSQL:
+    """Consulta SQL crua (FTS5, R*Tree...) com os parâmetros já inline."""
+
+    text: str
+
+    @classmethod
+    def with_params(cls, text: str, params: List[Any]) -> 'RawSQL':
+        for param in params:
+            literal = f"'{param}'" if isinstance(param, str) else repr(param)
+            text = text.replace('?', literal, 1)
+        return cls(text)
+
+    def sql(self, params_inline: bool = True) -> str:
+        return self.text
+
+
+QUERY_PLAN_CASES: List[QueryPlanCase] = [
+    # Autenticação / get_current_user
+    QueryPlanCase('user_by_id', lambda: User.get_or_none(id=1)),
+    QueryPlanCase(
+        'user_by_email', lambda: User.by_email('user@example.com').first()
+    ),
+    QueryPlanCase(
+        'user_email_exists',
+        lambda: User.by_email('user@example.com').exists(),
+    ),
+    # user.save() sempre atualiza pela chave primária
+    QueryPlanCase(
+        'user_update_by_id',
+        lambda: User.filter(id=1).update(status=True),
+    ),
+    QueryPlanCase(
+        'active_user_exists',
+        lambda: User.filter(id=1, status=True).exists(),
+    ),
+    # Importação/exportação em massa (src/auth/bulk_users.py)
+    QueryPlanCase(
+        'bulk_import_existing_hashes',
+        lambda: User.filter(
+            email_search_hash__in=['a' * 64, 'b' * 64]
+        ).values_list('email_search_hash', flat=True),
+    ),
+    QueryPlanCase(
+        'bulk_export_keyset',
+        lambda: User.filter(id__gt=1000).order_by('id').limit(1000),
+    ),
+    # Rotação de refresh tokens
+    QueryPlanCase(
+        'revoked_tokens_prune',
+        lambda: RevokedToken.filter(expires_in__lte='2000-01-01').delete(),
+    ),
+    # Códigos de verificação
+    QueryPlanCase(
+        'verification_code_issue',
+        lambda: VerificationCode.filter(user_id=1).update(code='1234'),
+    ),
+    QueryPlanCase(
+        'verification_code_consume',
+        lambda: VerificationCode.filter(
+            user_id=1,
+            code='1234',
+            consumed=False,
+            expires_in__gt='2000-01-01',
+            attempts__lt=5,
+        ).update(consumed=True),
+    ),
+    # Varredura em lote em background; a tabela só guarda códigos ativos
+    QueryPlanCase(
+        'verification_code_sweep',
+        lambda: VerificationCode.filter(consumed=True).delete(),
+        allow_scan=True,
+    ),
+    # Catálogo de serviços (src/services_g_turismo/catalog.py)
+    QueryPlanCase(
+        'service_page_first',
+        lambda: Service.filter(published=True).order_by('-id').limit(21),
+    ),
+    QueryPlanCase(
+        'service_page_cursor',
+        lambda: Service.filter(published=True, id__lt=5000)
+        .order_by('-id')
+        .limit(21),
+    ),
+    QueryPlanCase(
+        'service_page_by_kind',
+        lambda: Service.filter(
+            published=True, kind=ServiceKind.TOUR, id__lt=5000
+        )
+        .order_by('-id')
+        .limit(21),
+    ),
+    QueryPlanCase(
+        'service_page_by_city',
+        lambda: Service.filter(published=True, city='Recife', id__lt=5000)
+        .order_by('-id')
+        .limit(21),
+    ),
+    QueryPlanCase(
+        'service_detail',
+        lambda: Service.filter(id=1, published=True),
+    ),
+    # Busca textual (src/services_g_turismo/search.py)
+    QueryPlanCase(
+        'service_search_fts',
+        lambda: RawSQL.with_params(
+            SQLITE_SEARCH_SQL, ['"praia"*', 1e308, 1e308, 0, 21]
+        ),
+    ),
+    # Busca por proximidade (src/services_g_turismo/geo.py)
+    QueryPlanCase(
+        'service_near_rtree',
+        lambda: RawSQL.with_params(
+            SQLITE_BOX_SQL, [-8.2, -7.9, -35.1, -34.8]
+        ),
+    ),
+    QueryPlanCase(
+        'service_near_fetch',
+        lambda: Service.filter(id__in=[1, 2, 3]),
+    ),
+    # Facetas (src/services_g_turismo/facets.py)
+    QueryPlanCase(
+        'facets_load',
+        lambda: Service.filter(published=True, id__gt=5000)
+        .order_by('id')
+        .limit(5000),
+    ),
+    QueryPlanCase(
+        'facets_sync',
+        lambda: Service.filter(updated_in__gte='2025-01-01', id__gt=0)
+        .order_by('id')
+        .limit(5000),
+    ),
+    QueryPlanCase(
+        'services_by_ids',
+        lambda: Service.filter(id__in=[1, 2, 3], published=True),
+    ),
+    # Avaliações e agregados (src/services_g_turismo/reviews.py)
+    QueryPlanCase(
+        'service_page_with_rating',
+        lambda: Service.filter(published=True, id__lt=5000)
+        .order_by('-id')
+        .limit(21)
+        .values(
+            'id',
+            rating='rating_aggregate__average',
+            review_count='rating_aggregate__count',
+        ),
+    ),
+    QueryPlanCase(
+        'review_by_user',
+        lambda: Review.filter(service_id=1, user_id=1).first(),
+    ),
+    QueryPlanCase(
+        'review_page',
+        lambda: Review.filter(service_id=1, id__lt=500)
+        .order_by('-id')
+        .limit(21),
+    ),
+    QueryPlanCase(
+        'rating_apply_delta',
+        lambda: ServiceRating.filter(service_id=1).update(
+            count=F('count') + 1,
+            total=F('total') + 5,
+            stars_5=F('stars_5') + 1,
+        ),
+    ),
+    QueryPlanCase(
+        'rating_reconcile_batch',
+        lambda: Review.filter(service_id__in=[1, 2, 3])
+        .annotate(amount=Count('id'))
+        .group_by('service_id', 'stars')
+        .values('service_id', 'stars', 'amount'),
+    ),
+    QueryPlanCase(
+        'rating_reconcile_services',
+        lambda: Service.filter(id__gt=0).order_by('id').limit(500),
+    ),
+    # Inventário e reservas (src/services_g_turismo/reservations.py)
+    QueryPlanCase(
+        'inventory_reserve_cas',
+        lambda: Inventory.filter(
+            service_id=1,
+            day__gte='2025-12-20',
+            day__lt='2025-12-27',
+            remaining__gte=2,
+        ).update(remaining=F('remaining') - 2),
+    ),
+    QueryPlanCase(
+        'inventory_availability',
+        lambda: Inventory.filter(
+            service_id=1, day__gte='2025-12-01', day__lt='2025-12-31'
+        ).order_by('day'),
+    ),
+    QueryPlanCase(
+        'reservation_confirm',
+        lambda: Reservation.filter(
+            token='abc',
+            user_id=1,
+            status=ReservationStatus.HELD,
+            expires_in__gt='2025-01-01',
+        ).update(status=ReservationStatus.CONFIRMED),
+    ),
+    QueryPlanCase(
+        'reservation_sweep_due',
+        lambda: Reservation.filter(
+            status=ReservationStatus.HELD, expires_in__lte='2025-01-01'
+        ).limit(500),
+    ),
+    # Calendários em bitmap (src/services_g_turismo/calendars.py)
+    QueryPlanCase(
+        'calendar_refresh_year',
+        lambda: Inventory.filter(
+            service_id=1,
+            day__gte='2025-01-01',
+            day__lt='2026-01-01',
+            remaining__gt=0,
+        ),
+    ),
+    # Mesmo WHERE do UPDATE do bitmap (parâmetro binário não vira literal)
+    QueryPlanCase(
+        'calendar_store',
+        lambda: ServiceCalendar.filter(service_id=1, year=2025),
+    ),
+    QueryPlanCase(
+        'calendar_sync',
+        lambda: ServiceCalendar.filter(
+            updated_in__gte='2025-01-01', id__gt=0
+        )
+        .order_by('id')
+        .limit(5000),
+    ),
+    # Favoritos e histórico (src/services_g_turismo/activity.py)
+    QueryPlanCase(
+        'favorites_recent',
+        lambda: Favorite.filter(user_id=1).order_by('-created_in').limit(20),
+    ),
+    QueryPlanCase(
+        'favorites_remove_batch',
+        lambda: Favorite.filter(user_id=1, service_id__in=[1, 2, 3]).delete(),
+    ),
+    QueryPlanCase(
+        'history_recent',
+        lambda: ServiceView.filter(user_id=1)
+        .order_by('-last_viewed_in')
+        .limit(20),
+    ),
+]
+
+
+def query_sql(query: Any) -> str:
+    """SQL final (com parâmetros inline) de um QuerySet/Query do Tortoise."""
+    try:
+        return query.sql(params_inline=True)
+    except TypeError:
+        return query.sql()
+
+
+def is_table_scan(detail: str) -> bool:
+    """
+    No SQLite, `SCAN <tabela>` indica leitura completa. `SCAN ... USING
+    INDEX` também percorre o índice inteiro, então contamos como scan.
+    Já `SCAN ... VIRTUAL TABLE INDEX` é a consulta ao índice de uma tabela
+    virtual (FTS5, R*Tree), não uma varredura.
+    """
+    detail = detail.strip().upper()
+    return detail.startswith('SCAN') and 'VIRTUAL TABLE INDEX' not in detail
+
+
+async def explain(query: Any) -> List[str]:
+    """Retorna as linhas de detalhe do EXPLAIN QUERY PLAN."""
+    connection = Tortoise.get_connection('default')
+    _, rows = await connection.execute_query(
+        f'EXPLAIN QUERY PLAN {query_sql(query)}'
+    )
+    return [str(dict(row)['detail']) for row in rows]
+
+
+async def audit_query_plans() -> Dict[str, List[str]]:
+    """Retorna {nome_da_consulta: [detalhes com scan]} das regressões."""
+    offenders: Dict[str, List[str]] = {}
+
+    for case in QUERY_PLAN_CASES:
+        details = await explain(case.build())
+        scans = [detail for detail in details if is_table_scan(detail)]
+        if scans and not case.allow_scan:
+            offenders[case.name] = scans
+
+    return offenders
+
+
+async def _run() -> int:
+    from src.database.init_database import TORTOISE_ORM
+    from src.database.migrations import migrate
+
+    await Tortoise.init(
+        db_url='sqlite://:memory:',
+        modules={'models': TORTOISE_ORM['apps']['models']['models']},
+    )
+    try:
+        # Migrações: tabelas dos models e as virtuais (FTS5, R*Tree)
+        await migrate()
+        offenders = await audit_query_plans()
+    finally:
+        await Tortoise.close_connections()
+
+    for name, scans in offenders.items():
+        print(f'[FAIL] {name}: {"; ".join(scans)}')
+
+    if offenders:
+        return 1
+
+    print(f'[OK] {len(QUERY_PLAN_CASES)} consultas usam índice.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(_run()))
@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient, connections
+
+from src.database.router import choose_read_connection
+
+
+def read_connection() -> BaseDBAsyncClient:
+    """
+    Conexão de leitura escolhida pelo ReplicaRouter (réplica, leitor SQLite
+    ou o primário se a requisição já escreveu).
+
+    As consultas comuns já passam pelo router; use isto apenas quando
+    precisar da conexão explicitamente (`.using_db(read_connection())`).
+    """
+    return connections.get(choose_read_connection())
@@ -0,0 +1,191 @@
+"""
+Roteamento de leitura/escrita do Tortoise (chave `routers` do TORTOISE_ORM).
+
+- Escritas sempre vão para 'default' (primário).
+- Leituras vão, em round-robin, para as réplicas saudáveis (`replica_N`) ou,
+  sem réplicas, para as conexões somente leitura do SQLite (`reader_N`).
+- Depois de uma escrita, o resto da task lê do primário (read-your-writes).
+  O pino vive num ContextVar da task que escreveu: cada requisição roda
+  numa task nova, e cada execução das tarefas periódicas também
+  (src/global_utils/background.py). Laços longos fora delas usam
+  `primary_pin_scope()` para limitar o pino a uma iteração.
+- Réplicas que falham no health check saem do rodízio até voltarem.
+"""
+import asyncio
+import os
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Set
+
+from tortoise import connections
+
+from src.database.init_database import (READER_PREFIX, REPLICA_PREFIX,
+                                        get_tortoise_config)
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+
+try:
+    from tortoise.backends.base.client import TransactionalDBClient
+except ImportError:   # versões antigas do Tortoise
+    TransactionalDBClient = None
+
+PRIMARY = 'default'
+
+_PINNED_TO_PRIMARY: ContextVar[bool] = ContextVar(
+    'pinned_to_primary', default=False
+)
+
+
+class ReadTargets:
+    """
+    Conexões de leitura em rodízio, ignorando as marcadas como fora do ar.
+
+    Sem `names`, a lista é lida da configuração do Tortoise no primeiro uso.
+    """
+
+    def __init__(self, names: Optional[List[str]] = None) -> None:
+        self._names = names
+        self.unhealthy: Set[str] = set()
+        self._position = 0
+
+    @property
+    def names(self) -> List[str]:
+        if self._names is None:
+            self._names = _read_target_names()
+        return self._names
+
+    @names.setter
+    def names(self, names: List[str]) -> None:
+        self._names = names
+
+    def choose(self) -> Optional[str]:
+        for _ in range(len(self.names)):
+            name = self.names[self._position % len(self.names)]
+            self._position += 1
+            if name not in self.unhealthy:
+                return name
+        return None
+
+    def mark(self, name: str, healthy: bool) -> None:
+        if healthy and name in self.unhealthy:
+            self.unhealthy.discard(name)
+            LOGGER.info(f'[OK] Réplica {name} voltou ao rodízio.')
+        elif not healthy and name not in self.unhealthy:
+            self.unhealthy.add(name)
+            LOGGER.warning(f'[FAIL] Réplica {name} fora do rodízio.')
+
+
+def _read_target_names() -> List[str]:
+    names = list(get_tortoise_config()['connections'])
+    replicas = [name for name in names if name.startswith(REPLICA_PREFIX)]
+    if replicas:
+        return replicas
+    return [name for name in names if name.startswith(READER_PREFIX)]
+
+
+READ_TARGETS = ReadTargets()
+
+
+def pin_to_primary() -> None:
+    """Força as próximas leituras desta task a irem ao primário."""
+    _PINNED_TO_PRIMARY.set(True)
+
+
+@contextmanager
+def primary_pin_scope() -> Iterator[None]:
+    """Começa sem pino e desfaz, na saída, o pino feito dentro do bloco."""
+    token = _PINNED_TO_PRIMARY.set(False)
+    try:
+        yield
+    finally:
+        _PINNED_TO_PRIMARY.reset(token)
+
+
+def _in_transaction() -> bool:
+    # Dentro de in_transaction() a conexão 'default' é a da transação
+    return TransactionalDBClient is not None and isinstance(
+        connections.get(PRIMARY), TransactionalDBClient
+    )
+
+
+def choose_read_connection() -> str:
+    """Nome da conexão que deve atender uma leitura agora."""
+    if _PINNED_TO_PRIMARY.get() or _in_transaction():
+        return PRIMARY
+    return READ_TARGETS.choose() or PRIMARY
+
+
+class ReplicaRouter:
+    """Router registrado no TORTOISE_ORM."""
+
+    def db_for_read(self, model) -> str:
+        return choose_read_connection()
+
+    def db_for_write(self, model) -> str:
+        pin_to_primary()
+        return PRIMARY
+
+
+async def check_read_targets(timeout: float = 1.0) -> None:
+    """Health check: `SELECT 1` em cada conexão de leitura."""
+    for name in READ_TARGETS.names:
+        try:
+            await asyncio.wait_for(
+                connections.get(name).execute_query('SELECT 1'), timeout
+            )
+            READ_TARGETS.mark(name, healthy=True)
+        except Exception:
+            READ_TARGETS.mark(name, healthy=False)
+
+
+def sync_sqlite_replicas() -> int:
+    """
+    Copia o arquivo primário para as réplicas (API de backup do SQLite).
+
+    Usado para testar o roteamento localmente com dois arquivos SQLite.
+    """
+    tortoise_connections = get_tortoise_config()['connections']
+    primary = tortoise_connections[PRIMARY]['credentials']
+    replicas = [
+        config['credentials']['file_path']
+        for name, config in tortoise_connections.items()
+        if name.startswith(REPLICA_PREFIX)
+        and 'file_path' in config['credentials']
+    ]
+
+    source = sqlite3.connect(primary['file_path'])
+    try:
+        for path in replicas:
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+    finally:
+        source.close()
+
+    return len(replicas)
+
+
+async def _sync_replicas_task() -> None:
+    await asyncio.to_thread(sync_sqlite_replicas)
+
+
+register_periodic_task(
+    'replica-health-check',
+    float(os.getenv('DB_REPLICA_HEALTH_INTERVAL', '5')),
+    check_read_targets,
+)
+
+# Apenas para desenvolvimento: mantém as réplicas SQLite sincronizadas
+if os.getenv('DB_REPLICA_SYNC_INTERVAL'):
+    register_periodic_task(
+        'sqlite-replica-sync',
+        float(os.getenv('DB_REPLICA_SYNC_INTERVAL', '0')),
+        _sync_replicas_task,
+    )
+
+
+if __name__ == '__main__':
+    print(f'[OK] {sync_sqlite_replicas()} réplicas sincronizadas.')
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+from src.global_utils.logs import LOGGER
+
+
+class PeriodicTask:
+    """
+    PeriodicTask: Executa uma corrotina em intervalos fixos em background.
+
+    Erros são registrados no log e não interrompem o ciclo. Cada execução
+    roda numa task própria, com uma cópia limpa dos ContextVars: o que uma
+    execução define (ex.: o pino de leitura no primário depois de uma
+    escrita) vale só para ela, não para o resto da vida do laço.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[object]],
+    ) -> None:
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._task: Optional[asyncio.Task] = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.create_task(self.func(), name=self.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOGGER.error(f'[FAIL] Tarefa periódica {self.name}: {e}')
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+# Tarefas registradas pelos módulos e controladas pelo lifespan
+BACKGROUND_TASKS: List[PeriodicTask] = []
+
+
+def register_periodic_task(
+    name: str, interval: float, func: Callable[[], Awaitable[object]]
+) -> PeriodicTask:
+    """Registra uma tarefa para ser iniciada junto com a aplicação."""
+    task = PeriodicTask(name, interval, func)
+    BACKGROUND_TASKS.append(task)
+    return task
+
+
+def start_background_tasks() -> None:
+    for task in BACKGROUND_TASKS:
+        task.start()
+
+
+async def stop_background_tasks() -> None:
+    for task in BACKGROUND_TASKS:
+        await task.stop()
@@ -0,0 +1,17 @@
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=None)
+def load_env() -> bool:
+    """
+    load_env: Carrega o .env uma única vez por processo.
+
+    Pode ser chamada em qualquer módulo que leia variáveis de ambiente; a
+    partir da segunda chamada não faz nada.
+    """
+    return load_dotenv()
+
+
+__all__ = ['load_env']
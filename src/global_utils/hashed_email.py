@@ -1,10 +1,11 @@
 import hashlib
 import os
 
-from dotenv import load_dotenv
 from passlib.context import CryptContext
 
-load_dotenv()
+from src.global_utils.env import load_env
+
+load_env()
 
 EMAIL_CONTEXT = CryptContext(
     schemes=[str(os.getenv('schemes_EMAIL'))],
@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import threading
 from typing import \
     Final  # Importar Final para tipagem mais clara de constantes
 
@@ -14,30 +15,41 @@ LOG_FILE: Final[str] = os.path.abspath(
 # Define o formato de saída do log
 LOG_FORMAT: Final[str] = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+_setup_lock = threading.Lock()
+_configured = False
+
+
 # --- 2. Criação Segura do Arquivo de Log e Diretório ---
 
-# Obtém apenas o diretório do caminho do arquivo
-log_dir = os.path.dirname(LOG_FILE)
 
-# Cria o diretório se ele não existir
-if log_dir and not os.path.exists(log_dir):
+def _prepare_log_file() -> None:
+    """
+    Cria o diretório e o arquivo de log (somente se não existirem).
+
+    Executada na primeira mensagem de log, não mais na importação.
+    """
+    # Obtém apenas o diretório do caminho do arquivo
+    log_dir = os.path.dirname(LOG_FILE)
+
+    # Cria o diretório se ele não existir
+    if log_dir and not os.path.exists(log_dir):
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            # Note: Não usamos o logger aqui, pois ele ainda está sendo configurado.
+            print(f'Diretório de log criado: {log_dir}')
+        except OSError as e:
+            print(f" [ FAIL ] Erro ao criar o diretório '{log_dir}': {e}")
+
+    # Cria o arquivo de log e escreve uma linha inicial
     try:
-        os.makedirs(log_dir, exist_ok=True)
-        # Note: Não usamos o logger aqui, pois ele ainda está sendo configurado.
-        print(f'Diretório de log criado: {log_dir}')
-    except OSError as e:
-        print(f" [ FAIL ] Erro ao criar o diretório '{log_dir}': {e}")
-
-# Cria o arquivo de log (somente se não existir) e escreve uma linha inicial
-try:
-    with open(LOG_FILE, 'x') as files_log:
-        files_log.write('INÍCIO DA SESSÃO DE LOG\n')
-except FileExistsError:
-    # O arquivo já existe, apenas ignoramos
-    pass
-except Exception as e:
-    # Trata outros erros, como permissão de escrita
-    print(f'[ FAIL ] Ocorreu um erro ao inicializar o arquivo de log: {e}')
+        with open(LOG_FILE, 'x') as files_log:
+            files_log.write('INÍCIO DA SESSÃO DE LOG\n')
+    except FileExistsError:
+        # O arquivo já existe, apenas ignoramos
+        pass
+    except Exception as e:
+        # Trata outros erros, como permissão de escrita
+        print(f'[ FAIL ] Ocorreu um erro ao inicializar o arquivo de log: {e}')
 
 
 # --- 3. Função de Configuração Principal ---
@@ -47,44 +59,67 @@ def setup_logging() -> logging.Logger:
     """
     Configura o logger para enviar logs para o console (INFO+) e para o arquivo (DEBUG+).
     Retorna a instância do logger configurado.
+
+    Idempotente: só configura na primeira chamada.
     """
+    global _configured
+
     # 1. Obter o logger
     logger = logging.getLogger(LOG_NAME)
-    # Define o nível de processamento mais baixo possível para o logger (o que for DEBUG ou superior)
-    logger.setLevel(logging.DEBUG)
+    if _configured:
+        return logger
+
+    with _setup_lock:
+        if _configured:
+            return logger
 
-    # IMPORTANTE: Desativa a propagação para o logger raiz para evitar logs duplicados
-    logger.propagate = False
+        _prepare_log_file()
 
-    # 2. Formato do Log
-    formatter = logging.Formatter(LOG_FORMAT)
+        # Define o nível de processamento mais baixo possível para o logger (o que for DEBUG ou superior)
+        logger.setLevel(logging.DEBUG)
 
-    # 3. Adicionar Handlers (se ainda não tiverem sido adicionados)
-    if not logger.handlers:
+        # IMPORTANTE: Desativa a propagação para o logger raiz para evitar logs duplicados
+        logger.propagate = False
 
-        # --- Handler para Console (StreamHandler) ---
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        # Nível mínimo para aparecer no terminal
-        console_handler.setLevel(logging.INFO)
-        logger.addHandler(console_handler)
+        # 2. Formato do Log
+        formatter = logging.Formatter(LOG_FORMAT)
 
-        # --- Handler para Arquivo (FileHandler) ---
-        file_handler = logging.FileHandler(LOG_FILE, mode='a')
-        file_handler.setFormatter(formatter)
-        # Nível mínimo para ir para o arquivo (geralmente DEBUG para detalhes)
-        file_handler.setLevel(logging.DEBUG)
-        logger.addHandler(file_handler)
+        # 3. Adicionar Handlers (se ainda não tiverem sido adicionados)
+        if not logger.handlers:
+
+            # --- Handler para Console (StreamHandler) ---
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(formatter)
+            # Nível mínimo para aparecer no terminal
+            console_handler.setLevel(logging.INFO)
+            logger.addHandler(console_handler)
+
+            # --- Handler para Arquivo (FileHandler) ---
+            file_handler = logging.FileHandler(LOG_FILE, mode='a')
+            file_handler.setFormatter(formatter)
+            # Nível mínimo para ir para o arquivo (geralmente DEBUG para detalhes)
+            file_handler.setLevel(logging.DEBUG)
+            logger.addHandler(file_handler)
+
+        _configured = True
+        logger.info('Configuração de log concluída e pronta para uso.')
 
     return logger
 
 
 # --- 4. Exposição do Logger Configurado ---
 
-# A chamada da função é feita uma única vez ao importar o módulo
-LOGGER = setup_logging()
 
-# Exemplo de teste rápido (será logado no console e no arquivo)
-LOGGER.info('Configuração de log concluída e pronta para uso.')
+class _LazyLogger:
+    """
+    Proxy do logger: a configuração (arquivo, handlers) acontece no primeiro
+    uso em vez de na importação do módulo.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(setup_logging(), name)
+
+
+LOGGER = _LazyLogger()
 
-__all__ = ['LOGGER']
+__all__ = ['LOGGER', 'setup_logging']
@@ -0,0 +1,164 @@
+"""
+Perfil de startup: tempo de importação por módulo e tempo por fase do
+lifespan.
+
+Desligado por padrão. Com STARTUP_PROFILE=1 no ambiente do processo (o
+.env ainda não foi carregado quando o profiler é instalado):
+
+    STARTUP_PROFILE=1 uvicorn main:app
+
+O relatório vai para o LOGGER depois que a aplicação termina de subir.
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib.abc import MetaPathFinder
+from typing import Dict, Iterator, List, Tuple
+
+STARTUP_PROFILE_TOP = int(os.getenv('STARTUP_PROFILE_TOP', '25'))
+
+
+def enabled() -> bool:
+    return os.getenv('STARTUP_PROFILE', '').lower() in ('1', 'true')
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    cumulative: float   # inclui os imports feitos por este módulo
+    self_time: float    # apenas o corpo do próprio módulo
+
+
+class _ImportTimer(MetaPathFinder):
+    """
+    Finder que apenas observa: delega a busca aos demais finders e embrulha
+    o `exec_module` do loader encontrado para cronometrá-lo.
+    """
+
+    def __init__(self) -> None:
+        self.timings: List[ImportTiming] = []
+        self._local = threading.local()
+
+    def _stack(self) -> List[float]:
+        # Tempo gasto em imports filhos, por nível de aninhamento
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Importadores de builtins/frozen são classes, não instâncias
+        if loader is None or isinstance(loader, type):
+            return spec
+        if not hasattr(loader, 'exec_module'):
+            return spec
+
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            stack = self._stack()
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.timings.append(
+                    ImportTiming(fullname, elapsed, elapsed - children)
+                )
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+
+_IMPORT_TIMER = _ImportTimer()
+_PHASES: Dict[str, float] = {}
+_INSTALLED_AT: List[float] = []
+
+
+def install() -> bool:
+    """
+    Instala o cronômetro de imports (idempotente). Chame antes dos imports
+    pesados do main.py. Retorna False se o perfil estiver desligado.
+    """
+    if not enabled():
+        return False
+    if _IMPORT_TIMER not in sys.meta_path:
+        sys.meta_path.insert(0, _IMPORT_TIMER)
+        _INSTALLED_AT.append(time.perf_counter())
+    return True
+
+
+def uninstall() -> None:
+    if _IMPORT_TIMER in sys.meta_path:
+        sys.meta_path.remove(_IMPORT_TIMER)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Cronometra uma fase do startup (ex.: 'tortoise.init')."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _PHASES[name] = _PHASES.get(name, 0.0) + (
+            time.perf_counter() - start
+        )
+
+
+def import_timings(top: int = STARTUP_PROFILE_TOP) -> List[ImportTiming]:
+    """Os `top` módulos mais lentos, pelo tempo cumulativo."""
+    ordered = sorted(
+        _IMPORT_TIMER.timings, key=lambda t: t.cumulative, reverse=True
+    )
+    return ordered[:top]
+
+
+def phase_timings() -> List[Tuple[str, float]]:
+    return list(_PHASES.items())
+
+
+def report(top: int = STARTUP_PROFILE_TOP) -> None:
+    """Envia o perfil de startup para o log (não faz nada se desligado)."""
+    if not enabled():
+        return
+
+    from src.global_utils.logs import LOGGER
+
+    uninstall()
+    total_imports = sum(t.self_time for t in _IMPORT_TIMER.timings)
+    LOGGER.info(
+        f'[OK] Startup: {len(_IMPORT_TIMER.timings)} módulos importados '
+        f'em {total_imports * 1000:.1f} ms'
+    )
+    LOGGER.info(f'{"cumulativo(ms)":>15} {"próprio(ms)":>12}  módulo')
+    for timing in import_timings(top):
+        LOGGER.info(
+            f'{timing.cumulative * 1000:>15.1f} '
+            f'{timing.self_time * 1000:>12.1f}  {timing.module}'
+        )
+    for name, elapsed in phase_timings():
+        LOGGER.info(f'[OK] Fase {name}: {elapsed * 1000:.1f} ms')
+    if _INSTALLED_AT:
+        LOGGER.info(
+            '[OK] Tempo até a aplicação pronta: '
+            f'{(time.perf_counter() - _INSTALLED_AT[0]) * 1000:.1f} ms'
+        )
+
+
+__all__ = ['install', 'phase', 'report']
@@ -1,12 +1,18 @@
 # included_routes.py
-from src.auth.route import router as auth_or_register
-from src.profile.user_profile import router as user_profile
-from src.services_g_turismo.published_services import router as publish_a_service
+
 
 def register_all_routes(app):
     """
     Registra todos os APIRouters no aplicativo FastAPI principal.
+
+    Os módulos de rotas são importados aqui, e não no topo do arquivo, para
+    que importar este módulo não carregue models/serviços de todas as rotas.
     """
+    from src.auth.route import router as auth_or_register
+    from src.internal.route import router as internal_routes
+    from src.profile.user_profile import router as user_profile
+    from src.services_g_turismo.published_services import \
+        router as publish_a_service
 
     # AUTH
     app.include_router(auth_or_register, prefix='/auth')
@@ -14,6 +20,8 @@ def register_all_routes(app):
     app.include_router(user_profile, prefix='/profile')
     # PUBLICATION OF SERVICES
     app.include_router(publish_a_service, prefix='/service')
+    # INTERNAL (telemetria; exige INTERNAL_API_TOKEN)
+    app.include_router(internal_routes, prefix='/internal')
 
 
 __all__ = ['register_all_routes']
@@ -0,0 +1,37 @@
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter, Header, HTTPException, status
+from tortoise import connections
+
+from src.service.jwt.principal_cache import principal_cache_stats
+from src.service.send_email.delivery import EMAIL_QUEUE
+
+router = APIRouter(tags=['Internal'], include_in_schema=False)
+
+
+def _check_internal_token(token: str) -> None:
+    """As rotas internas só existem com INTERNAL_API_TOKEN configurado."""
+    expected = os.getenv('INTERNAL_API_TOKEN')
+    if not expected or token != expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+
+@router.get('/db/pool')
+async def database_pool_stats(
+    x_internal_token: str = Header(default=''),
+) -> Dict[str, Any]:
+    """Uso das conexões do banco: em uso, ociosas e histograma de espera."""
+    _check_internal_token(x_internal_token)
+
+    pools = {}
+    for connection in connections.all():
+        snapshot = getattr(connection, 'pool_snapshot', None)
+        if snapshot is not None:
+            pools[connection.connection_name] = snapshot()
+
+    return {
+        'pools': pools,
+        'principal_cache': principal_cache_stats(),
+        'email_queue': EMAIL_QUEUE.stats(),
+    }
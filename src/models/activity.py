@@ -0,0 +1,50 @@
+from tortoise import fields, models
+
+
+class Favorite(models.Model):
+    """Serviço marcado como favorito por um usuário."""
+
+    id = fields.IntField(pk=True)
+    user = fields.ForeignKeyField(
+        'models.User', related_name='favorites', on_delete='CASCADE'
+    )
+    service = fields.ForeignKeyField(
+        'models.Service', related_name='favorited_by', on_delete='CASCADE'
+    )
+    # Gravado em lote: guarda a hora do clique, não a da gravação
+    created_in = fields.DatetimeField()
+
+    class Meta:   # type: ignore
+        table = 'favorites'
+        unique_together = (('user', 'service'),)
+        # Favoritos mais recentes do usuário
+        indexes = (('user_id', 'created_in'),)
+
+    def __str__(self):
+        return f'Favorite: user {self.user_id} -> service {self.service_id}'
+
+
+class ServiceView(models.Model):
+    """
+    Histórico de visualizações: uma linha por usuário e serviço, com o
+    total de visualizações e a mais recente (somadas em lote).
+    """
+
+    id = fields.IntField(pk=True)
+    user = fields.ForeignKeyField(
+        'models.User', related_name='views', on_delete='CASCADE'
+    )
+    service = fields.ForeignKeyField(
+        'models.Service', related_name='views', on_delete='CASCADE'
+    )
+    views = fields.IntField(default=0)
+    last_viewed_in = fields.DatetimeField()
+
+    class Meta:   # type: ignore
+        table = 'service_views'
+        unique_together = (('user', 'service'),)
+        # Histórico recente do usuário
+        indexes = (('user_id', 'last_viewed_in'),)
+
+    def __str__(self):
+        return f'ServiceView: user {self.user_id} -> service {self.service_id}'
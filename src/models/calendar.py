@@ -0,0 +1,25 @@
+from tortoise import fields, models
+
+
+class ServiceCalendar(models.Model):
+    """
+    Disponibilidade de um serviço num ano: um bit por dia (bit 0 = 1º de
+    janeiro), ligado quando o dia ainda tem vaga. 366 dias cabem em 46
+    bytes.
+    """
+
+    id = fields.IntField(pk=True)
+    service = fields.ForeignKeyField(
+        'models.Service', related_name='calendars', on_delete='CASCADE'
+    )
+    year = fields.SmallIntField()
+    bitmap = fields.BinaryField()
+    # Sincronização incremental entre workers
+    updated_in = fields.DatetimeField(auto_now=True, db_index=True)
+
+    class Meta:   # type: ignore
+        table = 'service_calendars'
+        unique_together = (('service', 'year'),)
+
+    def __str__(self):
+        return f'ServiceCalendar: service {self.service_id} ({self.year})'
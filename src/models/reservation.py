@@ -0,0 +1,63 @@
+from enum import Enum
+
+from tortoise import fields, models
+
+
+class Inventory(models.Model):
+    """Vagas de um serviço num dia (capacidade e quanto ainda resta)."""
+
+    id = fields.IntField(pk=True)
+    service = fields.ForeignKeyField(
+        'models.Service', related_name='inventory', on_delete='CASCADE'
+    )
+    day = fields.DateField()
+    capacity = fields.IntField()
+    remaining = fields.IntField()
+    updated_in = fields.DatetimeField(auto_now=True)
+
+    class Meta:   # type: ignore
+        table = 'service_inventory'
+        # Também é o índice das reservas: (serviço, faixa de dias)
+        unique_together = (('service', 'day'),)
+
+    def __str__(self):
+        return f'Inventory: service {self.service_id} {self.day}'
+
+
+class ReservationStatus(str, Enum):
+    """Ciclo de vida de uma reserva."""
+
+    HELD = 'held'              # vagas seguras até `expires_in`
+    CONFIRMED = 'confirmed'    # confirmada (pagamento aprovado)
+    RELEASED = 'released'      # cancelada; vagas devolvidas
+    EXPIRED = 'expired'        # não confirmada a tempo; vagas devolvidas
+
+
+class Reservation(models.Model):
+    """Reserva de `quantity` vagas por dia, de `start_day` a `end_day`."""
+
+    id = fields.IntField(pk=True)
+    token = fields.CharField(max_length=64, unique=True)
+    service = fields.ForeignKeyField(
+        'models.Service', related_name='reservations', on_delete='CASCADE'
+    )
+    user = fields.ForeignKeyField(
+        'models.User', related_name='reservations', on_delete='CASCADE'
+    )
+    start_day = fields.DateField()
+    end_day = fields.DateField()   # exclusivo (dia da saída)
+    quantity = fields.SmallIntField()
+    status = fields.CharEnumField(
+        ReservationStatus, max_length=12, default=ReservationStatus.HELD
+    )
+    expires_in = fields.DatetimeField(null=True)
+    created_in = fields.DatetimeField(auto_now_add=True)
+    updated_in = fields.DatetimeField(auto_now=True)
+
+    class Meta:   # type: ignore
+        table = 'reservations'
+        # Varredura das reservas vencidas
+        indexes = (('status', 'expires_in'),)
+
+    def __str__(self):
+        return f'Reservation: {self.token} ({self.status})'
@@ -0,0 +1,55 @@
+from tortoise import fields, models
+
+
+class Review(models.Model):
+    """Avaliação de um viajante (uma por usuário e serviço)."""
+
+    id = fields.IntField(pk=True)
+    service = fields.ForeignKeyField(
+        'models.Service', related_name='reviews', on_delete='CASCADE'
+    )
+    user = fields.ForeignKeyField(
+        'models.User', related_name='reviews', on_delete='CASCADE'
+    )
+    stars = fields.SmallIntField()
+    comment = fields.TextField(default='')
+    created_in = fields.DatetimeField(auto_now_add=True)
+    updated_in = fields.DatetimeField(auto_now=True)
+
+    class Meta:   # type: ignore
+        table = 'reviews'
+        unique_together = (('service', 'user'),)
+        # Listagem das avaliações de um serviço por id (keyset)
+        indexes = (('service_id', 'id'),)
+
+    def __str__(self):
+        return f'Review: service {self.service_id} ({self.stars})'
+
+
+class ServiceRating(models.Model):
+    """
+    Agregado das avaliações de um serviço, atualizado na mesma transação
+    de cada avaliação criada, editada ou removida (nunca AVG() na leitura).
+    """
+
+    id = fields.IntField(pk=True)
+    service = fields.OneToOneField(
+        'models.Service', related_name='rating_aggregate', on_delete='CASCADE'
+    )
+    count = fields.IntField(default=0)
+    total = fields.IntField(default=0)   # soma das estrelas
+    stars_1 = fields.IntField(default=0)
+    stars_2 = fields.IntField(default=0)
+    stars_3 = fields.IntField(default=0)
+    stars_4 = fields.IntField(default=0)
+    stars_5 = fields.IntField(default=0)
+    average = fields.FloatField(null=True)
+    # Média bayesiana: puxa serviços com poucas avaliações para a média
+    score = fields.FloatField(null=True, db_index=True)
+    updated_in = fields.DatetimeField(auto_now=True)
+
+    class Meta:   # type: ignore
+        table = 'service_ratings'
+
+    def __str__(self):
+        return f'ServiceRating: service {self.service_id}'
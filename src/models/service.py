@@ -0,0 +1,52 @@
+from enum import Enum
+
+from tortoise import fields, models
+
+
+class ServiceKind(str, Enum):
+    """Tipos de serviço publicados por uma empresa de turismo."""
+
+    PACKAGE = 'package'        # pacote
+    LODGING = 'lodging'        # hospedagem
+    TOUR = 'tour'              # passeio
+    TRANSPORT = 'transport'    # transporte
+    GUIDE = 'guide'            # guia
+
+
+class Service(models.Model):
+    """Serviço do catálogo (pacote, hospedagem, passeio, transporte, guia)."""
+
+    id = fields.IntField(pk=True)
+    owner = fields.ForeignKeyField(
+        'models.User', related_name='services', on_delete='CASCADE'
+    )
+    kind = fields.CharEnumField(ServiceKind, max_length=20)
+    title = fields.CharField(max_length=160)
+    description = fields.TextField(default='')
+    city = fields.CharField(max_length=120)
+    state = fields.CharField(max_length=60, null=True)
+    price = fields.DecimalField(max_digits=10, decimal_places=2)
+    currency = fields.CharField(max_length=3, default='BRL')
+    duration_days = fields.SmallIntField(default=1)
+    # Lista de comodidades (ex.: ["wifi", "piscina", "cafe-da-manha"])
+    amenities = fields.JSONField(default=list, null=True)
+    # Coordenadas em graus (WGS84). O índice espacial (R*Tree no SQLite,
+    # (latitude, longitude) no MySQL) é criado pela migração 4.
+    latitude = fields.FloatField(null=True)
+    longitude = fields.FloatField(null=True)
+    published = fields.BooleanField(default=True)
+    created_in = fields.DatetimeField(auto_now_add=True)
+    updated_in = fields.DatetimeField(auto_now=True)
+
+    class Meta:   # type: ignore
+        table = 'services'
+        # A listagem pagina por id (keyset) dentro de cada filtro
+        indexes = (
+            ('published', 'id'),
+            ('published', 'kind', 'id'),
+            ('published', 'city', 'id'),
+            ('owner_id', 'id'),
+        )
+
+    def __str__(self):
+        return f'Service: {self.title}'
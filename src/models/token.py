@@ -0,0 +1,14 @@
+from tortoise import fields, models
+
+
+class RevokedToken(models.Model):
+    """Refresh tokens já utilizados (rotação de uso único)."""
+
+    jti = fields.CharField(max_length=32, pk=True)
+    expires_in = fields.DatetimeField(db_index=True)
+
+    class Meta:   # type: ignore
+        table = 'revoked_tokens'
+
+    def __str__(self):
+        return f'RevokedToken: {self.jti}'
@@ -2,6 +2,9 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from tortoise import fields, models
+from tortoise.queryset import QuerySet
+
+from src.global_utils.hashed_email import create_email_search_hash
 
 
 class User(models.Model):
@@ -18,6 +21,7 @@ class User(models.Model):
     )
     status = fields.BooleanField(default=True)
     verified_account = fields.BooleanField(default=False)
+    # Obsoleto: os códigos ficam na tabela `verification_codes`
     temporary_code = fields.CharField(max_length=10, null=True)
     created_in = fields.DatetimeField(
         auto_now_add=True,
@@ -29,5 +33,14 @@ class User(models.Model):
     class Meta:   # type: ignore
         table = 'users'
 
+    @classmethod
+    def by_email(cls, email: str) -> QuerySet['User']:
+        """
+        Filtra pelo hash indexado do email (`email_search_hash`).
+
+        A coluna `email` não tem índice: nunca filtre por ela diretamente.
+        """
+        return cls.filter(email_search_hash=create_email_search_hash(email))
+
     def __str__(self):
         return f'User: {self.email}'
@@ -0,0 +1,21 @@
+from tortoise import fields, models
+
+
+class VerificationCode(models.Model):
+    """Código de verificação de email ativo de um usuário."""
+
+    id = fields.IntField(pk=True)
+    user = fields.OneToOneField(
+        'models.User', related_name='verification_code', on_delete='CASCADE'
+    )
+    code = fields.CharField(max_length=10)
+    expires_in = fields.DatetimeField(db_index=True)
+    attempts = fields.SmallIntField(default=0)
+    consumed = fields.BooleanField(default=False)
+    created_in = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:   # type: ignore
+        table = 'verification_codes'
+
+    def __str__(self):
+        return f'VerificationCode: user {self.user_id}'
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 
 from src.auth.schemas import SystemUser
 from src.service.jwt.depends import get_current_user
+from src.services_g_turismo.activity import ACTIVITY, HISTORY_MAX_RESULTS
+from src.services_g_turismo.catalog import services_by_ids
+from src.services_g_turismo.schemas import FavoriteList, HistoryList
 
 router = APIRouter(tags=['Profile'])
 
@@ -13,3 +16,41 @@ async def profile(
     ):
     """rota para exibir informaçoes da conta do usuario"""
     pass
+
+
+@router.get('/favorites', response_model=FavoriteList)
+async def favorites(
+    limit: int = Query(default=20, ge=1, le=HISTORY_MAX_RESULTS),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Favoritos do usuário, incluindo os ainda não gravados"""
+    found = await ACTIVITY.favorites(current_user.id, limit)
+    favorited_in = {row['service_id']: row['favorited_in'] for row in found}
+    items = await services_by_ids(list(favorited_in))
+    return {
+        'items': [
+            {**item, 'favorited_in': favorited_in[item['id']]}
+            for item in items
+        ]
+    }
+
+
+@router.get('/history', response_model=HistoryList)
+async def history(
+    limit: int = Query(default=20, ge=1, le=HISTORY_MAX_RESULTS),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Serviços vistos recentemente, incluindo as visualizações pendentes"""
+    found = await ACTIVITY.recent_history(current_user.id, limit)
+    by_service = {row['service_id']: row for row in found}
+    items = await services_by_ids(list(by_service))
+    return {
+        'items': [
+            {
+                **item,
+                'views': by_service[item['id']]['views'],
+                'last_viewed_in': by_service[item['id']]['last_viewed_in'],
+            }
+            for item in items
+        ]
+    }
@@ -2,24 +2,27 @@
 
 import logging
 import os
-from datetime import datetime, timedelta
+import uuid
 from typing import Any, Optional, Union
-from zoneinfo import ZoneInfo
 
-from dotenv import load_dotenv
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 
-from config import (  # REFRESH_TOKEN_EXPIRE_MINUTES (Você pode querer importar esta variável se ela existir no config.py)
-    ACCESS_TOKEN_EXPIRE_MINUTES, JWT_ALGORITHM, JWT_REFRESH_SECRET_KEY,
-    JWT_SECRET_KEY, PASSWORD_CONTEXT)
+from config import ACCESS_TOKEN_EXPIRE_MINUTES, PASSWORD_CONTEXT
+from src.global_utils.env import load_env
+from src.service.jwt.codec import ACCESS_TOKEN_CODEC, REFRESH_TOKEN_CODEC
+from src.service.jwt.password_pool import PASSWORD_POOL
 
-load_dotenv()
+load_env()
 
 # Instanciação do logger
 logger = logging.getLogger(__name__)
 
+# Validade do refresh token (padrão: 7 dias)
+REFRESH_TOKEN_EXPIRE_MINUTES = int(
+    os.getenv('REFRESH_TOKEN_EXPIRE_MINUTES', str(60 * 24 * 7))
+)
+
 
 def get_hashed_password(password: str) -> str:
     """Retorna o hash da senha usando o contexto de criptografia configurado."""
@@ -31,73 +34,51 @@ def verify_password(password: str, hashed_pass: str) -> bool:
     return PASSWORD_CONTEXT.verify(password, hashed_pass)
 
 
+async def get_hashed_password_async(password: str) -> str:
+    """Versão assíncrona de `get_hashed_password` executada no pool."""
+    return await PASSWORD_POOL.run(get_hashed_password, password)
+
+
+async def verify_password_async(password: str, hashed_pass: str) -> bool:
+    """Versão assíncrona de `verify_password` executada no pool."""
+    return await PASSWORD_POOL.run(verify_password, password, hashed_pass)
+
+
 def create_access_token(
     subject: Union[str, Any],
     expires_delta: Optional[int] = ACCESS_TOKEN_EXPIRE_MINUTES,
 ) -> str:
     """Cria um Access Token JWT assinado."""
-    expire = (
-        datetime.now(ZoneInfo('America/Sao_Paulo'))
-        + timedelta(minutes=expires_delta)
-        if expires_delta
-        else datetime.now(ZoneInfo('America/Sao_Paulo'))
-        + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
-
-    to_encode = {'exp': expire, 'sub': str(subject)}
-    return jwt.encode(to_encode, str(JWT_SECRET_KEY), str(JWT_ALGORITHM))
+    minutes = expires_delta or ACCESS_TOKEN_EXPIRE_MINUTES
+    return ACCESS_TOKEN_CODEC.issue(subject, minutes * 60)
 
 
 def create_refresh_token(
     subject: Union[str, Any], expires_delta: Optional[int] = None
 ) -> str:
     """Cria um Refresh Token JWT assinado."""
-    # OBSERVAÇÃO TÉCNICA: O tempo de expiração do Refresh Token (expires_delta)
-    # deve ser definido usando a variável 'REFRESH_TOKEN_EXPIRE_MINUTES' do
-    # config.py, caso contrário ele terá o mesmo tempo do Access Token.
-    # Assumindo que o default (None) deve usar o ACCESS_TOKEN_EXPIRE_MINUTES
-    # como fallback, mantive a lógica.
-
-    # Se você tiver 'REFRESH_TOKEN_EXPIRE_MINUTES' no config.py, use-o aqui:
-    # expire_minutes = REFRESH_TOKEN_EXPIRE_MINUTES if not expires_delta else expires_delta
-
-    expire = (
-        datetime.now(ZoneInfo('America/Sao_Paulo'))
-        + timedelta(minutes=expires_delta)
-        if expires_delta
-        else datetime.now(ZoneInfo('America/Sao_Paulo'))
-        + timedelta(
-            minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-        )  # Considere trocar por REFRESH_TOKEN_EXPIRE_MINUTES
-    )
-
-    to_encode = {'exp': expire, 'sub': str(subject)}
-    return jwt.encode(
-        to_encode, str(JWT_REFRESH_SECRET_KEY), str(JWT_ALGORITHM)
+    # Cada refresh token tem um `jti` único para permitir a rotação de uso
+    # único (ver src/service/jwt/revocation.py).
+    minutes = expires_delta or REFRESH_TOKEN_EXPIRE_MINUTES
+    return REFRESH_TOKEN_CODEC.issue(
+        subject, minutes * 60, jti=uuid.uuid4().hex
     )
 
 
 def verify_refresh_token(token: str) -> str:
     """Verifica a validade e expiração de um Refresh Token JWT."""
-    try:
-        logger.info('Validando refresh token JWT...')
+    logger.info('Validando refresh token JWT...')
 
-        payload = jwt.decode(
-            token, str(JWT_REFRESH_SECRET_KEY), algorithms=[str(JWT_ALGORITHM)]
-        )
-
-        employee_id: str = payload.get('sub')
+    employee_id: str = decode_refresh_token(token, require_jti=False)['sub']
 
-        if employee_id is None:
-            logger.warning(' [FAIL] Refresh token sem subject (sub)')
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Refresh token inválido',
-            )
+    logger.info(f'Refresh token válido para employee_id: {employee_id}')
+    return employee_id
 
-        logger.info(f'Refresh token válido para employee_id: {employee_id}')
-        return employee_id
 
+def decode_refresh_token(token: str, require_jti: bool = True) -> dict:
+    """Valida assinatura/expiração do Refresh Token e retorna o payload."""
+    try:
+        payload = REFRESH_TOKEN_CODEC.decode(token)
     except JWTError as e:
         logger.error(
             f' [FAIL] Erro JWT na verificação do refresh token: {str(e)}'
@@ -107,45 +88,37 @@ def verify_refresh_token(token: str) -> str:
             detail='Refresh token expirado ou inválido',
         )
 
+    if not payload.get('sub') or (require_jti and not payload.get('jti')):
+        logger.warning(' [FAIL] Refresh token sem subject (sub) ou jti')
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Refresh token inválido',
+        )
+
+    return payload
+
 
 def get_token_payload(token: str) -> dict:
     """Obtém o payload do token sem verificar a expiração (uso para logs/debugging)."""
     try:
-        payload = jwt.decode(
-            token,
-            str(JWT_SECRET_KEY),
-            algorithms=[str(JWT_ALGORITHM)],
-            options={'verify_exp': False},
-        )
-        return payload
+        return ACCESS_TOKEN_CODEC.decode(token, verify_exp=False)
     except JWTError as e:
         logger.error(f'Erro ao decodificar payload do token: {str(e)}')
         return {}
 
 
-def is_token_expiring_soon(token: str, minutes_before: int = 30) -> bool:
-    """Verifica se o Access Token irá expirar em breve (dentro de `minutes_before`)."""
-    try:
-        payload = jwt.decode(
-            token,
-            str(JWT_SECRET_KEY),
-            algorithms=[str(JWT_ALGORITHM)],
-            options={'verify_exp': False},
-        )
-
-        exp_timestamp = payload.get('exp')
-        if not exp_timestamp:
-            return False
-
-        exp_datetime = datetime.fromtimestamp(
-            exp_timestamp, tz=ZoneInfo('America/Sao_Paulo')
-        )
-        now = datetime.now(ZoneInfo('America/Sao_Paulo'))
-
-        time_until_expiry = exp_datetime - now
-        minutes_until_expiry = time_until_expiry.total_seconds() / 60
+def is_token_expiring_soon(
+    token: Union[str, dict], minutes_before: int = 30
+) -> bool:
+    """
+    Verifica se o Access Token irá expirar em breve (dentro de `minutes_before`).
 
-        return minutes_until_expiry <= minutes_before
+    Aceita o token ou o payload já decodificado (evita decodificar de novo).
+    """
+    payload = get_token_payload(token) if isinstance(token, str) else token
 
-    except JWTError:
+    seconds_left = ACCESS_TOKEN_CODEC.seconds_until_expiry(payload)
+    if seconds_left is None:
         return False
+
+    return seconds_left <= minutes_before * 60
@@ -0,0 +1,146 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, Optional, Union
+from zoneinfo import ZoneInfo
+
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+from config import JWT_ALGORITHM, JWT_REFRESH_SECRET_KEY, JWT_SECRET_KEY
+
+# Algoritmos HMAC resolvidos sem passar pelo caminho genérico do python-jose
+HMAC_DIGESTS = {
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512,
+}
+
+TIMEZONE = ZoneInfo('America/Sao_Paulo')
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(data: Union[str, bytes]) -> bytes:
+    if isinstance(data, str):
+        data = data.encode('ascii')
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+class TokenCodec:
+    """
+    TokenCodec: Emite e valida JWTs com chaves preparadas uma única vez.
+
+    - Segredo, algoritmo e cabeçalho codificado são calculados na criação.
+    - Para HS256/384/512 a assinatura é feita direto com `hmac`; outros
+      algoritmos usam o python-jose.
+    - Datas são inteiros (epoch), sem `datetime`/`ZoneInfo` por token.
+    - `decode` devolve o payload para que o chamador reutilize as claims
+      em vez de decodificar o token novamente.
+
+    Os erros são os mesmos do python-jose (`JWTError` e subclasses).
+    """
+
+    def __init__(self, secret: Any, algorithm: Any) -> None:
+        self.algorithm = str(algorithm)
+        self.tz = TIMEZONE
+        self._secret = str(secret)
+        self._key = self._secret.encode('utf-8')
+        self._digest = HMAC_DIGESTS.get(self.algorithm)
+
+        # Mesmo cabeçalho gerado pelo python-jose (chaves ordenadas)
+        self._header_segment = _b64encode(
+            _dumps({'alg': self.algorithm, 'typ': 'JWT'})
+        )
+        self._header_prefix = self._header_segment.decode('ascii') + '.'
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._key, signing_input, self._digest).digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Assina um payload já montado."""
+        if self._digest is None:
+            return jwt.encode(claims, self._secret, self.algorithm)
+
+        signing_input = self._header_segment + b'.' + _b64encode(_dumps(claims))
+        signature = _b64encode(self._sign(signing_input))
+        return (signing_input + b'.' + signature).decode('ascii')
+
+    def issue(self, subject: Any, ttl_seconds: int, **claims: Any) -> str:
+        """Cria um token para `subject` válido por `ttl_seconds`."""
+        claims['exp'] = int(time.time()) + int(ttl_seconds)
+        claims['sub'] = str(subject)
+        return self.encode(claims)
+
+    def decode(self, token: str, verify_exp: bool = True) -> Dict[str, Any]:
+        """Valida a assinatura (e o `exp`) e retorna as claims."""
+        if self._digest is None:
+            return jwt.decode(
+                token,
+                self._secret,
+                algorithms=[self.algorithm],
+                options={'verify_exp': verify_exp},
+            )
+
+        try:
+            signing_input, signature = token.rsplit('.', 1)
+            header_segment, payload_segment = signing_input.split('.')
+        except ValueError:
+            raise JWTError('Token com formato incorreto.')
+
+        # Tokens gerados por nós têm sempre o mesmo cabeçalho
+        if not token.startswith(self._header_prefix):
+            try:
+                header = json.loads(_b64decode(header_segment))
+            except ValueError:
+                raise JWTError('Cabeçalho do token inválido.')
+            if not isinstance(header, dict):
+                raise JWTError('Cabeçalho do token inválido.')
+            if header.get('alg') != self.algorithm:
+                raise JWTError('Algoritmo do token não permitido.')
+
+        try:
+            expected = self._sign(signing_input.encode('ascii'))
+            valid = hmac.compare_digest(expected, _b64decode(signature))
+        except (ValueError, UnicodeEncodeError):
+            valid = False
+        if not valid:
+            raise JWTError('Assinatura do token inválida.')
+
+        try:
+            claims = json.loads(_b64decode(payload_segment))
+        except ValueError:
+            raise JWTError('Payload do token inválido.')
+        if not isinstance(claims, dict):
+            raise JWTError('Payload do token inválido.')
+
+        if verify_exp:
+            exp = claims.get('exp')
+            if exp is not None:
+                if not isinstance(exp, (int, float)):
+                    raise JWTError('Claim exp inválida.')
+                if exp <= time.time():
+                    raise ExpiredSignatureError('Token expirado.')
+
+        return claims
+
+    def seconds_until_expiry(
+        self, claims: Dict[str, Any], now: Optional[float] = None
+    ) -> Optional[float]:
+        """Segundos restantes até o `exp` das claims (None se não houver)."""
+        exp = claims.get('exp')
+        if exp is None:
+            return None
+        return exp - (time.time() if now is None else now)
+
+
+ACCESS_TOKEN_CODEC = TokenCodec(JWT_SECRET_KEY, JWT_ALGORITHM)
+REFRESH_TOKEN_CODEC = TokenCodec(JWT_REFRESH_SECRET_KEY, JWT_ALGORITHM)
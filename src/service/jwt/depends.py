@@ -4,6 +4,8 @@ from config import OAUTH2_SCHEME
 from src.models.user import User
 from src.auth.schemas import SystemUser
 from src.service.jwt.jwt_decode_token import DecodeToken
+from src.service.jwt.principal_cache import (cache_principal,
+                                             get_cached_principal)
 
 
 async def get_current_user(
@@ -13,18 +15,16 @@ async def get_current_user(
     token_data = DecodeToken(str(token))
     user_id = int(token_data.data.sub)
 
+    # Caminho rápido: usuário já resolvido recentemente neste worker
+    cached_user = get_cached_principal(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    # Leitura pura: o ReplicaRouter envia para uma réplica/leitor
     search_target_user = await User.get_or_none(id=user_id)
 
     if search_target_user:
-        system_user_data = SystemUser(
-            id=search_target_user.id,
-            username=search_target_user.username,
-            email=search_target_user.email,
-            photo=search_target_user.photo,
-            status=search_target_user.status,
-        )
-
-        return system_user_data
+        return cache_principal(search_target_user)
 
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -1,23 +1,37 @@
+import hashlib
 import os
-from datetime import datetime
+import time
 from typing import Optional
 
-from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 
 from src.global_schemas.schemas_token import TokenPayload
+from src.global_utils.env import load_env
+from src.global_utils.ttl_cache import TTLCache
+from src.service.jwt.codec import ACCESS_TOKEN_CODEC
 
-load_dotenv()
+load_env()
 
 OAUTH2_SCHEME = OAuth2PasswordBearer(
     tokenUrl='auth/login',
     scheme_name='JWT Bearer',
 )
 
-JWT_ALGORITHM = os.getenv('ALGORITHM')
-JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
+# Tokens já verificados, indexados pelo digest do token.
+# Cada entrada vive no máximo até o `exp` do próprio token.
+# TOKEN_CACHE_SIZE=0 desativa o cache.
+TOKEN_CACHE_MAX_TTL = float(os.getenv('TOKEN_CACHE_MAX_TTL', '300'))
+VERIFIED_TOKEN_CACHE = TTLCache(
+    maxsize=int(os.getenv('TOKEN_CACHE_SIZE', '20000')),
+    ttl=TOKEN_CACHE_MAX_TTL,
+)
+
+
+def token_digest(token: str) -> bytes:
+    """Chave do cache: nunca guardamos o token em texto puro."""
+    return hashlib.blake2b(token.encode(), digest_size=20).digest()
 
 
 class DecodeToken:
@@ -25,10 +39,16 @@ class DecodeToken:
 
         self.data: Optional[TokenPayload] = None
 
+        # Caminho rápido: token já verificado e ainda dentro do `exp`
+        key = token_digest(token)
+        cached = VERIFIED_TOKEN_CACHE.get(key)
+        if cached is not None:
+            self.data = cached
+            return
+
         try:
-            payload = jwt.decode(
-                token, str(JWT_SECRET_KEY), algorithms=[str(JWT_ALGORITHM)]
-            )
+            # A expiração é conferida logo abaixo, com mensagem própria
+            payload = ACCESS_TOKEN_CODEC.decode(token, verify_exp=False)
             token_data = TokenPayload(**payload)
 
         except JWTError:
@@ -38,10 +58,8 @@ class DecodeToken:
                 headers={'WWW-Authenticate': 'Bearer'},
             )
 
-        if (
-            token_data.exp
-            and datetime.fromtimestamp(token_data.exp) < datetime.now()
-        ):
+        now = time.time()
+        if token_data.exp and token_data.exp < now:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail='Token expirado. Faça login novamente',
@@ -50,6 +68,11 @@ class DecodeToken:
 
         self.data = token_data
 
+        ttl = TOKEN_CACHE_MAX_TTL
+        if token_data.exp:
+            ttl = min(ttl, token_data.exp - now)
+        VERIFIED_TOKEN_CACHE.set(key, token_data, ttl=ttl)
+
     def get_user_id(self) -> int:
         if self.data is None:
             raise RuntimeError('Dados do token não disponíveis.')
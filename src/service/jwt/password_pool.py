@@ -0,0 +1,69 @@
+import asyncio
+import os
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Any, Callable, Optional
+
+from src.auth.exceptions import ERROR_PASSWORD_POOL_BUSY
+
+
+class PasswordHashingPool:
+    """
+    PasswordHashingPool: Executa o bcrypt fora do event loop.
+
+    O bcrypt libera o GIL durante o cálculo, então por padrão usamos threads.
+    `PASSWORD_POOL_KIND=process` troca para um pool de processos.
+
+    `max_pending` limita quantas operações podem estar em execução ou na
+    fila ao mesmo tempo. Acima disso a requisição falha na hora com 503.
+    """
+
+    def __init__(
+        self, workers: int, max_pending: int, kind: str = 'thread'
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.kind = kind
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='password-hash',
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Agenda `func(*args)` no pool ou levanta 503 se estiver saturado."""
+        # O contador só é alterado no event loop, sem necessidade de lock
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ERROR_PASSWORD_POOL_BUSY
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Encerra o executor (chamado no lifespan)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+PASSWORD_POOL = PasswordHashingPool(
+    workers=int(os.getenv('PASSWORD_POOL_WORKERS', '4')),
+    max_pending=int(os.getenv('PASSWORD_POOL_MAX_PENDING', '64')),
+    kind=os.getenv('PASSWORD_POOL_KIND', 'thread'),
+)
@@ -0,0 +1,61 @@
+import os
+from typing import Any, Dict, Optional
+
+from tortoise.signals import post_delete, post_save
+
+from src.auth.schemas import SystemUser
+from src.global_utils.ttl_cache import TTLCache
+from src.models.user import User
+
+# Cache do usuário autenticado (SystemUser) por id.
+# PRINCIPAL_CACHE_SIZE=0 desativa o cache.
+PRINCIPAL_CACHE = TTLCache(
+    maxsize=int(os.getenv('PRINCIPAL_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('PRINCIPAL_CACHE_TTL', '30')),
+)
+
+
+def get_cached_principal(user_id: int) -> Optional[SystemUser]:
+    """Retorna o SystemUser em cache ou None."""
+    return PRINCIPAL_CACHE.get(user_id)
+
+
+def cache_principal(user: User) -> SystemUser:
+    """Monta o SystemUser a partir do model e guarda no cache."""
+    system_user = SystemUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        photo=user.photo,
+        status=user.status,
+    )
+    PRINCIPAL_CACHE.set(user.id, system_user)
+    return system_user
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Remove o usuário do cache.
+
+    Chame sempre que alterar a tabela `users` com `QuerySet.update()`,
+    pois esse caminho não dispara os sinais do Tortoise.
+    """
+    PRINCIPAL_CACHE.pop(user_id)
+
+
+def principal_cache_stats() -> Dict[str, Any]:
+    """Contadores de hit/miss do cache de usuários autenticados."""
+    return PRINCIPAL_CACHE.stats()
+
+
+@post_save(User)
+async def _invalidate_on_save(
+    sender, instance: User, created, using_db, update_fields
+) -> None:
+    """Qualquer `user.save()` (perfil, verificação, status) invalida o cache."""
+    invalidate_principal(instance.id)
+
+
+@post_delete(User)
+async def _invalidate_on_delete(sender, instance: User, using_db) -> None:
+    invalidate_principal(instance.id)
@@ -0,0 +1,78 @@
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict
+
+from tortoise.exceptions import IntegrityError
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+from src.models.token import RevokedToken
+
+
+class RevocationStore:
+    """
+    RevocationStore: Conjunto de refresh tokens (jti) já consumidos.
+
+    - Consulta O(1) num dicionário em memória {jti: exp}.
+    - A tabela `revoked_tokens` (chave primária = jti) é a fonte da verdade
+      entre workers: `consume` só tem sucesso para quem conseguir inserir
+      o jti primeiro.
+    - Entradas expiradas são removidas da memória e do banco por `prune`.
+    """
+
+    def __init__(self) -> None:
+        self._revoked: Dict[str, float] = {}
+
+    def is_revoked(self, jti: str) -> bool:
+        """Checagem rápida, sem acesso ao banco."""
+        return jti in self._revoked
+
+    async def consume(self, jti: str, exp: float) -> bool:
+        """
+        Marca o token como usado.
+
+        Retorna False se o token já tinha sido usado (replay).
+        """
+        if jti in self._revoked:
+            return False
+
+        try:
+            await RevokedToken.create(
+                jti=jti,
+                expires_in=datetime.fromtimestamp(exp, tz=timezone.utc),
+            )
+        except IntegrityError:
+            # Consumido por outro worker
+            self._revoked[jti] = exp
+            return False
+
+        self._revoked[jti] = exp
+        return True
+
+    async def prune(self) -> int:
+        """Remove tokens expirados (que já seriam rejeitados pelo `exp`)."""
+        now = time.time()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+
+        deleted = await RevokedToken.filter(
+            expires_in__lte=datetime.now(timezone.utc)
+        ).delete()
+
+        if deleted:
+            LOGGER.info(f'[OK] {deleted} refresh tokens expirados removidos.')
+        return deleted
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+REVOCATION_STORE = RevocationStore()
+
+register_periodic_task(
+    'prune-revoked-tokens',
+    float(os.getenv('REVOCATION_PRUNE_INTERVAL', '3600')),
+    REVOCATION_STORE.prune,
+)
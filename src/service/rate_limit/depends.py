@@ -0,0 +1,34 @@
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from src.auth.schemas import SystemUser
+from src.global_utils.hashed_email import create_email_search_hash
+from src.service.jwt.depends import get_current_user
+from src.service.rate_limit.limiter import (LOGIN_ACCOUNT_LIMITER,
+                                            LOGIN_IP_LIMITER,
+                                            SEND_CODE_ACCOUNT_LIMITER,
+                                            SEND_CODE_IP_LIMITER, client_ip)
+
+
+async def limit_login(
+    request: Request, target: OAuth2PasswordRequestForm = Depends()
+) -> None:
+    """Limita /auth/login por IP e por conta antes de qualquer bcrypt/ORM."""
+    await LOGIN_IP_LIMITER.enforce(client_ip(request))
+    await LOGIN_ACCOUNT_LIMITER.enforce(
+        create_email_search_hash(target.username)
+    )
+
+
+async def limit_send_code_ip(request: Request) -> None:
+    """Limita o envio de códigos por IP (roda antes de autenticar)."""
+    await SEND_CODE_IP_LIMITER.enforce(client_ip(request))
+
+
+async def limit_send_code_account(
+    current_user: SystemUser = Depends(get_current_user),
+) -> None:
+    """Limita o envio de códigos por conta (hash do email)."""
+    await SEND_CODE_ACCOUNT_LIMITER.enforce(
+        create_email_search_hash(current_user.email)
+    )
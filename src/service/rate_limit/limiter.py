@@ -0,0 +1,207 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+from src.global_utils.ttl_cache import TTLCache
+
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB', 'rate_limit.db')
+# Chaves bloqueadas lembradas por worker (as mais antigas saem primeiro)
+RATE_LIMIT_BLOCKED_KEYS = int(os.getenv('RATE_LIMIT_BLOCKED_KEYS', '100000'))
+
+# Token bucket atômico: reabastece pelo tempo decorrido e consome 1 ficha
+# numa única instrução. No UPDATE do SQLite todas as expressões enxergam os
+# valores antigos da linha, então `allowed` e `tokens` usam o mesmo saldo.
+_HIT_SQL = """
+INSERT INTO buckets (key, tokens, updated, allowed)
+VALUES (:key, :capacity - 1, :now, 1)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = CASE
+        WHEN MIN(:capacity, tokens + (:now - updated) * :rate) >= 1
+        THEN MIN(:capacity, tokens + (:now - updated) * :rate) - 1
+        ELSE MIN(:capacity, tokens + (:now - updated) * :rate)
+    END,
+    allowed = MIN(:capacity, tokens + (:now - updated) * :rate) >= 1,
+    updated = :now
+RETURNING allowed, tokens
+"""
+
+
+class BucketStore:
+    """
+    BucketStore: Baldes de fichas compartilhados entre os workers do uvicorn
+    através de um arquivo SQLite local (sem serviço externo).
+
+    Os dados são descartáveis, então o arquivo roda com `synchronous=OFF`.
+    """
+
+    def __init__(self, path: str = RATE_LIMIT_DB) -> None:
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute('PRAGMA busy_timeout=200')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                ' key TEXT PRIMARY KEY,'
+                ' tokens REAL NOT NULL,'
+                ' updated REAL NOT NULL,'
+                ' allowed INTEGER NOT NULL'
+                ') WITHOUT ROWID'
+            )
+            self._connection = connection
+        return self._connection
+
+    def hit(
+        self, key: str, capacity: float, rate: float
+    ) -> Tuple[bool, float]:
+        """Consome uma ficha. Retorna (permitido, fichas restantes)."""
+        params = {
+            'key': key,
+            'capacity': capacity,
+            'rate': rate,
+            'now': time.time(),
+        }
+        with self._lock:
+            allowed, tokens = (
+                self._connect().execute(_HIT_SQL, params).fetchone()
+            )
+        return bool(allowed), tokens
+
+    def prune(self, older_than: float = 86400.0) -> int:
+        """Remove baldes sem uso (já estariam cheios de novo)."""
+        with self._lock:
+            cursor = self._connect().execute(
+                'DELETE FROM buckets WHERE updated < ?',
+                (time.time() - older_than,),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+BUCKET_STORE = BucketStore()
+
+
+def parse_limit(spec: str) -> Tuple[int, float]:
+    """Converte '20/60' (20 requisições a cada 60s) em (capacidade, taxa/s)."""
+    capacity, period = spec.split('/')
+    return int(capacity), int(capacity) / float(period)
+
+
+class RateLimiter:
+    """
+    RateLimiter: Limite de requisições por chave (IP, hash de email...).
+
+    Quando uma chave é rejeitada, o worker guarda até quando ela continuará
+    sem fichas. Novas tentativas nesse intervalo são recusadas direto da
+    memória, sem tocar no SQLite nem no ORM. O registro expira junto com o
+    bloqueio e é limitado em tamanho (chaves rotativas não crescem a
+    memória).
+
+    A consulta ao SQLite roda numa thread (`asyncio.to_thread`): esperando
+    o `busy_timeout` por outro worker, ela não trava o event loop. Só a
+    recusa pela memória roda direto no loop.
+
+    Se o SQLite estiver travado por outro worker além do `busy_timeout`, a
+    requisição passa (fail open): o limite protege contra abuso, e um
+    arquivo ocupado não pode derrubar o login com erro 500.
+    """
+
+    def __init__(
+        self, name: str, spec: str, store: BucketStore = BUCKET_STORE
+    ) -> None:
+        self.name = name
+        self.capacity, self.rate = parse_limit(spec)
+        self.store = store
+        self.store_errors = 0
+        self._blocked_until = TTLCache(
+            maxsize=RATE_LIMIT_BLOCKED_KEYS, ttl=1 / self.rate
+        )
+
+    async def check(self, key: str) -> float:
+        """Retorna 0 se permitido ou os segundos até a próxima ficha."""
+        blocked_until = self._blocked_until.get(key)
+        if blocked_until is not None:
+            remaining = blocked_until - time.monotonic()
+            if remaining > 0:
+                return remaining
+
+        try:
+            allowed, tokens = await asyncio.to_thread(
+                self.store.hit, f'{self.name}:{key}', self.capacity, self.rate
+            )
+        except sqlite3.OperationalError as e:
+            # "database is locked": fail open
+            self.store_errors += 1
+            LOGGER.warning(f'[FAIL] Rate limit {self.name}: {e}')
+            return 0.0
+        if allowed:
+            return 0.0
+
+        retry_after = (1 - tokens) / self.rate
+        self._blocked_until.set(
+            key, time.monotonic() + retry_after, ttl=retry_after
+        )
+        return retry_after
+
+    async def enforce(self, key: str) -> None:
+        """Levanta 429 se a chave estiver sem fichas."""
+        retry_after = await self.check(key)
+        if retry_after:
+            raise too_many_requests(retry_after)
+
+
+def too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail='Muitas tentativas. Aguarde antes de tentar novamente.',
+        headers={'Retry-After': str(max(1, int(retry_after + 0.999)))},
+    )
+
+
+def client_ip(request: Request) -> str:
+    """IP do cliente (X-Forwarded-For só se RATE_LIMIT_TRUST_PROXY=true)."""
+    if os.getenv('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true':
+        forwarded = request.headers.get('x-forwarded-for')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.client.host if request.client else 'unknown'
+
+
+LOGIN_IP_LIMITER = RateLimiter(
+    'login-ip', os.getenv('RATE_LIMIT_LOGIN_IP', '20/60')
+)
+LOGIN_ACCOUNT_LIMITER = RateLimiter(
+    'login-account', os.getenv('RATE_LIMIT_LOGIN_ACCOUNT', '5/60')
+)
+SEND_CODE_IP_LIMITER = RateLimiter(
+    'send-code-ip', os.getenv('RATE_LIMIT_SEND_CODE_IP', '10/600')
+)
+SEND_CODE_ACCOUNT_LIMITER = RateLimiter(
+    'send-code-account', os.getenv('RATE_LIMIT_SEND_CODE_ACCOUNT', '3/600')
+)
+
+
+async def _prune_buckets() -> None:
+    await asyncio.to_thread(BUCKET_STORE.prune)
+
+
+register_periodic_task('prune-rate-limit-buckets', 3600, _prune_buckets)
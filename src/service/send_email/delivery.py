@@ -0,0 +1,387 @@
+import asyncio
+import itertools
+import os
+import smtplib
+import ssl
+import time
+from dataclasses import dataclass, replace
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.global_utils.logs import LOGGER
+
+# Espera após falha de conexão: base * 2^(falhas - 1), até o máximo
+SMTP_BACKOFF_BASE = float(os.getenv('SMTP_BACKOFF_BASE', '5'))
+SMTP_BACKOFF_MAX = float(os.getenv('SMTP_BACKOFF_MAX', '300'))
+EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', '5'))
+
+
+def backoff_delay(failures: int) -> float:
+    return min(SMTP_BACKOFF_MAX, SMTP_BACKOFF_BASE * 2 ** max(0, failures - 1))
+
+
+@dataclass(frozen=True)
+class EmailJob:
+    """Mensagem aguardando envio na fila."""
+
+    receiver_email: str
+    subject: str
+    body: str
+    attempts: int = 0
+
+
+class SMTPSession:
+    """
+    SMTPSession: Conexão SMTP persistente e autenticada com um provedor.
+
+    A conexão é aberta (TLS + login) uma única vez e reutilizada por todos
+    os lotes. Antes de cada lote, se a sessão ficou ociosa por mais de
+    `health_interval` segundos, um NOOP confirma que ela ainda está viva.
+
+    Não é thread-safe: cada worker da fila tem as suas próprias sessões.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        server: Dict[str, Any],
+        sender: str,
+        password: Optional[str],
+        health_interval: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.host = server['host']
+        self.port = int(server['port'])
+        self.use_ssl = server.get('ssl', True)
+        self.sender = sender
+        self.password = password
+        self.health_interval = health_interval
+        self.context = ssl.create_default_context()
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._failures = 0
+        self._down_until = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(
+                self.host, self.port, context=self.context, timeout=30
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+
+        if self.password:
+            smtp.login(self.sender, self.password)
+
+        LOGGER.info(f'[OK] Sessão SMTP aberta: {self.name}')
+        return smtp
+
+    def _is_alive(self) -> bool:
+        if self._smtp is None:
+            return False
+
+        if time.monotonic() - self._last_used < self.health_interval:
+            return True
+
+        try:
+            return self._smtp.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def ensure(self) -> smtplib.SMTP:
+        """Retorna uma sessão saudável, reconectando se necessário."""
+        if not self._is_alive():
+            self.close()
+            self._smtp = self._connect()
+        self._last_used = time.monotonic()
+        return self._smtp
+
+    def _message(self, job: EmailJob) -> str:
+        message = MIMEText(job.body, 'plain', 'utf-8')
+        message['Subject'] = job.subject
+        message['From'] = self.sender
+        message['To'] = job.receiver_email
+        return message.as_string()
+
+    @property
+    def available(self) -> bool:
+        """False enquanto a sessão aguarda o backoff de uma falha."""
+        return time.monotonic() >= self._down_until
+
+    def _connection_failed(self, error: object) -> None:
+        self.close()
+        self._failures += 1
+        delay = backoff_delay(self._failures)
+        self._down_until = time.monotonic() + delay
+        LOGGER.warning(
+            f'[FAIL] SMTP {self.name} indisponível, nova tentativa em '
+            f'{delay:.0f}s: {error}'
+        )
+
+    def send_batch(
+        self, jobs: List[EmailJob]
+    ) -> Tuple[List[EmailJob], List[EmailJob]]:
+        """
+        Envia o lote inteiro pela mesma sessão.
+
+        Retorna (recusadas, adiadas). Recusadas: o servidor rejeitou a
+        mensagem. Adiadas: não houve conexão. Na primeira falha de conexão
+        o resto do lote não é tentado (cada tentativa esperaria o timeout
+        de novo) e a sessão entra em backoff. Se a conexão cair no meio do
+        lote, reconecta uma vez e continua.
+        """
+        if not self.available:
+            return [], list(jobs)
+
+        failed: List[EmailJob] = []
+        reconnected = False
+        index = 0
+
+        while index < len(jobs):
+            job = jobs[index]
+            try:
+                smtp = self.ensure()
+                smtp.sendmail(
+                    self.sender, job.receiver_email, self._message(job)
+                )
+                self._failures = 0
+                index += 1
+            except smtplib.SMTPServerDisconnected as e:
+                self.close()
+                if reconnected:
+                    self._connection_failed(e)
+                    return failed, list(jobs[index:])
+                reconnected = True
+            except (smtplib.SMTPConnectError, smtplib.SMTPAuthenticationError,
+                    OSError) as e:
+                self._connection_failed(e)
+                return failed, list(jobs[index:])
+            except smtplib.SMTPException as e:
+                LOGGER.warning(f'[FAIL] SMTP {self.name}: {e}')
+                failed.append(job)
+                index += 1
+
+        return failed, []
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+
+class EmailDeliveryQueue:
+    """
+    EmailDeliveryQueue: Fila assíncrona de emails com workers em background.
+
+    A rota apenas enfileira (`enqueue`) e retorna. Cada worker retira até
+    `batch_size` mensagens da fila e as envia numa sessão SMTP persistente,
+    executada numa thread para não bloquear o event loop. Se o provedor
+    principal falhar, as mensagens restantes vão para o próximo provedor.
+
+    Mensagens que nenhum provedor chegou a tentar (sem conexão) esperam o
+    backoff fora da fila, num timer. No `stop` esses timers são cancelados
+    e as mensagens voltam à fila para a última tentativa.
+    """
+
+    def __init__(
+        self, workers: int = 2, batch_size: int = 50, max_size: int = 10000
+    ) -> None:
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_size = max_size
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retried = 0
+        self._queue: Optional[asyncio.Queue] = None
+        # Mensagens aguardando o backoff: chave -> (timer, mensagem)
+        self._waiting: Dict[int, Tuple[asyncio.TimerHandle, EmailJob]] = {}
+        self._waiting_keys = itertools.count()
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+        self._providers: Dict[str, Dict[str, Any]] = {}
+        self._sender = ''
+        self._password: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(
+        self,
+        providers: Dict[str, Dict[str, Any]],
+        sender: str,
+        password: Optional[str],
+    ) -> None:
+        """Inicia os workers (chamado no lifespan)."""
+        if self.running:
+            return
+
+        self._providers = providers
+        self._sender = sender
+        self._password = password
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f'email-worker-{i}')
+            for i in range(self.workers)
+        ]
+        LOGGER.info(
+            f'[OK] Fila de emails iniciada: {self.workers} workers, '
+            f'provedores: {", ".join(providers)}'
+        )
+
+    def enqueue(self, receiver_email: str, subject: str, body: str) -> bool:
+        """Coloca a mensagem na fila. Retorna False se a fila estiver cheia."""
+        if self._queue is None:
+            return False
+
+        try:
+            self._queue.put_nowait(EmailJob(receiver_email, subject, body))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def join(self) -> None:
+        """Aguarda até que todas as mensagens enfileiradas sejam processadas."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Tenta esvaziar a fila e encerra os workers."""
+        if not self.running:
+            return
+
+        # Última tentativa para quem esperava o backoff; novas falhas de
+        # conexão daqui em diante não são reagendadas
+        self._stopping = True
+        waiting, self._waiting = list(self._waiting.values()), {}
+        for handle, job in waiting:
+            handle.cancel()
+            self._put(job)
+
+        try:
+            await asyncio.wait_for(self.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning(
+                f'[FAIL] Fila de emails encerrada com '
+                f'{self._queue.qsize()} mensagens pendentes.'
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self._queue.qsize() if self._queue else 0,
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'retried': self.retried,
+            'waiting': len(self._waiting),
+        }
+
+    def _take_batch(self, first: EmailJob) -> List[EmailJob]:
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    def _put(self, job: EmailJob) -> None:
+        if self._queue is None or not self.running:
+            self.dropped += 1
+            LOGGER.warning(
+                f'[FAIL] Email para {job.receiver_email} descartado: fila '
+                'encerrada.'
+            )
+            return
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _requeue(self, key: int) -> None:
+        _, job = self._waiting.pop(key)
+        self._put(job)
+
+    def _retry_later(self, jobs: List[EmailJob]) -> int:
+        """Reagenda com backoff as mensagens sem conexão. Retorna quantas."""
+        if self._stopping:
+            if jobs:
+                LOGGER.warning(
+                    f'[FAIL] {len(jobs)} emails sem conexão no encerramento '
+                    'não serão reenviados.'
+                )
+            return 0
+
+        loop = asyncio.get_running_loop()
+        scheduled = 0
+        for job in jobs:
+            if job.attempts + 1 >= EMAIL_MAX_ATTEMPTS:
+                continue
+            key = next(self._waiting_keys)
+            handle = loop.call_later(
+                backoff_delay(job.attempts + 1), self._requeue, key
+            )
+            self._waiting[key] = (
+                handle, replace(job, attempts=job.attempts + 1)
+            )
+            scheduled += 1
+        self.retried += scheduled
+        return scheduled
+
+    async def _worker(self) -> None:
+        sessions = [
+            SMTPSession(name, server, self._sender, self._password)
+            for name, server in self._providers.items()
+        ]
+        try:
+            while True:
+                batch = self._take_batch(await self._queue.get())
+                try:
+                    pending = batch
+                    # Recusadas por algum provedor: falha definitiva
+                    rejected_ids = set()
+                    for session in sessions:
+                        failed, deferred = await asyncio.to_thread(
+                            session.send_batch, pending
+                        )
+                        rejected_ids.update(id(job) for job in failed)
+                        pending = failed + deferred
+                        if not pending:
+                            break
+
+                    # Só reagenda quem nenhum provedor chegou a tentar
+                    retry = [
+                        job for job in pending if id(job) not in rejected_ids
+                    ]
+                    self.delivered += len(batch) - len(pending)
+                    self.failed += len(pending) - self._retry_later(retry)
+                except Exception as e:
+                    self.failed += len(batch)
+                    LOGGER.error(f'[FAIL] Erro no worker de email: {e}')
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            for session in sessions:
+                session.close()
+
+
+EMAIL_QUEUE = EmailDeliveryQueue(
+    workers=int(os.getenv('EMAIL_QUEUE_WORKERS', '2')),
+    batch_size=int(os.getenv('EMAIL_QUEUE_BATCH_SIZE', '50')),
+    max_size=int(os.getenv('EMAIL_QUEUE_MAX_SIZE', '10000')),
+)
@@ -1,17 +1,21 @@
+import asyncio
 import os
 import smtplib
 import ssl
 from email.mime.text import MIMEText
 from typing import Optional
 
-from dotenv import load_dotenv
 from fastapi import HTTPException, status
 
+from src.global_utils.env import load_env
 from src.models.user import User
+from src.service.jwt.principal_cache import invalidate_principal
+from src.service.send_email.delivery import EMAIL_QUEUE
+from src.service.send_email.verification_codes import VERIFICATION_CODES
 from src.global_utils.generator_code_for_email import secret_verificatio_code_for_emails
 
 # Carrega variáveis de ambiente
-load_dotenv()
+load_env()
 
 
 class EmailConfig:
@@ -101,11 +105,13 @@ class UserCodeManager:
         """
         Atualiza o código temporário de verificação do usuário.
 
+        O código fica na tabela `verification_codes` (com expiração), sem
+        regravar a linha inteira do usuário.
+
         Retorna True se o código foi atualizado, False caso contrário.
         """
         try:
-            user.temporary_code = str(code)
-            await user.save()
+            await VERIFICATION_CODES.issue(user.id, str(code))
             return True
         except Exception as e:
             print(f'Erro ao atualizar código do usuário: {e}')
@@ -116,17 +122,10 @@ class UserCodeManager:
         """
         Verifica se um novo código pode ser enviado para o usuário.
 
-        Retorna True se:
-        1. O usuário não tem código temporário, OU
-        2. A conta não está verificada e há um código existente
+        Retorna True enquanto a conta não estiver verificada. Um novo código
+        substitui o anterior.
         """
-        if user.temporary_code is None:
-            return True
-
-        if not user.verified_account and user.temporary_code is not None:
-            return True
-
-        return False
+        return not user.verified_account
 
 
 class VerificationEmailService:
@@ -163,8 +162,12 @@ Se você não solicitou este código, ignore esta mensagem.
         Retorna True se o email foi enviado com sucesso, False caso contrário.
         """
         try:
-            # Busca usuário pelo email
-            user = await User.filter(email=target_email).first()
+            # Busca usuário pelo email (só as colunas necessárias)
+            user = (
+                await User.by_email(target_email)
+                .only('id', 'verified_account')
+                .first()
+            )
             if not user:
                 print(f'Usuário com email {target_email} não encontrado.')
                 return False
@@ -187,7 +190,14 @@ Se você não solicitou este código, ignore esta mensagem.
             subject = self._generate_email_subject()
             body = self._generate_email_body(str(code))
 
-            return self.email_sender.send(target_email, subject, body)
+            # Com a fila ativa a rota só enfileira; o envio acontece em
+            # background numa sessão SMTP reutilizada.
+            if EMAIL_QUEUE.running:
+                return EMAIL_QUEUE.enqueue(target_email, subject, body)
+
+            return await asyncio.to_thread(
+                self.email_sender.send, target_email, subject, body
+            )
 
         except Exception as e:
             print(f'Erro no envio de código de verificação: {e}')
@@ -215,6 +225,47 @@ async def send_code_email(target_email: str) -> bool:
         return False
 
 
+def smtp_providers() -> dict:
+    """
+    Provedores SMTP na ordem de tentativa.
+
+    Com `SMTP_HOST` definido (ex.: servidor SMTP local em testes), apenas
+    esse servidor é usado, sem TLS por padrão.
+    """
+    host = os.getenv('SMTP_HOST')
+    if host:
+        return {
+            'custom': {
+                'host': host,
+                'port': int(os.getenv('SMTP_PORT', '25')),
+                'ssl': os.getenv('SMTP_USE_SSL', 'false').lower() == 'true',
+            }
+        }
+
+    return dict(EmailSender.SMTP_SERVERS)
+
+
+def start_email_delivery() -> None:
+    """Inicia a fila de emails em background (chamado no lifespan)."""
+    try:
+        config = EmailConfig()
+    except ValueError as e:
+        print(f'Erro de configuração: {e}')
+        return
+
+    # Sem senha (servidor local) a sessão não faz login
+    password = config.google_app_key
+    if os.getenv('SMTP_HOST') and not os.getenv('SMTP_LOGIN'):
+        password = None
+
+    EMAIL_QUEUE.start(smtp_providers(), config.company_email, password)
+
+
+async def stop_email_delivery() -> None:
+    """Esvazia a fila e fecha as sessões SMTP (chamado no lifespan)."""
+    await EMAIL_QUEUE.stop()
+
+
 async def verify_status_account(
     code_authentication: str, target_email: str
 ) -> bool:
@@ -224,7 +275,7 @@ async def verify_status_account(
     Mantida para compatibilidade com código existente.
     """
     try:
-        user = await User.filter(email=target_email).first()
+        user = await User.by_email(target_email).only('id').first()
         if not user:
             return False
 
@@ -255,7 +306,7 @@ def send_email_message(receiver_email: str, subject: str, body: str) -> bool:
 
 
 async def activating_the_account_with_a_code(
-    target_account: str, code: str
+    target_account: str, code: str, user_id: Optional[int] = None
 ) -> bool:
     """Função responsavel por ativa a conta do usuario"""
 
@@ -265,28 +316,31 @@ async def activating_the_account_with_a_code(
             detail='Esse valor e muito grande',
         )
 
-    elif not isinstance(code, str):
-        len_code = len(code)
-        if len_code == 4:
-            code = int(code)
-
     try:
-        target = await User.filter(email=target_account).first()
-
-        if target:
-            pull_code = target.temporary_code
-            # Verificar se o codigo fornecido pelo usuario e igual ao do banco
-            if str(pull_code) == code:
-                target.verified_account = True
-                target.status = True
-                await target.save()
-                return True
-
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail='Codigo invalido. Tente novamente',
-                )
+        if user_id is None:
+            target = await User.by_email(target_account).only('id').first()
+            if not target:
+                return False
+            user_id = target.id
+
+        # Verificar se o codigo fornecido pelo usuario e igual ao do banco
+        # (UPDATE condicional: código certo, não expirado e não usado)
+        if not await VERIFICATION_CODES.consume(user_id, code):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Codigo invalido. Tente novamente',
+            )
+
+        await User.filter(id=user_id).update(
+            verified_account=True, status=True
+        )
+        # QuerySet.update() não dispara os sinais do Tortoise
+        invalidate_principal(user_id)
+        return True
+
+    except HTTPException:
+        raise
 
     except Exception as e:
+        print(f'Erro ao ativar a conta: {e}')
         return False
@@ -0,0 +1,87 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F, Q
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+from src.models.verification_code import VerificationCode
+
+CODE_TTL_SECONDS = int(os.getenv('VERIFICATION_CODE_TTL', '900'))
+CODE_MAX_ATTEMPTS = int(os.getenv('VERIFICATION_CODE_MAX_ATTEMPTS', '5'))
+
+
+class VerificationCodeStore:
+    """
+    VerificationCodeStore: Códigos de verificação com expiração e limite de
+    tentativas, na tabela `verification_codes`.
+
+    Emitir e consumir um código são UPDATEs condicionais de uma instrução,
+    sem ler a linha antes. Não há cache em memória: o código pode ter sido
+    emitido por outro worker, então só o banco decide.
+    """
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def issue(self, user_id: int, code: str) -> None:
+        """Cria ou substitui o código ativo do usuário."""
+        values = {
+            'code': str(code),
+            'expires_in': self._now() + timedelta(seconds=CODE_TTL_SECONDS),
+            'attempts': 0,
+            'consumed': False,
+        }
+
+        updated = await VerificationCode.filter(user_id=user_id).update(
+            **values
+        )
+        if not updated:
+            try:
+                await VerificationCode.create(user_id=user_id, **values)
+            except IntegrityError:
+                # Outro worker criou a linha ao mesmo tempo
+                await VerificationCode.filter(user_id=user_id).update(
+                    **values
+                )
+
+    async def consume(self, user_id: int, code: str) -> bool:
+        """
+        Consome o código se ele for válido, não expirado e dentro do limite
+        de tentativas. Um código errado conta como tentativa.
+        """
+        consumed = await VerificationCode.filter(
+            user_id=user_id,
+            code=str(code),
+            consumed=False,
+            expires_in__gt=self._now(),
+            attempts__lt=CODE_MAX_ATTEMPTS,
+        ).update(consumed=True)
+        if consumed:
+            return True
+
+        await VerificationCode.filter(user_id=user_id, consumed=False).update(
+            attempts=F('attempts') + 1
+        )
+        return False
+
+    async def sweep(self) -> int:
+        """Remove em lote os códigos expirados ou já consumidos."""
+        deleted = await VerificationCode.filter(
+            Q(expires_in__lte=self._now()) | Q(consumed=True)
+        ).delete()
+
+        if deleted:
+            LOGGER.info(f'[OK] {deleted} códigos de verificação removidos.')
+        return deleted
+
+
+VERIFICATION_CODES = VerificationCodeStore()
+
+register_periodic_task(
+    'sweep-verification-codes',
+    float(os.getenv('VERIFICATION_CODE_SWEEP_INTERVAL', '300')),
+    VERIFICATION_CODES.sweep,
+)
@@ -0,0 +1,526 @@
+"""
+Favoritos e histórico de visualizações com escrita adiada (write-behind).
+
+As rotas não escrevem no banco: `record_view` e `set_favorite` só anotam
+o evento no buffer em memória do worker, já consolidado por chave
+(usuário, serviço):
+
+- N visualizações do mesmo serviço viram uma linha (views + N, hora da
+  mais recente);
+- marcar e desmarcar o favorito em seguida fica só com o último estado.
+
+Uma tarefa em background grava o buffer com INSERTs de várias linhas
+(upsert) a cada ACTIVITY_FLUSH_INTERVAL segundos, ou antes, quando ele
+passa de ACTIVITY_FLUSH_SIZE chaves. Cada gravação é uma transação: se
+falhar, o lote volta para o buffer. No desligamento o lifespan grava o
+que restou.
+
+As leituras (favoritos, histórico recente) juntam o banco com o que
+ainda não foi gravado por este worker; o buffer de outro worker aparece
+em no máximo ACTIVITY_FLUSH_INTERVAL segundos.
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (Any, Awaitable, Callable, Dict, List, Optional,
+                    Tuple)
+
+from tortoise import BaseDBAsyncClient, connections
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from src.database.router import primary_pin_scope
+from src.global_utils.logs import LOGGER
+from src.models.activity import Favorite, ServiceView
+from src.models.service import Service
+from src.models.user import User
+
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL', '2'))
+ACTIVITY_FLUSH_SIZE = int(os.getenv('ACTIVITY_FLUSH_SIZE', '2000'))
+ACTIVITY_MAX_PENDING = int(os.getenv('ACTIVITY_MAX_PENDING', '100000'))
+ACTIVITY_BATCH_ROWS = 500   # linhas por INSERT
+ACTIVITY_READ_ATTEMPTS = 3
+HISTORY_MAX_RESULTS = 100
+
+SQLITE_VIEWS_UPSERT = """
+INSERT INTO service_views (user_id, service_id, views, last_viewed_in)
+VALUES {rows}
+ON CONFLICT (user_id, service_id) DO UPDATE SET
+    views = views + excluded.views,
+    last_viewed_in = MAX(last_viewed_in, excluded.last_viewed_in)
+"""
+
+MYSQL_VIEWS_UPSERT = """
+INSERT INTO service_views (user_id, service_id, views, last_viewed_in)
+VALUES {rows}
+ON DUPLICATE KEY UPDATE
+    views = views + VALUES(views),
+    last_viewed_in = GREATEST(last_viewed_in, VALUES(last_viewed_in))
+"""
+
+
+@dataclass
+class PendingView:
+    views: int
+    last_viewed_in: datetime
+
+
+# usuário -> serviço -> visualizações ainda não gravadas
+PendingViews = Dict[int, Dict[int, PendingView]]
+# usuário -> serviço -> (favorito?, hora do clique)
+PendingFavorites = Dict[int, Dict[int, Tuple[bool, datetime]]]
+# Pendente de um usuário: (visualizações, favoritos) por serviço
+UserPending = Tuple[Dict[int, PendingView], Dict[int, Tuple[bool, datetime]]]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _write_views(
+    connection: BaseDBAsyncClient, views: PendingViews
+) -> None:
+    mysql = connection.capabilities.dialect == 'mysql'
+    sql = MYSQL_VIEWS_UPSERT if mysql else SQLITE_VIEWS_UPSERT
+    mark = '%s' if mysql else '?'
+    field = ServiceView._meta.fields_map['last_viewed_in']
+
+    rows: List[List[Any]] = [
+        [user_id, service_id, pending.views, pending.last_viewed_in]
+        for user_id, services in views.items()
+        for service_id, pending in services.items()
+    ]
+    row_marks = f'({mark}, {mark}, {mark}, {mark})'
+    for first in range(0, len(rows), ACTIVITY_BATCH_ROWS):
+        batch = rows[first : first + ACTIVITY_BATCH_ROWS]
+        params: List[Any] = []
+        for user_id, service_id, count, viewed_in in batch:
+            viewed_in = field.to_db_value(viewed_in, ServiceView)
+            # O SQLite guarda datas como texto (igual ao ORM)
+            if not mysql:
+                viewed_in = str(viewed_in)
+            params.extend((user_id, service_id, count, viewed_in))
+        await connection.execute_query(
+            sql.format(rows=', '.join([row_marks] * len(batch))), params
+        )
+
+
+async def _write_favorites(
+    connection: BaseDBAsyncClient, favorites: PendingFavorites
+) -> None:
+    added = []
+    for user_id, services in favorites.items():
+        removed = [
+            service_id
+            for service_id, (favorite, _) in services.items()
+            if not favorite
+        ]
+        if removed:
+            await Favorite.filter(
+                user_id=user_id, service_id__in=removed
+            ).using_db(connection).delete()
+        added += [
+            Favorite(user_id=user_id, service_id=service_id, created_in=when)
+            for service_id, (favorite, when) in services.items()
+            if favorite
+        ]
+
+    if added:
+        # Já favoritado: mantém a linha (e a data) original
+        await Favorite.bulk_create(
+            added,
+            batch_size=ACTIVITY_BATCH_ROWS,
+            ignore_conflicts=True,
+            using_db=connection,
+        )
+
+
+async def _drop_orphans(
+    views: PendingViews, favorites: PendingFavorites
+) -> int:
+    """
+    Remove do lote os eventos de usuários ou serviços apagados (a chave
+    estrangeira derrubaria o lote inteiro). Retorna quantos descartou.
+    """
+    user_ids = set(views) | set(favorites)
+    service_ids = {
+        service_id
+        for pending in (views, favorites)
+        for services in pending.values()
+        for service_id in services
+    }
+    users = set(
+        await User.filter(id__in=user_ids).values_list('id', flat=True)
+    )
+    services = set(
+        await Service.filter(id__in=service_ids).values_list('id', flat=True)
+    )
+
+    dropped = 0
+    for pending in (views, favorites):
+        for user_id in list(pending):
+            if user_id not in users:
+                dropped += len(pending.pop(user_id))
+                continue
+            by_service = pending[user_id]
+            for service_id in list(by_service):
+                if service_id not in services:
+                    del by_service[service_id]
+                    dropped += 1
+    return dropped
+
+
+class ActivityBuffer:
+    """
+    ActivityBuffer: Buffer de visualizações e favoritos por worker.
+
+    Limitado a `max_pending` chaves: acima disso novas visualizações são
+    descartadas (contadas em `dropped`), como na fila de emails. Favoritos
+    nunca são descartados.
+    """
+
+    def __init__(
+        self,
+        flush_size: int = ACTIVITY_FLUSH_SIZE,
+        flush_interval: float = ACTIVITY_FLUSH_INTERVAL,
+        max_pending: int = ACTIVITY_MAX_PENDING,
+    ) -> None:
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.flush_size, max_pending)
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._views: PendingViews = {}
+        self._favorites: PendingFavorites = {}
+        self._pending = 0
+        # Lote sendo gravado: ainda visível para as leituras
+        self._flushing: Tuple[PendingViews, PendingFavorites] = ({}, {})
+        # Ímpar enquanto um lote é confirmado (COMMIT) no banco
+        self._epoch = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    # --- Escrita (rotas) ---
+
+    def _added(self) -> None:
+        self._pending += 1
+        if self._pending >= self.flush_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def record_view(
+        self, user_id: int, service_id: int, when: Optional[datetime] = None
+    ) -> bool:
+        """Anota uma visualização. False se o buffer estiver cheio."""
+        when = when or _now()
+        services = self._views.get(user_id)
+        found = services.get(service_id) if services else None
+        if found is not None:
+            found.views += 1
+            if when > found.last_viewed_in:
+                found.last_viewed_in = when
+            self.recorded += 1
+            return True
+
+        if self._pending >= self.max_pending:
+            self.dropped += 1
+            return False
+        if services is None:
+            services = self._views[user_id] = {}
+        services[service_id] = PendingView(1, when)
+        self.recorded += 1
+        self._added()
+        return True
+
+    def set_favorite(
+        self,
+        user_id: int,
+        service_id: int,
+        favorite: bool,
+        when: Optional[datetime] = None,
+    ) -> None:
+        """Anota marcar (True) ou desmarcar (False); vale o último."""
+        services = self._favorites.setdefault(user_id, {})
+        if service_id not in services:
+            self._added()
+        services[service_id] = (favorite, when or _now())
+        self.recorded += 1
+
+    # --- Gravação ---
+
+    def _restore(
+        self, views: PendingViews, favorites: PendingFavorites
+    ) -> None:
+        """Devolve um lote que falhou; o que chegou depois tem prioridade."""
+        for user_id, services in views.items():
+            current = self._views.setdefault(user_id, {})
+            for service_id, pending in services.items():
+                found = current.get(service_id)
+                if found is None:
+                    current[service_id] = pending
+                    self._pending += 1
+                else:
+                    found.views += pending.views
+                    found.last_viewed_in = max(
+                        found.last_viewed_in, pending.last_viewed_in
+                    )
+        for user_id, services in favorites.items():
+            current = self._favorites.setdefault(user_id, {})
+            for service_id, state in services.items():
+                if service_id not in current:
+                    current[service_id] = state
+                    self._pending += 1
+
+    async def _write(
+        self, views: PendingViews, favorites: PendingFavorites
+    ) -> None:
+        try:
+            async with in_transaction('default') as connection:
+                await _write_favorites(connection, favorites)
+                await _write_views(connection, views)
+                self._epoch += 1   # o COMMIT acontece na saída do bloco
+        finally:
+            if self._epoch % 2:
+                self._epoch += 1
+
+    async def flush(self) -> int:
+        """Grava tudo o que está pendente. Retorna quantas chaves gravou."""
+        async with self._flush_lock:
+            views, favorites = self._views, self._favorites
+            count = self._pending
+            if not count:
+                return 0
+            self._views, self._favorites, self._pending = {}, {}, 0
+            self._flushing = (views, favorites)
+
+            try:
+                try:
+                    await self._write(views, favorites)
+                except IntegrityError:
+                    dropped = await _drop_orphans(views, favorites)
+                    LOGGER.warning(
+                        f'[FAIL] {dropped} eventos de usuários/serviços '
+                        'removidos descartados.'
+                    )
+                    count -= dropped
+                    await self._write(views, favorites)
+            except BaseException as e:
+                # Inclui o cancelamento: o lote volta para o buffer
+                self._flushing = ({}, {})
+                self._restore(views, favorites)
+                if isinstance(e, Exception):
+                    self.failed += 1
+                    LOGGER.error(
+                        f'[FAIL] Gravação de favoritos/visualizações '
+                        f'({count} pendentes): {e}'
+                    )
+                    return 0
+                raise
+
+            self._flushing = ({}, {})
+            self.flushed += count
+            return count
+
+    # --- Leitura ---
+
+    def _pending_for(self, user_id: int) -> UserPending:
+        """O que o usuário tem pendente (lote em gravação + buffer)."""
+        views: Dict[int, PendingView] = {}
+        favorites: Dict[int, Tuple[bool, datetime]] = {}
+        flushing_views, flushing_favorites = self._flushing
+        for source in (flushing_views, self._views):
+            for service_id, pending in source.get(user_id, {}).items():
+                found = views.get(service_id)
+                if found is None:
+                    views[service_id] = PendingView(
+                        pending.views, pending.last_viewed_in
+                    )
+                else:
+                    found.views += pending.views
+                    found.last_viewed_in = max(
+                        found.last_viewed_in, pending.last_viewed_in
+                    )
+        for source in (flushing_favorites, self._favorites):
+            favorites.update(source.get(user_id, {}))
+        return views, favorites
+
+    async def _consistent_read(
+        self, user_id: int, read: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, UserPending]:
+        """
+        Lê o banco e o pendente do usuário sem contar um lote duas vezes
+        (nem nenhuma): se um COMMIT começou ou terminou durante a leitura,
+        lê de novo.
+        """
+        for _ in range(ACTIVITY_READ_ATTEMPTS):
+            epoch = self._epoch
+            pending = self._pending_for(user_id)
+            rows = await read()
+            if epoch == self._epoch and not epoch % 2:
+                break
+        return rows, pending
+
+    async def recent_history(
+        self, user_id: int, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """[{service_id, views, last_viewed_in}], do mais recente."""
+        limit = max(1, min(limit, HISTORY_MAX_RESULTS))
+        # Réplicas atrasadas veriam o lote recém-gravado como pendente
+        primary = connections.get('default')
+        fields = ('service_id', 'views', 'last_viewed_in')
+
+        async def read() -> List[Dict[str, Any]]:
+            # Antes do primeiro `await`: os mesmos pendentes do retrato
+            pending_ids = list(self._pending_for(user_id)[0])
+            found = await (
+                ServiceView.filter(user_id=user_id)
+                .using_db(primary)
+                .order_by('-last_viewed_in')
+                .limit(limit)
+                .values(*fields)
+            )
+            # Visto há tempo (fora do topo) e de novo agora: o total gravado
+            # também entra na soma
+            listed = {row['service_id'] for row in found}
+            missing = [i for i in pending_ids if i not in listed]
+            if missing:
+                found += await ServiceView.filter(
+                    user_id=user_id, service_id__in=missing
+                ).using_db(primary).values(*fields)
+            return found
+
+        rows, (views, _) = await self._consistent_read(user_id, read)
+
+        merged = {row['service_id']: row for row in rows}
+        for service_id, pending in views.items():
+            row = merged.get(service_id)
+            if row is None:
+                merged[service_id] = {
+                    'service_id': service_id,
+                    'views': pending.views,
+                    'last_viewed_in': pending.last_viewed_in,
+                }
+            else:
+                row['views'] += pending.views
+                row['last_viewed_in'] = max(
+                    row['last_viewed_in'], pending.last_viewed_in
+                )
+        ordered = sorted(
+            merged.values(),
+            key=lambda row: row['last_viewed_in'],
+            reverse=True,
+        )
+        return ordered[:limit]
+
+    async def favorites(
+        self, user_id: int, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """[{service_id, favorited_in}], do favoritado mais recentemente."""
+        limit = max(1, min(limit, HISTORY_MAX_RESULTS))
+        primary = connections.get('default')
+        # Busca a mais para cobrir os desmarcados ainda não gravados
+        removed = sum(
+            1
+            for favorite, _ in self._pending_for(user_id)[1].values()
+            if not favorite
+        )
+        rows, (_, pending) = await self._consistent_read(
+            user_id,
+            lambda: Favorite.filter(user_id=user_id)
+            .using_db(primary)
+            .order_by('-created_in')
+            .limit(limit + removed)
+            .values('service_id', 'created_in'),
+        )
+
+        merged = {}
+        for row in rows:
+            state = pending.get(row['service_id'])
+            # Desmarcado e ainda não gravado: não aparece
+            if state is None or state[0]:
+                merged[row['service_id']] = row['created_in']
+        for service_id, (favorite, when) in pending.items():
+            if favorite and service_id not in merged:
+                merged[service_id] = when
+
+        ordered = sorted(
+            merged.items(), key=lambda item: item[1], reverse=True
+        )
+        return [
+            {'service_id': service_id, 'favorited_in': when}
+            for service_id, when in ordered[:limit]
+        ]
+
+    # --- Ciclo de vida ---
+
+    async def _loop(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                # O pino no primário de uma gravação não passa para a próxima
+                with primary_pin_scope():
+                    await self.flush()
+            except Exception as e:
+                LOGGER.error(f'[FAIL] Buffer de atividade: {e}')
+
+    def start(self) -> None:
+        """Inicia a gravação em background (chamado no lifespan)."""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(
+            self._loop(), name='activity-flush'
+        )
+        LOGGER.info(
+            f'[OK] Buffer de atividade iniciado: a cada '
+            f'{self.flush_interval}s ou {self.flush_size} chaves.'
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Grava o que está pendente e encerra a tarefa."""
+        if not self.running:
+            return
+
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+            # Eventos anotados durante a última gravação do laço
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning(
+                f'[FAIL] Buffer de atividade encerrado com '
+                f'{self._pending} chaves pendentes.'
+            )
+        self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'pending': self._pending,
+            'recorded': self.recorded,
+            'flushed': self.flushed,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+
+ACTIVITY = ActivityBuffer()
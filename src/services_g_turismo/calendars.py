@@ -0,0 +1,337 @@
+"""
+Calendários de disponibilidade em bitmap (busca por datas de viagem).
+
+Cada serviço tem, por ano, um bitmap de 46 bytes (um bit por dia, ligado
+quando o dia ainda tem vaga) na tabela `service_calendars`. Em memória,
+cada ano vira uma matriz NumPy N x 46 (uint8), uma linha por serviço.
+
+"Disponível de 20/12 a 05/01" vira uma máscara de bits por ano; a
+filtragem é `(linhas & máscara) == máscara` sobre a matriz inteira, só
+nas colunas (bytes) que a faixa toca. Nada de JOIN com uma linha por dia.
+
+Atualização:
+- toda mudança de estoque (reserva, cancelamento, expiração, capacidade)
+  recalcula, a partir do inventário, os anos tocados daquele serviço;
+- a cada CALENDARS_SYNC_INTERVAL segundos cada worker relê os calendários
+  gravados por outros workers (`updated_in`);
+- a cada CALENDARS_RECOMPUTE_INTERVAL segundos os calendários são
+  conferidos com o inventário e os divergentes regravados.
+
+O recálculo de um serviço (ler o inventário e gravar o bitmap) é
+serializado por serviço dentro do worker: sem isso, um recálculo que leu
+o inventário antes de outra reserva podia gravar por último e deixar o
+bitmap velho. Entre workers a mesma corrida é rara e a conferência
+periódica a corrige.
+
+O inventário continua sendo a fonte da verdade: o calendário só escolhe
+candidatos, e a reserva (UPDATE condicional) decide.
+"""
+import asyncio
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from tortoise import BaseDBAsyncClient
+from tortoise.exceptions import IntegrityError
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+from src.models.calendar import ServiceCalendar
+from src.models.reservation import Inventory
+from src.services_g_turismo.facets import ids_bitmap
+from src.services_g_turismo.reservations import RESERVATIONS
+
+CALENDAR_BYTES = 46
+CALENDAR_DAYS = CALENDAR_BYTES * 8   # 368 bits: cabe um ano bissexto
+CALENDAR_MAX_DAYS = 366
+CALENDARS_SYNC_INTERVAL = float(os.getenv('CALENDARS_SYNC_INTERVAL', '10'))
+CALENDARS_RECOMPUTE_INTERVAL = float(
+    os.getenv('CALENDARS_RECOMPUTE_INTERVAL', '3600')
+)
+CALENDARS_LOAD_CHUNK = 5000
+
+# (ano, primeiro byte, último byte exclusivo, máscara desses bytes)
+RangeMask = Tuple[int, int, int, np.ndarray]
+
+
+def day_index(day: date) -> int:
+    """Posição do dia no bitmap do ano (1º de janeiro = 0)."""
+    return day.timetuple().tm_yday - 1
+
+
+def encode_days(days: Iterable[date]) -> bytes:
+    """Bitmap (46 bytes) com os dias informados ligados."""
+    bits = np.zeros(CALENDAR_DAYS, dtype=bool)
+    bits[[day_index(day) for day in days]] = True
+    return np.packbits(bits, bitorder='little').tobytes()
+
+
+def range_masks(start: date, end: date) -> List[RangeMask]:
+    """Máscaras de `start` até `end` (exclusivo), uma por ano tocado."""
+    masks = []
+    day = start
+    while day < end:
+        stop = min(end, date(day.year + 1, 1, 1))
+        first = day_index(day)
+        last = day_index(stop - timedelta(days=1))
+
+        bits = np.zeros(CALENDAR_DAYS, dtype=bool)
+        bits[first : last + 1] = True
+        mask = np.packbits(bits, bitorder='little')
+        low, high = first // 8, last // 8 + 1
+        masks.append((day.year, low, high, mask[low:high]))
+        day = stop
+    return masks
+
+
+class CalendarIndex:
+    """Matrizes N x 46 por ano, uma linha por serviço."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self._rows: Dict[int, int] = {}
+        self.years: Dict[int, np.ndarray] = {}
+        self.synced_until: Optional[datetime] = None
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+        # Um lock por serviço com recálculo em andamento (e quantos o usam)
+        self._refresh_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
+    # --- Memória ---
+
+    def _grow(self) -> None:
+        size = len(self.ids) * 2
+        ids = np.zeros(size, dtype=np.int64)
+        ids[: self.count] = self.ids[: self.count]
+        self.ids = ids
+        for year, matrix in self.years.items():
+            grown = np.zeros((size, CALENDAR_BYTES), dtype=np.uint8)
+            grown[: len(matrix)] = matrix
+            self.years[year] = grown
+
+    def _row(self, service_id: int) -> int:
+        row = self._rows.get(service_id)
+        if row is None:
+            if self.count == len(self.ids):
+                self._grow()
+            row = self.count
+            self.ids[row] = service_id
+            self._rows[service_id] = row
+            self.count += 1
+        return row
+
+    def set(self, service_id: int, year: int, bitmap: bytes) -> None:
+        row = self._row(service_id)
+        matrix = self.years.get(year)
+        if matrix is None:
+            matrix = np.zeros((len(self.ids), CALENDAR_BYTES), dtype=np.uint8)
+            self.years[year] = matrix
+        matrix[row] = np.frombuffer(bitmap, dtype=np.uint8)
+
+    def get(self, service_id: int, year: int) -> Optional[bytes]:
+        row = self._rows.get(service_id)
+        matrix = self.years.get(year)
+        if row is None or matrix is None:
+            return None
+        return matrix[row].tobytes()
+
+    def clear(self) -> None:
+        self.ids = np.zeros(len(self.ids), dtype=np.int64)
+        self.count = 0
+        self._rows.clear()
+        self.years.clear()
+
+    # --- Consulta ---
+
+    def available(self, start: date, end: date) -> np.ndarray:
+        """ids dos serviços com vaga em todos os dias da faixa."""
+        count = self.count
+        matched = np.ones(count, dtype=bool)
+        for year, low, high, mask in range_masks(start, end):
+            matrix = self.years.get(year)
+            if matrix is None:
+                return self.ids[:0]
+            block = matrix[:count, low:high]
+            matched &= ((block & mask) == mask).all(axis=1)
+        return self.ids[:count][matched]
+
+    def available_bitmap(self, start: date, end: date) -> int:
+        """Como `available`, no formato de bitmap das facetas."""
+        return ids_bitmap(self.available(start, end))
+
+    # --- Banco ---
+
+    @staticmethod
+    async def _store(service_id: int, year: int, bitmap: bytes) -> None:
+        # QuerySet.update() não preenche o auto_now
+        values = {'bitmap': bitmap, 'updated_in': datetime.now(timezone.utc)}
+        query = ServiceCalendar.filter(service_id=service_id, year=year)
+        if not await query.update(**values):
+            try:
+                await ServiceCalendar.create(
+                    service_id=service_id, year=year, **values
+                )
+            except IntegrityError:
+                # Outro worker criou a linha ao mesmo tempo
+                await query.update(**values)
+
+    async def refresh(self, service_id: int, start: date, end: date) -> None:
+        """Recalcula, a partir do inventário, os anos tocados pela faixa."""
+        lock, users = self._refresh_locks.get(service_id, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._refresh_locks[service_id] = (lock, users + 1)
+        try:
+            async with lock:
+                last_year = (end - timedelta(days=1)).year
+                for year in range(start.year, last_year + 1):
+                    days = await Inventory.filter(
+                        service_id=service_id,
+                        day__gte=date(year, 1, 1),
+                        day__lt=date(year + 1, 1, 1),
+                        remaining__gt=0,
+                    ).values_list('day', flat=True)
+                    bitmap = encode_days(days)
+                    await self._store(service_id, year, bitmap)
+                    self.set(service_id, year, bitmap)
+        finally:
+            # Ninguém mais esperando: descarta o lock
+            lock, users = self._refresh_locks[service_id]
+            if users > 1:
+                self._refresh_locks[service_id] = (lock, users - 1)
+            else:
+                del self._refresh_locks[service_id]
+
+    async def recompute(self) -> None:
+        """Confere os calendários com o inventário; recalcula divergentes."""
+        expected = await inventory_calendars()
+        empty = bytes(CALENDAR_BYTES)
+        last_id = 0
+        fixed = 0
+        while True:
+            rows = (
+                await ServiceCalendar.filter(id__gt=last_id)
+                .order_by('id')
+                .limit(CALENDARS_LOAD_CHUNK)
+                .values('id', 'service_id', 'year', 'bitmap')
+            )
+            if not rows:
+                break
+            for row in rows:
+                key = (row['service_id'], row['year'])
+                bitmap = expected.pop(key, empty)
+                if bytes(row['bitmap']) != bitmap:
+                    await self._fix(*key)
+                    fixed += 1
+            last_id = rows[-1]['id']
+        # Inventário sem calendário gravado
+        for service_id, year in expected:
+            await self._fix(service_id, year)
+            fixed += 1
+        if fixed:
+            LOGGER.warning(
+                f'[FAIL] {fixed} calendários divergentes do inventário '
+                'regravados.'
+            )
+
+    async def _fix(self, service_id: int, year: int) -> None:
+        # Relê o inventário sob o lock do serviço: o retrato da conferência
+        # pode ser mais velho que um recálculo concorrente
+        await self.refresh(service_id, date(year, 1, 1), date(year + 1, 1, 1))
+
+    async def _read(self, query) -> None:
+        last_id = 0
+        while True:
+            rows = (
+                await query.filter(id__gt=last_id)
+                .order_by('id')
+                .limit(CALENDARS_LOAD_CHUNK)
+                .values('id', 'service_id', 'year', 'bitmap', 'updated_in')
+            )
+            if not rows:
+                return
+            for row in rows:
+                self.set(row['service_id'], row['year'], row['bitmap'])
+                if self.synced_until is None or (
+                    row['updated_in'] > self.synced_until
+                ):
+                    self.synced_until = row['updated_in']
+            last_id = rows[-1]['id']
+
+    async def rebuild(self) -> None:
+        async with self._load_lock:
+            self.clear()
+            self.synced_until = None
+            await self._read(ServiceCalendar.all())
+            self.loaded = True
+
+    async def ensure_loaded(self) -> None:
+        """Carga preguiçosa: o primeiro uso neste worker monta as matrizes."""
+        if not self.loaded:
+            await self.rebuild()
+
+    async def sync(self) -> None:
+        """Aplica os calendários gravados desde a última sincronização."""
+        if not self.loaded:
+            return
+        async with self._load_lock:
+            query = ServiceCalendar.all()
+            if self.synced_until is not None:
+                query = query.filter(updated_in__gte=self.synced_until)
+            await self._read(query)
+
+
+async def inventory_calendars(
+    connection: Optional[BaseDBAsyncClient] = None,
+) -> Dict[Tuple[int, int], bytes]:
+    """Bitmap esperado de cada (serviço, ano) com dia vago no inventário."""
+    days_by_calendar: Dict[Tuple[int, int], List[date]] = {}
+    last_id = 0
+    while True:
+        query = Inventory.filter(id__gt=last_id, remaining__gt=0)
+        if connection is not None:
+            query = query.using_db(connection)
+        rows = (
+            await query.order_by('id')
+            .limit(CALENDARS_LOAD_CHUNK)
+            .values('id', 'service_id', 'day')
+        )
+        if not rows:
+            break
+        for row in rows:
+            key = (row['service_id'], row['day'].year)
+            days_by_calendar.setdefault(key, []).append(row['day'])
+        last_id = rows[-1]['id']
+    return {
+        key: encode_days(days) for key, days in days_by_calendar.items()
+    }
+
+
+async def backfill_calendars(connection: BaseDBAsyncClient) -> int:
+    """Monta os calendários de todo o inventário existente (migração)."""
+    calendars = await inventory_calendars(connection)
+    await ServiceCalendar.bulk_create(
+        [
+            ServiceCalendar(service_id=service_id, year=year, bitmap=bitmap)
+            for (service_id, year), bitmap in calendars.items()
+        ],
+        batch_size=CALENDARS_LOAD_CHUNK,
+        ignore_conflicts=True,
+        using_db=connection,
+    )
+    LOGGER.info(
+        f'[OK] {len(calendars)} calendários de disponibilidade montados.'
+    )
+    return len(calendars)
+
+
+CALENDARS = CalendarIndex()
+RESERVATIONS.on_change(CALENDARS.refresh)
+
+register_periodic_task(
+    'calendars-sync', CALENDARS_SYNC_INTERVAL, CALENDARS.sync
+)
+register_periodic_task(
+    'calendars-recompute', CALENDARS_RECOMPUTE_INTERVAL, CALENDARS.recompute
+)
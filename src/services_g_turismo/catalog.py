@@ -0,0 +1,140 @@
+"""
+Consultas do catálogo de serviços.
+
+A listagem usa paginação por cursor (keyset): cada página pede
+`id < cursor ORDER BY id DESC LIMIT n`, que o índice `(published, id)`
+resolve sem percorrer as páginas anteriores. Com OFFSET, a página 10.000
+leria e descartaria 200.000 linhas antes de devolver 20.
+"""
+import json
+import os
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from tortoise.queryset import QuerySet
+
+from src.models.service import Service, ServiceKind
+from src.services_g_turismo.schemas import fixed_price
+
+CATALOG_PAGE_SIZE = int(os.getenv('CATALOG_PAGE_SIZE', '20'))
+CATALOG_MAX_PAGE_SIZE = 100
+# Linhas buscadas por consulta no modo streaming (NDJSON)
+CATALOG_STREAM_CHUNK = int(os.getenv('CATALOG_STREAM_CHUNK', '500'))
+
+SERVICE_FIELDS = (
+    'id',
+    'owner_id',
+    'kind',
+    'title',
+    'description',
+    'city',
+    'state',
+    'price',
+    'currency',
+    'duration_days',
+    'amenities',
+    'latitude',
+    'longitude',
+    'created_in',
+)
+# Nota lida do agregado `service_ratings` (LEFT JOIN), nunca de AVG()
+RATING_FIELDS = {
+    'rating': 'rating_aggregate__average',
+    'rating_score': 'rating_aggregate__score',
+    'review_count': 'rating_aggregate__count',
+}
+
+
+def _json_default(value: Any) -> str:
+    # Mesmo formato de preço das respostas JSON (ServiceOut)
+    if isinstance(value, Decimal):
+        return fixed_price(value)
+    return str(value)
+
+
+def published_services(
+    kind: Optional[ServiceKind] = None, city: Optional[str] = None
+) -> QuerySet[Service]:
+    """Serviços publicados, com os filtros que têm índice próprio."""
+    query = Service.filter(published=True)
+    if kind is not None:
+        query = query.filter(kind=kind)
+    if city:
+        query = query.filter(city=city)
+    return query
+
+
+def _page_query(
+    query: QuerySet[Service], cursor: Optional[int], limit: int
+) -> QuerySet[Service]:
+    if cursor is not None:
+        query = query.filter(id__lt=cursor)
+    return query.order_by('-id').limit(limit)
+
+
+async def list_services(
+    cursor: Optional[int] = None,
+    limit: int = CATALOG_PAGE_SIZE,
+    kind: Optional[ServiceKind] = None,
+    city: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Uma página do catálogo e o cursor da próxima (None no fim)."""
+    limit = max(1, min(limit, CATALOG_MAX_PAGE_SIZE))
+
+    # Uma linha a mais indica se existe próxima página
+    rows = await _page_query(
+        published_services(kind, city), cursor, limit + 1
+    ).values(*SERVICE_FIELDS, **RATING_FIELDS)
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]['id']
+    return rows, None
+
+
+async def stream_services(
+    kind: Optional[ServiceKind] = None,
+    city: Optional[str] = None,
+    chunk_size: int = CATALOG_STREAM_CHUNK,
+) -> AsyncIterator[str]:
+    """
+    Catálogo inteiro em NDJSON (uma linha por serviço), lido em lotes por
+    keyset: a memória usada é a de um lote, não a do resultado.
+    """
+    cursor: Optional[int] = None
+    while True:
+        rows = await _page_query(
+            published_services(kind, city), cursor, chunk_size
+        ).values(*SERVICE_FIELDS, **RATING_FIELDS)
+        if not rows:
+            return
+
+        yield ''.join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + '\n'
+            for row in rows
+        )
+        if len(rows) < chunk_size:
+            return
+        cursor = rows[-1]['id']
+
+
+async def services_by_ids(ids: List[int]) -> List[Dict[str, Any]]:
+    """Serviços publicados na ordem dos ids pedidos (uma consulta IN)."""
+    if not ids:
+        return []
+    rows = await Service.filter(id__in=ids, published=True).values(
+        *SERVICE_FIELDS, **RATING_FIELDS
+    )
+    by_id = {row['id']: row for row in rows}
+    return [by_id[service_id] for service_id in ids if service_id in by_id]
+
+
+async def get_published_service(service_id: int) -> Optional[Dict[str, Any]]:
+    rows = await Service.filter(id=service_id, published=True).values(
+        *SERVICE_FIELDS, **RATING_FIELDS
+    )
+    return rows[0] if rows else None
+
+
+async def publish_service(owner_id: int, data: Dict[str, Any]) -> Service:
+    return await Service.create(owner_id=owner_id, **data)
@@ -0,0 +1,159 @@
+"""
+Comparação lado a lado de serviços (GET /service/compare).
+
+Os N serviços saem do banco numa única consulta `IN (...)`. As métricas
+viram uma matriz N x K e toda a pontuação é feita com NumPy em operações
+sobre a matriz inteira (sem laço por item):
+
+- price_per_day: preço / duração em dias (menor é melhor)
+- rating: nota média (maior é melhor)
+- distance_km: distância até (lat, lon), se informados (menor é melhor)
+- amenities: fração das comodidades do conjunto comparado que o serviço
+  oferece (maior é melhor)
+
+Cada coluna é normalizada para [0, 1] (min-max, 1 = melhor). Valores
+ausentes ficam neutros (0,5). Também é devolvida a matriz N x N de
+sobreposição de comodidades (Jaccard).
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.services_g_turismo.catalog import services_by_ids
+from src.services_g_turismo.geo import haversine_km
+
+COMPARE_MIN_ITEMS = 2
+COMPARE_MAX_ITEMS = 300
+
+# métrica -> (peso no total, maior é melhor)
+COMPARE_METRICS: Dict[str, Tuple[float, bool]] = {
+    'price_per_day': (0.35, False),
+    'rating': (0.30, True),
+    'distance_km': (0.20, False),
+    'amenities': (0.15, True),
+}
+NEUTRAL_SCORE = 0.5
+
+
+def parse_ids(raw: str) -> List[int]:
+    """'3,1,2' -> [3, 1, 2] (sem repetidos). Levanta ValueError."""
+    ids = list(dict.fromkeys(int(part) for part in raw.split(',') if part))
+    if not COMPARE_MIN_ITEMS <= len(ids) <= COMPARE_MAX_ITEMS:
+        raise ValueError('quantidade de ids fora do limite')
+    return ids
+
+
+def amenity_matrix(
+    amenities: Sequence[Optional[Sequence[str]]],
+) -> np.ndarray:
+    """Matriz booleana N x A (item oferece a comodidade a)."""
+    vocabulary: Dict[str, int] = {}
+    rows, columns = [], []
+    for row, items in enumerate(amenities):
+        for name in items or ():
+            rows.append(row)
+            columns.append(vocabulary.setdefault(name, len(vocabulary)))
+
+    matrix = np.zeros((len(amenities), len(vocabulary)), dtype=bool)
+    matrix[rows, columns] = True
+    return matrix
+
+
+def jaccard(matrix: np.ndarray) -> np.ndarray:
+    """Sobreposição N x N: |A ∩ B| / |A ∪ B| entre cada par de itens."""
+    as_int = matrix.astype(np.int32)
+    intersection = as_int @ as_int.T
+    sizes = as_int.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overlap = np.where(union > 0, intersection / union, 0.0)
+    return overlap
+
+
+def normalize(raw: np.ndarray, higher_is_better: np.ndarray) -> np.ndarray:
+    """Min-max por coluna para [0, 1], 1 = melhor; NaN vira neutro."""
+    missing = np.isnan(raw)
+    low = np.where(missing, np.inf, raw).min(axis=0)
+    high = np.where(missing, -np.inf, raw).max(axis=0)
+    span = high - low
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = np.where(span > 0, (raw - low) / span, 1.0)
+    scaled = np.where(higher_is_better, scaled, 1.0 - scaled)
+    # Coluna constante: todos empatados no melhor valor
+    scaled = np.where(span == 0, 1.0, scaled)
+    return np.where(missing, NEUTRAL_SCORE, scaled)
+
+
+def score_matrix(
+    rows: Sequence[Dict[str, Any]],
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Matriz de métricas, pontuação normalizada e sobreposição."""
+    count = len(rows)
+
+    def column(key: str) -> np.ndarray:
+        return np.array(
+            [np.nan if row.get(key) is None else row[key] for row in rows],
+            dtype=np.float64,
+        )
+
+    price = column('price')
+    duration = np.maximum(column('duration_days'), 1.0)
+    rating = column('rating')
+
+    if lat is not None and lon is not None:
+        distance = haversine_km(
+            lat, lon, column('latitude'), column('longitude')
+        )
+    else:
+        distance = np.full(count, np.nan)
+
+    offered = amenity_matrix([row.get('amenities') for row in rows])
+    vocabulary_size = offered.shape[1]
+    coverage = (
+        offered.sum(axis=1) / vocabulary_size
+        if vocabulary_size
+        else np.full(count, np.nan)
+    )
+
+    raw = np.column_stack([price / duration, rating, distance, coverage])
+
+    weights = np.array([w for w, _ in COMPARE_METRICS.values()])
+    higher_is_better = np.array([h for _, h in COMPARE_METRICS.values()])
+    scores = normalize(raw, higher_is_better)
+
+    return {
+        'metrics': list(COMPARE_METRICS),
+        'raw': np.where(np.isnan(raw), None, np.round(raw, 4)).tolist(),
+        'scores': np.round(scores, 4).tolist(),
+        'total': np.round(scores @ weights / weights.sum(), 4).tolist(),
+        'amenities_overlap': np.round(jaccard(offered), 4).tolist(),
+    }
+
+
+async def compare_services(
+    ids: List[int], lat: Optional[float] = None, lon: Optional[float] = None
+) -> Dict[str, Any]:
+    rows = await services_by_ids(ids)
+    found = {row['id'] for row in rows}
+    missing = [service_id for service_id in ids if service_id not in found]
+
+    if not rows:
+        empty: List[Any] = []
+        return {
+            'items': empty,
+            'metrics': list(COMPARE_METRICS),
+            'raw': empty,
+            'scores': empty,
+            'total': empty,
+            'amenities_overlap': empty,
+            'missing': missing,
+        }
+
+    return {
+        'items': rows,
+        'missing': missing,
+        **score_matrix(rows, lat, lon),
+    }
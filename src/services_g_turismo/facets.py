@@ -0,0 +1,418 @@
+"""
+Filtros por faceta com contagens pré-calculadas.
+
+Cada valor de faceta (tipo 'tour', faixa de preço '100-300', cidade
+'Recife'...) guarda um bitmap dos ids dos serviços publicados que o têm:
+um `int` do Python em que o bit N ligado significa "serviço N". Uma
+consulta faz OR dos valores escolhidos dentro de uma faceta, AND entre
+facetas, e as contagens saem de `int.bit_count()`. Nada de GROUP BY por
+requisição.
+
+As contagens de uma faceta consideram os filtros das *outras* facetas
+(facetas disjuntivas): marcar 'tour' não zera as contagens de 'lodging'.
+
+Atualização:
+- publicar/editar com `save()` atualiza o índice deste worker na hora
+  (sinais do Tortoise);
+- a cada FACETS_SYNC_INTERVAL segundos cada worker relê os serviços com
+  `updated_in` mais novo que a última sincronização (edições feitas em
+  outro worker ou com `QuerySet.update()`);
+- a cada FACETS_REBUILD_INTERVAL segundos o índice é reconstruído (pega
+  remoções físicas).
+
+A reconstrução monta um índice novo ao lado (ids por valor, convertidos
+em bitmap uma única vez) e o troca pelo atual sem `await` no meio: as
+consultas nunca veem um índice vazio ou pela metade. Edições que chegam
+durante a leitura são reaplicadas sobre o índice novo.
+"""
+import asyncio
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import (Any, AsyncIterator, Callable, Dict, Iterable, List,
+                    Mapping, Optional, Sequence, Tuple)
+
+import numpy as np
+from tortoise.signals import post_delete, post_save
+
+from src.global_utils.background import register_periodic_task
+from src.models.service import Service
+
+FACETS_SYNC_INTERVAL = float(os.getenv('FACETS_SYNC_INTERVAL', '10'))
+FACETS_REBUILD_INTERVAL = float(os.getenv('FACETS_REBUILD_INTERVAL', '900'))
+FACETS_LOAD_CHUNK = 5000
+
+FACET_FIELDS = (
+    'id',
+    'kind',
+    'price',
+    'duration_days',
+    'city',
+    'published',
+    'updated_in',
+)
+
+# Faixas: (rótulo, limite superior exclusivo); a última não tem limite
+PRICE_BANDS: Sequence[Tuple[str, Optional[Decimal]]] = (
+    ('0-100', Decimal('100')),
+    ('100-300', Decimal('300')),
+    ('300-1000', Decimal('1000')),
+    ('1000+', None),
+)
+DURATION_BANDS: Sequence[Tuple[str, Optional[int]]] = (
+    ('1', 2),
+    ('2-3', 4),
+    ('4-7', 8),
+    ('8+', None),
+)
+RATING_BANDS: Sequence[Tuple[str, Optional[float]]] = (
+    ('<3', 3.0),
+    ('3-4', 4.0),
+    ('4+', None),
+)
+NO_RATING = 'sem-avaliacao'
+
+
+def _band(value: Any, bands: Sequence[Tuple[str, Any]]) -> str:
+    for label, upper in bands:
+        if upper is None or value < upper:
+            return label
+    return bands[-1][0]
+
+
+def price_band(row: Mapping[str, Any]) -> str:
+    return _band(Decimal(str(row['price'])), PRICE_BANDS)
+
+
+def duration_band(row: Mapping[str, Any]) -> str:
+    return _band(int(row.get('duration_days') or 1), DURATION_BANDS)
+
+
+def rating_band(row: Mapping[str, Any]) -> str:
+    rating = row.get('rating')
+    return NO_RATING if rating is None else _band(rating, RATING_BANDS)
+
+
+def _kind(row: Mapping[str, Any]) -> str:
+    kind = row['kind']
+    return getattr(kind, 'value', kind)
+
+
+def ids_bitmap(ids: np.ndarray) -> int:
+    """ids -> `int` com o bit N ligado para o serviço N."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(ids):
+        return 0
+    packed = np.zeros(int(ids.max()) // 8 + 1, dtype=np.uint8)
+    bits = np.left_shift(1, ids & 7).astype(np.uint8)
+    np.bitwise_or.at(packed, ids >> 3, bits)
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+# faceta -> função que extrai o valor da faceta de uma linha
+FACETS: Dict[str, Callable[[Mapping[str, Any]], str]] = {
+    'kind': _kind,
+    'price': price_band,
+    'duration': duration_band,
+    'destination': lambda row: row['city'],
+    'rating': rating_band,
+}
+
+
+class FacetIndex:
+    """Bitmaps por valor de faceta, atualizados incrementalmente."""
+
+    def __init__(self, facets: Mapping[str, Callable] = FACETS) -> None:
+        self.facets = dict(facets)
+        self.bitmaps: Dict[str, Dict[str, int]] = {f: {} for f in facets}
+        self.all = 0
+        # id -> valores atuais (para desligar os bits antigos numa edição)
+        self._values: Dict[int, Dict[str, str]] = {}
+        # id -> nota média (alimentado pelas avaliações)
+        self.ratings: Dict[int, float] = {}
+        self.synced_until: Optional[datetime] = None
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+        # Edições recebidas durante uma reconstrução (reaplicadas no fim)
+        self._replay: Optional[List[Tuple[Callable, tuple]]] = None
+
+    # --- Atualização ---
+
+    def _record(self, func: Callable, *args: Any) -> None:
+        # Só as entradas públicas gravam, e gravam o helper privado: a
+        # reaplicação não grava de novo nem repete as chamadas internas
+        if self._replay is not None:
+            self._replay.append((func, args))
+
+    def remove(self, service_id: int) -> None:
+        self._record(self._remove, service_id)
+        self._remove(service_id)
+
+    def upsert(self, row: Mapping[str, Any]) -> None:
+        """Indexa (ou reindexa) um serviço; despublicados saem do índice."""
+        self._record(self._upsert, row)
+        self._upsert(row)
+
+    def set_rating(self, service_id: int, rating: Optional[float]) -> None:
+        """Atualiza só a faceta de nota de um serviço."""
+        self._record(self._set_rating, service_id, rating)
+        self._set_rating(service_id, rating)
+
+    def _remove(self, service_id: int) -> None:
+        values = self._values.pop(service_id, None)
+        if values is None:
+            return
+        bit = 1 << service_id
+        self.all &= ~bit
+        for facet, value in values.items():
+            bitmap = self.bitmaps[facet].get(value, 0) & ~bit
+            if bitmap:
+                self.bitmaps[facet][value] = bitmap
+            else:
+                del self.bitmaps[facet][value]
+
+    def _upsert(self, row: Mapping[str, Any]) -> None:
+        service_id = row['id']
+        self._remove(service_id)
+        if not row.get('published', True):
+            return
+
+        if 'rating' in row:
+            self._set_rating(service_id, row['rating'])
+        elif service_id in self.ratings:
+            row = {**row, 'rating': self.ratings[service_id]}
+
+        bit = 1 << service_id
+        values = {
+            facet: extract(row) for facet, extract in self.facets.items()
+        }
+        for facet, value in values.items():
+            self.bitmaps[facet][value] = (
+                self.bitmaps[facet].get(value, 0) | bit
+            )
+        self.all |= bit
+        self._values[service_id] = values
+
+    def _set_rating(self, service_id: int, rating: Optional[float]) -> None:
+        if rating is None:
+            self.ratings.pop(service_id, None)
+        else:
+            self.ratings[service_id] = rating
+
+        values = self._values.get(service_id)
+        if values is None:
+            return
+        bit = 1 << service_id
+        old = values['rating']
+        new = rating_band({'rating': rating})
+        if old == new:
+            return
+        bitmap = self.bitmaps['rating'].get(old, 0) & ~bit
+        if bitmap:
+            self.bitmaps['rating'][old] = bitmap
+        else:
+            self.bitmaps['rating'].pop(old, None)
+        self.bitmaps['rating'][new] = (
+            self.bitmaps['rating'].get(new, 0) | bit
+        )
+        values['rating'] = new
+
+    def clear(self) -> None:
+        self.bitmaps = {facet: {} for facet in self.facets}
+        self.all = 0
+        self._values.clear()
+
+    # --- Consulta ---
+
+    def _facet_filter(self, facet: str, values: Iterable[str]) -> int:
+        bitmaps = self.bitmaps.get(facet, {})
+        selected = 0
+        for value in values:
+            selected |= bitmaps.get(value, 0)
+        return selected
+
+    def query(
+        self,
+        filters: Mapping[str, Sequence[str]],
+        restrict: Optional[int] = None,
+    ) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """
+        Retorna (bitmap dos serviços que atendem a todos os filtros,
+        contagens por faceta/valor). `restrict` é um bitmap de serviços
+        vindo de fora (ex.: disponíveis nas datas) aplicado a tudo.
+        """
+        universe = self.all if restrict is None else self.all & restrict
+        active = {
+            facet: self._facet_filter(facet, values)
+            for facet, values in filters.items()
+            if values and facet in self.facets
+        }
+
+        matched = universe
+        for selected in active.values():
+            matched &= selected
+
+        counts: Dict[str, Dict[str, int]] = {}
+        for facet in self.facets:
+            # Base da faceta: todos os filtros menos o dela própria
+            base = universe
+            for other, selected in active.items():
+                if other != facet:
+                    base &= selected
+            counts[facet] = {
+                value: (bitmap & base).bit_count()
+                for value, bitmap in self.bitmaps[facet].items()
+                if bitmap & base
+            }
+
+        return matched, counts
+
+    @staticmethod
+    def page(
+        matched: int, limit: int, cursor: Optional[int] = None
+    ) -> Tuple[List[int], Optional[int]]:
+        """
+        Ids do bitmap em ordem decrescente (mais novos primeiro), a partir
+        do cursor (exclusivo). Retorna (ids, próximo cursor).
+        """
+        if cursor is not None:
+            matched &= (1 << max(cursor, 0)) - 1
+
+        ids: List[int] = []
+        while matched and len(ids) < limit:
+            top = matched.bit_length() - 1
+            ids.append(top)
+            matched ^= 1 << top
+
+        return ids, (ids[-1] if matched and ids else None)
+
+    # --- Carga a partir do banco ---
+
+    @staticmethod
+    async def _rows(query) -> AsyncIterator[List[Dict[str, Any]]]:
+        last_id = 0
+        while True:
+            rows = (
+                await query.filter(id__gt=last_id)
+                .order_by('id')
+                .limit(FACETS_LOAD_CHUNK)
+                .values(*FACET_FIELDS, rating='rating_aggregate__average')
+            )
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]['id']
+
+    def _advance(self, updated_in: datetime) -> None:
+        if self.synced_until is None or updated_in > self.synced_until:
+            self.synced_until = updated_in
+
+    async def _read(self, query) -> None:
+        """Aplica linha a linha (sincronização: poucas linhas)."""
+        async for rows in self._rows(query):
+            for row in rows:
+                self.upsert(row)
+                self._advance(row['updated_in'])
+
+    async def _load(self) -> None:
+        ids: Dict[str, Dict[str, List[int]]] = {f: {} for f in self.facets}
+        values_by_id: Dict[int, Dict[str, str]] = {}
+        ratings: Dict[int, float] = {}
+        synced_until: Optional[datetime] = None
+
+        async for rows in self._rows(Service.filter(published=True)):
+            for row in rows:
+                service_id = row['id']
+                if row['rating'] is not None:
+                    ratings[service_id] = row['rating']
+                values = {
+                    facet: extract(row)
+                    for facet, extract in self.facets.items()
+                }
+                values_by_id[service_id] = values
+                for facet, value in values.items():
+                    ids[facet].setdefault(value, []).append(service_id)
+                if synced_until is None or row['updated_in'] > synced_until:
+                    synced_until = row['updated_in']
+
+        # Cada bitmap é montado uma única vez (OR bit a bit copiaria o
+        # `int` inteiro a cada linha: carga quadrática)
+        bitmaps = {
+            facet: {
+                value: ids_bitmap(np.array(found, dtype=np.int64))
+                for value, found in by_value.items()
+            }
+            for facet, by_value in ids.items()
+        }
+        everything = ids_bitmap(
+            np.fromiter(values_by_id, np.int64, len(values_by_id))
+        )
+
+        # Troca sem `await` no meio: as consultas veem o índice antigo ou
+        # o novo, nunca um pela metade
+        replay, self._replay = self._replay or [], None
+        self.bitmaps = bitmaps
+        self.all = everything
+        self._values = values_by_id
+        self.ratings = ratings
+        self.synced_until = synced_until
+        for func, args in replay:
+            func(*args)
+
+    async def _rebuild(self) -> None:
+        # Chamado com `_load_lock`
+        self._replay = []
+        try:
+            await self._load()
+        finally:
+            self._replay = None
+        self.loaded = True
+
+    async def rebuild(self) -> None:
+        """Reconstrói o índice a partir dos serviços publicados."""
+        async with self._load_lock:
+            await self._rebuild()
+
+    async def ensure_loaded(self) -> None:
+        """Carga preguiçosa: o primeiro uso neste worker monta o índice."""
+        if self.loaded:
+            return
+        async with self._load_lock:
+            # Quem esperou a carga de outra requisição não carrega de novo
+            if not self.loaded:
+                await self._rebuild()
+
+    async def sync(self) -> None:
+        """Aplica as edições feitas desde a última sincronização."""
+        if not self.loaded:
+            return
+        async with self._load_lock:
+            query = Service.all()
+            if self.synced_until is not None:
+                # >=: edições no mesmo instante da última linha lida
+                query = query.filter(updated_in__gte=self.synced_until)
+            await self._read(query)
+
+
+FACET_INDEX = FacetIndex()
+
+
+@post_save(Service)
+async def _index_on_save(
+    sender, instance: Service, created, using_db, update_fields
+) -> None:
+    if FACET_INDEX.loaded:
+        FACET_INDEX.upsert(
+            {field: getattr(instance, field) for field in FACET_FIELDS}
+        )
+
+
+@post_delete(Service)
+async def _unindex_on_delete(sender, instance: Service, using_db) -> None:
+    FACET_INDEX.remove(instance.id)
+
+
+register_periodic_task('facets-sync', FACETS_SYNC_INTERVAL, FACET_INDEX.sync)
+register_periodic_task(
+    'facets-rebuild', FACETS_REBUILD_INTERVAL, FACET_INDEX.rebuild
+)
@@ -0,0 +1,176 @@
+"""
+Busca de serviços por proximidade ("perto de mim").
+
+Duas etapas:
+
+1. Pré-filtro pela caixa (bounding box) que contém o círculo de busca:
+   R*Tree `services_rtree` no SQLite, índice (latitude, longitude) no
+   MySQL. Só os candidatos dentro da caixa saem do banco.
+2. Distância exata (haversine) calculada com NumPy sobre todos os
+   candidatos de uma vez; filtra pelo raio e ordena do mais perto para o
+   mais longe.
+
+Sem raio informado, a busca começa em GEO_START_RADIUS_KM e dobra até
+achar `limit` serviços (k mais próximos) ou chegar a GEO_MAX_RADIUS_KM.
+Caixas que cruzam o antimeridiano (±180°) são cortadas na borda.
+"""
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tortoise import connections
+
+from src.database.router import choose_read_connection
+from src.models.service import Service, ServiceKind
+from src.services_g_turismo.catalog import (RATING_FIELDS,
+                                            SERVICE_FIELDS)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+GEO_START_RADIUS_KM = float(os.getenv('GEO_START_RADIUS_KM', '5'))
+GEO_MAX_RADIUS_KM = float(os.getenv('GEO_MAX_RADIUS_KM', '500'))
+GEO_MAX_RESULTS = 100
+
+SQLITE_BOX_SQL = """
+SELECT s.id, s.latitude, s.longitude
+FROM services_rtree r
+JOIN services s ON s.id = r.id
+WHERE r.max_lat >= ? AND r.min_lat <= ?
+    AND r.max_lon >= ? AND r.min_lon <= ?
+    AND s.published = 1
+"""
+
+MYSQL_BOX_SQL = """
+SELECT id, latitude, longitude
+FROM services
+WHERE latitude BETWEEN %s AND %s
+    AND longitude BETWEEN %s AND %s
+    AND published = 1
+"""
+
+Box = Tuple[float, float, float, float]
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Box:
+    """(min_lat, max_lat, min_lon, max_lon) que contém o círculo."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat = max(-90.0, lat - delta_lat)
+    max_lat = min(90.0, lat + delta_lat)
+
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6 or max_lat >= 90.0 or min_lat <= -90.0:
+        # Perto dos polos qualquer longitude pode estar no raio
+        return min_lat, max_lat, -180.0, 180.0
+
+    delta_lon = radius_km / (KM_PER_DEGREE * cos_lat)
+    return (
+        min_lat,
+        max_lat,
+        max(-180.0, lon - delta_lon),
+        min(180.0, lon + delta_lon),
+    )
+
+
+def haversine_km(
+    lat: float, lon: float, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """Distância em km de (lat, lon) até cada ponto (vetorizado)."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+async def _candidates(
+    box: Box, kind: Optional[ServiceKind]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ids, latitudes e longitudes dos serviços dentro da caixa."""
+    connection = connections.get(choose_read_connection())
+    mysql = connection.capabilities.dialect == 'mysql'
+
+    sql = MYSQL_BOX_SQL if mysql else SQLITE_BOX_SQL
+    params: List[Any] = list(box)
+    if kind is not None:
+        sql += ' AND kind = %s' if mysql else ' AND s.kind = ?'
+        params.append(kind.value)
+
+    rows = await connection.execute_query_dict(sql, params)
+
+    count = len(rows)
+    ids = np.fromiter((row['id'] for row in rows), np.int64, count)
+    lats = np.fromiter((row['latitude'] for row in rows), np.float64, count)
+    lons = np.fromiter((row['longitude'] for row in rows), np.float64, count)
+    return ids, lats, lons
+
+
+async def _within(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    limit: int,
+    kind: Optional[ServiceKind],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """ids e distâncias dos `limit` mais próximos dentro do raio."""
+    ids, lats, lons = await _candidates(
+        bounding_box(lat, lon, radius_km), kind
+    )
+    if not len(ids):
+        return ids, lats
+
+    distances = haversine_km(lat, lon, lats, lons)
+    inside = distances <= radius_km
+    ids, distances = ids[inside], distances[inside]
+
+    if len(ids) > limit:
+        # Seleção parcial O(n) antes de ordenar só os k escolhidos
+        nearest = np.argpartition(distances, limit - 1)[:limit]
+        ids, distances = ids[nearest], distances[nearest]
+
+    order = np.argsort(distances, kind='stable')
+    return ids[order], distances[order]
+
+
+async def services_near(
+    lat: float,
+    lon: float,
+    limit: int = 20,
+    radius_km: Optional[float] = None,
+    kind: Optional[ServiceKind] = None,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Serviços publicados mais próximos de (lat, lon), com `distance_km`.
+    Retorna também o raio efetivamente usado.
+    """
+    limit = max(1, min(limit, GEO_MAX_RESULTS))
+
+    if radius_km is not None:
+        radius = min(radius_km, GEO_MAX_RADIUS_KM)
+        ids, distances = await _within(lat, lon, radius, limit, kind)
+    else:
+        radius = GEO_START_RADIUS_KM
+        while True:
+            ids, distances = await _within(lat, lon, radius, limit, kind)
+            if len(ids) >= limit or radius >= GEO_MAX_RADIUS_KM:
+                break
+            radius = min(radius * 2, GEO_MAX_RADIUS_KM)
+
+    if not len(ids):
+        return [], radius
+
+    rows = await Service.filter(id__in=ids.tolist()).values(
+        *SERVICE_FIELDS, **RATING_FIELDS
+    )
+    by_id = {row['id']: row for row in rows}
+
+    results = []
+    for service_id, distance in zip(ids.tolist(), distances.tolist()):
+        row = by_id.get(service_id)
+        if row is not None:
+            results.append({**row, 'distance_km': round(distance, 3)})
+    return results, radius
@@ -1,12 +1,413 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from datetime import date, timedelta
+from typing import List, Optional
 
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from src.auth.exceptions import (ERROR_INVALID_COMPARE_IDS,
+                                 ERROR_INVALID_CURSOR,
+                                 ERROR_INVALID_DATE_RANGE,
+                                 ERROR_NOT_SERVICE_OWNER,
+                                 ERROR_RESERVATION_NOT_FOUND,
+                                 ERROR_REVIEW_CONFLICT,
+                                 ERROR_REVIEW_NOT_FOUND,
+                                 ERROR_SERVICE_NOT_FOUND, ERROR_SOLD_OUT)
 from src.auth.schemas import SystemUser
+from src.models.service import Service, ServiceKind
 from src.service.jwt.depends import get_current_user
+from src.services_g_turismo.activity import ACTIVITY
+from src.services_g_turismo.calendars import CALENDAR_MAX_DAYS, CALENDARS
+from src.services_g_turismo.catalog import (CATALOG_MAX_PAGE_SIZE,
+                                            CATALOG_PAGE_SIZE,
+                                            get_published_service,
+                                            list_services, publish_service,
+                                            services_by_ids, stream_services)
+from src.services_g_turismo.compare import compare_services, parse_ids
+from src.services_g_turismo.facets import FACET_INDEX
+from src.services_g_turismo.geo import GEO_MAX_RADIUS_KM, services_near
+from src.services_g_turismo.recommendations import (SIMILAR_MAX_RESULTS,
+                                                    SIMILAR_SERVICES)
+from src.services_g_turismo.reservations import (INVENTORY_MAX_DAYS,
+                                                  RESERVATION_MAX_DAYS,
+                                                  RESERVATIONS, days_between)
+from src.services_g_turismo.reviews import (REVIEW_PAGE_SIZE,
+                                             ReviewConflict, delete_review,
+                                             get_rating, list_reviews,
+                                             submit_review)
+from src.services_g_turismo.schemas import (CompareResult, DayAvailability,
+                                            FacetResult, InventoryUpdate,
+                                            NearResult, RatingSummary,
+                                            ReservationCreate, ReservationOut,
+                                            ReviewCreate, ReviewPage,
+                                            SearchPage, ServiceCreate,
+                                            ServiceOut, ServicePage,
+                                            SimilarResult)
+from src.services_g_turismo.search import (SEARCH_MAX_PAGE_SIZE,
+                                           SEARCH_PAGE_SIZE, search_services)
 
 router = APIRouter(tags=['services'])
 
 
-@router.get('/get_service')
-async def service(current_user: SystemUser = Depends(get_current_user)):
-    """service exibir todos os serviçoes de turismo publicados"""
-    pass
+def _check_range(start: date, end: date, max_days: int) -> None:
+    if not 0 < days_between(start, end) <= max_days:
+        raise ERROR_INVALID_DATE_RANGE
+
+
+@router.get('/get_service', response_model=ServicePage)
+async def service(
+    cursor: Optional[int] = Query(
+        default=None, description='`next_cursor` da página anterior'
+    ),
+    limit: int = Query(
+        default=CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE
+    ),
+    kind: Optional[ServiceKind] = None,
+    city: Optional[str] = None,
+    format: str = Query(default='json', pattern='^(json|ndjson)$'),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """
+    service exibir todos os serviçoes de turismo publicados
+
+    Paginação por cursor. Com `format=ndjson` o catálogo inteiro (com os
+    mesmos filtros) é enviado em streaming, uma linha JSON por serviço.
+    """
+    if format == 'ndjson':
+        return StreamingResponse(
+            stream_services(kind, city), media_type='application/x-ndjson'
+        )
+
+    items, next_cursor = await list_services(cursor, limit, kind, city)
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+@router.post(
+    '/publish', response_model=ServiceOut, status_code=status.HTTP_201_CREATED
+)
+async def publish(
+    target: ServiceCreate,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Publica um serviço no catálogo em nome do usuário autenticado"""
+    return await publish_service(current_user.id, target.model_dump())
+
+
+@router.get('/search', response_model=SearchPage)
+async def search(
+    q: str = Query(min_length=2, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """
+    Busca avançada de pacotes: título, descrição e destino, sem diferenciar
+    acentos, ordenada por relevância e com trecho destacado.
+    """
+    try:
+        items, next_cursor = await search_services(q, cursor, limit)
+    except ValueError:
+        raise ERROR_INVALID_CURSOR
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+@router.get('/near', response_model=NearResult)
+async def near(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    radius_km: Optional[float] = Query(
+        default=None,
+        gt=0,
+        le=GEO_MAX_RADIUS_KM,
+        description='Sem raio: os `limit` serviços mais próximos',
+    ),
+    limit: int = Query(default=20, ge=1, le=100),
+    kind: Optional[ServiceKind] = None,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Serviços perto de um ponto, do mais próximo para o mais distante"""
+    items, radius = await services_near(lat, lon, limit, radius_km, kind)
+    return {'items': items, 'radius_km': radius}
+
+
+@router.get('/facets', response_model=FacetResult)
+async def facets(
+    kind: List[str] = Query(default=[]),
+    price: List[str] = Query(default=[], description='ex.: 100-300'),
+    duration: List[str] = Query(default=[], description='ex.: 2-3'),
+    destination: List[str] = Query(default=[]),
+    rating: List[str] = Query(default=[], description='ex.: 4+'),
+    start: Optional[date] = Query(
+        default=None, description='Primeiro dia da viagem'
+    ),
+    end: Optional[date] = Query(
+        default=None, description='Dia da saída (exclusivo)'
+    ),
+    cursor: Optional[int] = None,
+    limit: int = Query(
+        default=CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE
+    ),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """
+    Filtros combinados (OR dentro de uma faceta, AND entre facetas) com a
+    contagem de serviços ao lado de cada opção. Com `start`/`end`, só
+    entram serviços com vaga em todos os dias da viagem.
+    """
+    await FACET_INDEX.ensure_loaded()
+
+    available = None
+    if start is not None or end is not None:
+        if start is None or end is None:
+            raise ERROR_INVALID_DATE_RANGE
+        _check_range(start, end, CALENDAR_MAX_DAYS)
+        await CALENDARS.ensure_loaded()
+        available = CALENDARS.available_bitmap(start, end)
+
+    matched, counts = FACET_INDEX.query(
+        {
+            'kind': kind,
+            'price': price,
+            'duration': duration,
+            'destination': destination,
+            'rating': rating,
+        },
+        restrict=available,
+    )
+    ids, next_cursor = FACET_INDEX.page(matched, limit, cursor)
+    return {
+        'total': matched.bit_count(),
+        'counts': counts,
+        'items': await services_by_ids(ids),
+        'next_cursor': next_cursor,
+    }
+
+
+@router.get('/compare', response_model=CompareResult)
+async def compare(
+    ids: str = Query(description='ids separados por vírgula (2 a 300)'),
+    lat: Optional[float] = Query(default=None, ge=-90, le=90),
+    lon: Optional[float] = Query(default=None, ge=-180, le=180),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """
+    Compara serviços lado a lado: preço por dia, nota, distância (com
+    lat/lon) e comodidades, com uma pontuação normalizada por métrica.
+    """
+    try:
+        service_ids = parse_ids(ids)
+    except ValueError:
+        raise ERROR_INVALID_COMPARE_IDS
+    return await compare_services(service_ids, lat, lon)
+
+
+@router.post(
+    '/{service_id:int}/reviews',
+    response_model=RatingSummary,
+    status_code=status.HTTP_201_CREATED,
+)
+async def review_service(
+    service_id: int,
+    target: ReviewCreate,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Avalia o serviço (ou substitui a avaliação anterior do usuário)"""
+    if await get_published_service(service_id) is None:
+        raise ERROR_SERVICE_NOT_FOUND
+    try:
+        await submit_review(
+            service_id, current_user.id, target.stars, target.comment
+        )
+    except ReviewConflict:
+        raise ERROR_REVIEW_CONFLICT
+    return await get_rating(service_id)
+
+
+@router.delete(
+    '/{service_id:int}/reviews', status_code=status.HTTP_204_NO_CONTENT
+)
+async def remove_review(
+    service_id: int,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Remove a avaliação do usuário autenticado"""
+    if not await delete_review(service_id, current_user.id):
+        raise ERROR_REVIEW_NOT_FOUND
+
+
+@router.get('/{service_id:int}/reviews', response_model=ReviewPage)
+async def service_reviews(
+    service_id: int,
+    cursor: Optional[int] = None,
+    limit: int = Query(default=REVIEW_PAGE_SIZE, ge=1, le=100),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Avaliações do serviço, das mais novas para as mais antigas"""
+    items, next_cursor = await list_reviews(service_id, cursor, limit)
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+@router.get('/{service_id:int}/rating', response_model=RatingSummary)
+async def service_rating(
+    service_id: int,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Nota e distribuição de estrelas (lidas do agregado)"""
+    return await get_rating(service_id)
+
+
+@router.put(
+    '/{service_id:int}/inventory', response_model=List[DayAvailability]
+)
+async def update_inventory(
+    service_id: int,
+    target: InventoryUpdate,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Define as vagas por dia de um serviço (apenas o dono)"""
+    _check_range(target.start, target.end, INVENTORY_MAX_DAYS)
+    if not await Service.filter(
+        id=service_id, owner_id=current_user.id
+    ).exists():
+        raise ERROR_NOT_SERVICE_OWNER
+    await RESERVATIONS.set_capacity(
+        service_id, target.start, target.end, target.capacity
+    )
+    return await RESERVATIONS.availability(
+        service_id, target.start, target.end
+    )
+
+
+@router.get(
+    '/{service_id:int}/availability', response_model=List[DayAvailability]
+)
+async def service_availability(
+    service_id: int,
+    start: date,
+    end: Optional[date] = None,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Vagas restantes por dia (padrão: 30 dias a partir de `start`)"""
+    end = end or start + timedelta(days=30)
+    _check_range(start, end, INVENTORY_MAX_DAYS)
+    return await RESERVATIONS.availability(service_id, start, end)
+
+
+@router.post(
+    '/{service_id:int}/reservations',
+    response_model=ReservationOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def reserve(
+    service_id: int,
+    target: ReservationCreate,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """
+    Retém as vagas (sem overbooking, mesmo com milhares de pedidos
+    simultâneos). Confirme com o token antes de `expires_in`.
+    """
+    _check_range(target.start, target.end, RESERVATION_MAX_DAYS)
+    reservation = await RESERVATIONS.reserve(
+        service_id,
+        current_user.id,
+        target.start,
+        target.end,
+        target.quantity,
+    )
+    if reservation is None:
+        raise ERROR_SOLD_OUT
+    return reservation
+
+
+@router.get('/reservations/{token}', response_model=ReservationOut)
+async def reservation_detail(
+    token: str,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Situação de uma reserva do usuário"""
+    reservation = await RESERVATIONS.get(token, current_user.id)
+    if reservation is None:
+        raise ERROR_RESERVATION_NOT_FOUND
+    return reservation
+
+
+@router.post('/reservations/{token}/confirm', response_model=ReservationOut)
+async def confirm_reservation(
+    token: str,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Confirma uma reserva retida que ainda não expirou"""
+    if not await RESERVATIONS.confirm(token, current_user.id):
+        raise ERROR_RESERVATION_NOT_FOUND
+    return await RESERVATIONS.get(token, current_user.id)
+
+
+@router.delete(
+    '/reservations/{token}', status_code=status.HTTP_204_NO_CONTENT
+)
+async def cancel_reservation(
+    token: str,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Cancela a reserva e devolve as vagas ao estoque"""
+    if not await RESERVATIONS.cancel(token, current_user.id):
+        raise ERROR_RESERVATION_NOT_FOUND
+
+
+@router.get('/{service_id:int}/similar', response_model=SimilarResult)
+async def similar_services(
+    service_id: int,
+    limit: int = Query(default=10, ge=1, le=SIMILAR_MAX_RESULTS),
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """
+    Serviços parecidos (quem se interessou por este também se interessou
+    por...), lidos do modelo gerado em lote e mapeado em memória.
+    """
+    similar = dict(SIMILAR_SERVICES.similar(service_id, limit))
+    items = await services_by_ids(list(similar))
+    return {
+        'items': [
+            {**item, 'similarity': similar[item['id']]} for item in items
+        ],
+        'model_built_in': SIMILAR_SERVICES.built_at,
+    }
+
+
+@router.put(
+    '/{service_id:int}/favorite', status_code=status.HTTP_204_NO_CONTENT
+)
+async def favorite_service(
+    service_id: int,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Marca o serviço como favorito (gravado em lote, em background)"""
+    if await get_published_service(service_id) is None:
+        raise ERROR_SERVICE_NOT_FOUND
+    ACTIVITY.set_favorite(current_user.id, service_id, True)
+
+
+@router.delete(
+    '/{service_id:int}/favorite', status_code=status.HTTP_204_NO_CONTENT
+)
+async def unfavorite_service(
+    service_id: int,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Desmarca o favorito (gravado em lote, em background)"""
+    ACTIVITY.set_favorite(current_user.id, service_id, False)
+
+
+# O conversor `:int` evita que '/{id}' capture rotas como '/search'
+@router.get('/{service_id:int}', response_model=ServiceOut)
+async def service_detail(
+    service_id: int,
+    current_user: SystemUser = Depends(get_current_user),
+):
+    """Detalhe de um serviço publicado"""
+    found = await get_published_service(service_id)
+    if found is None:
+        raise ERROR_SERVICE_NOT_FOUND
+    # Só anota no buffer; o histórico é gravado em lote
+    ACTIVITY.record_view(current_user.id, service_id)
+    return found
@@ -0,0 +1,245 @@
+"""
+Job em lote do modelo de serviços parecidos (apenas CPU).
+
+1. Lê as interações (usuário, serviço, peso) de cada fonte em
+   INTERACTION_SOURCES, em lotes por keyset.
+2. Monta a matriz esparsa usuários x serviços (SciPy CSR); interações
+   repetidas somam e passam por log1p (mil visualizações não valem mil
+   avaliações).
+3. Similaridade de cosseno item-item: colunas normalizadas (L2) e
+   produto Xᵀ·X em blocos de linhas, mantendo só os k vizinhos mais
+   parecidos de cada serviço (argpartition).
+4. Grava o arquivo lido via mmap pelos workers
+   (src/services_g_turismo/recommendations.py).
+
+    python -m src.services_g_turismo.recommendation_build
+    python -m src.services_g_turismo.recommendation_build --k 30 --output m.bin
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import (Any, AsyncIterator, Callable, Dict, List, Optional,
+                    Sequence, Tuple)
+
+import numpy as np
+import scipy.sparse as sp
+from tortoise import Tortoise
+
+from src.global_utils.logs import LOGGER
+from src.models.activity import Favorite, ServiceView
+from src.models.reservation import Reservation, ReservationStatus
+from src.models.review import Review
+from src.services_g_turismo.recommendations import (RECOMMENDATIONS_PATH,
+                                                    write_model)
+
+SIMILAR_TOP_K = 50
+SIMILARITY_BLOCK = 512
+INTERACTIONS_CHUNK = 20000
+
+# (usuários, serviços, pesos) de um lote
+Interactions = Tuple[np.ndarray, np.ndarray, np.ndarray]
+InteractionSource = Callable[[], AsyncIterator[Interactions]]
+
+# Avaliações ruins não indicam interesse parecido
+REVIEW_WEIGHTS = {1: 0.0, 2: 0.0, 3: 0.5, 4: 1.0, 5: 1.5}
+RESERVATION_WEIGHT = 2.0
+FAVORITE_WEIGHT = 1.5
+VIEW_WEIGHT = 0.25   # por visualização (log1p achata as repetidas)
+
+
+async def _keyset(
+    query, fields: Sequence[str], chunk: int = INTERACTIONS_CHUNK
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    last_id = 0
+    while True:
+        rows = (
+            await query.filter(id__gt=last_id)
+            .order_by('id')
+            .limit(chunk)
+            .values('id', *fields)
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]['id']
+
+
+def _arrays(rows: List[Dict[str, Any]], weights: np.ndarray) -> Interactions:
+    count = len(rows)
+    return (
+        np.fromiter((row['user_id'] for row in rows), np.int64, count),
+        np.fromiter((row['service_id'] for row in rows), np.int64, count),
+        weights,
+    )
+
+
+async def review_interactions() -> AsyncIterator[Interactions]:
+    async for rows in _keyset(
+        Review.filter(stars__gte=3), ('user_id', 'service_id', 'stars')
+    ):
+        weights = np.array(
+            [REVIEW_WEIGHTS[row['stars']] for row in rows], np.float32
+        )
+        yield _arrays(rows, weights)
+
+
+async def reservation_interactions() -> AsyncIterator[Interactions]:
+    async for rows in _keyset(
+        Reservation.filter(status=ReservationStatus.CONFIRMED),
+        ('user_id', 'service_id'),
+    ):
+        weights = np.full(len(rows), RESERVATION_WEIGHT, np.float32)
+        yield _arrays(rows, weights)
+
+
+async def favorite_interactions() -> AsyncIterator[Interactions]:
+    async for rows in _keyset(Favorite.all(), ('user_id', 'service_id')):
+        weights = np.full(len(rows), FAVORITE_WEIGHT, np.float32)
+        yield _arrays(rows, weights)
+
+
+async def view_interactions() -> AsyncIterator[Interactions]:
+    async for rows in _keyset(
+        ServiceView.all(), ('user_id', 'service_id', 'views')
+    ):
+        views = np.fromiter(
+            (row['views'] for row in rows), np.float32, len(rows)
+        )
+        yield _arrays(rows, views * VIEW_WEIGHT)
+
+
+INTERACTION_SOURCES: Dict[str, InteractionSource] = {
+    'reviews': review_interactions,
+    'reservations': reservation_interactions,
+    'favorites': favorite_interactions,
+    'views': view_interactions,
+}
+
+
+async def collect_interactions() -> Interactions:
+    users, services, weights = [], [], []
+    for name, source in INTERACTION_SOURCES.items():
+        count = 0
+        async for batch_users, batch_services, batch_weights in source():
+            users.append(batch_users)
+            services.append(batch_services)
+            weights.append(batch_weights)
+            count += len(batch_users)
+        LOGGER.info(f'[OK] Interações de {name}: {count}.')
+
+    if not users:
+        empty = np.zeros(0, np.int64)
+        return empty, empty, np.zeros(0, np.float32)
+    return (
+        np.concatenate(users),
+        np.concatenate(services),
+        np.concatenate(weights),
+    )
+
+
+def interaction_matrix(
+    users: np.ndarray, services: np.ndarray, weights: np.ndarray
+) -> Tuple[sp.csr_matrix, np.ndarray]:
+    """Matriz usuários x serviços e os ids dos serviços (colunas)."""
+    user_ids, rows = np.unique(users, return_inverse=True)
+    item_ids, columns = np.unique(services, return_inverse=True)
+    matrix = sp.coo_matrix(
+        (weights.astype(np.float32), (rows, columns)),
+        shape=(len(user_ids), len(item_ids)),
+    ).tocsr()   # soma as interações repetidas
+    matrix.eliminate_zeros()
+    matrix.data = np.log1p(matrix.data)
+    return matrix, item_ids
+
+
+def top_k_similar(
+    matrix: sp.csr_matrix,
+    item_ids: np.ndarray,
+    k: int = SIMILAR_TOP_K,
+    block: int = SIMILARITY_BLOCK,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Os k serviços mais parecidos com cada serviço (cosseno). Retorna
+    (neighbors n x k com ids, -1 = vazio; scores n x k).
+    """
+    count = matrix.shape[1]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    normalized = (matrix @ sp.diags(1.0 / norms)).tocsc()
+    transposed = normalized.T.tocsr()
+
+    neighbors = np.full((count, k), -1, dtype=np.int32)
+    scores = np.zeros((count, k), dtype=np.float32)
+
+    for first in range(0, count, block):
+        # Similaridades de `block` serviços contra todos (esparso)
+        similarities = (transposed[first : first + block] @ normalized).tocsr()
+        for row in range(similarities.shape[0]):
+            item = first + row
+            start, stop = similarities.indptr[row : row + 2]
+            columns = similarities.indices[start:stop]
+            values = similarities.data[start:stop]
+
+            keep = columns != item
+            columns, values = columns[keep], values[keep]
+            if len(values) > k:
+                top = np.argpartition(-values, k - 1)[:k]
+                columns, values = columns[top], values[top]
+
+            order = np.argsort(-values, kind='stable')
+            neighbors[item, : len(order)] = item_ids[columns[order]]
+            scores[item, : len(order)] = values[order]
+
+    return neighbors, scores
+
+
+async def build_model(
+    path: str = RECOMMENDATIONS_PATH, k: int = SIMILAR_TOP_K
+) -> Dict[str, float]:
+    start = time.perf_counter()
+    users, services, weights = await collect_interactions()
+    loaded = time.perf_counter()
+
+    matrix, item_ids = interaction_matrix(users, services, weights)
+    neighbors, scores = top_k_similar(matrix, item_ids, k)
+    computed = time.perf_counter()
+
+    size = write_model(path, item_ids, neighbors, scores)
+    return {
+        'interactions': len(users),
+        'users': matrix.shape[0],
+        'items': len(item_ids),
+        'bytes': size,
+        'read_seconds': loaded - start,
+        'compute_seconds': computed - loaded,
+        'total_seconds': time.perf_counter() - start,
+    }
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from src.database.init_database import get_tortoise_config
+
+    await Tortoise.init(config=get_tortoise_config())
+    try:
+        stats = await build_model(args.output, args.k)
+    finally:
+        await Tortoise.close_connections()
+
+    print(
+        f'[OK] Modelo de recomendações gravado em {args.output}: '
+        f'{stats["items"]} serviços, {stats["users"]} usuários, '
+        f'{stats["interactions"]} interações, {stats["bytes"]} bytes, '
+        f'{stats["total_seconds"]:.1f}s'
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--k', type=int, default=SIMILAR_TOP_K)
+    parser.add_argument('--output', default=RECOMMENDATIONS_PATH)
+    asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,165 @@
+"""
+Serviços parecidos ("quem se interessou por este também viu...").
+
+O modelo é gerado em lote por `src/services_g_turismo/recommendation_build.py`
+(similaridade de cosseno item-item) e gravado num arquivo binário que os
+workers abrem com `mmap`: as páginas ficam no cache do sistema e são
+compartilhadas por todos os processos do uvicorn, sem cópia por worker.
+
+Formato (little-endian):
+
+    cabeçalho   MAGIC (8 bytes), k (uint32), n (uint32), gerado em (float64)
+    item_ids    n x int64, em ordem crescente (busca binária)
+    neighbors   n x k int32, ids dos vizinhos (-1 = vazio)
+    scores      n x k float32, similaridade de cada vizinho
+
+Uma consulta é uma busca binária em `item_ids` e a leitura de uma linha:
+microssegundos. O arquivo novo é gravado ao lado e trocado com
+`os.replace`; cada worker percebe a troca (inode/mtime) e reabre.
+"""
+import mmap
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+
+RECOMMENDATIONS_PATH = os.getenv(
+    'RECOMMENDATIONS_PATH', 'similar_services.bin'
+)
+RECOMMENDATIONS_RELOAD_INTERVAL = float(
+    os.getenv('RECOMMENDATIONS_RELOAD_INTERVAL', '60')
+)
+SIMILAR_MAX_RESULTS = 50
+
+MAGIC = b'GTSIM\x00\x00\x01'
+HEADER = struct.Struct('<8sIId')
+
+# (item_ids, neighbors, scores)
+ModelArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def write_model(
+    path: str,
+    item_ids: np.ndarray,
+    neighbors: np.ndarray,
+    scores: np.ndarray,
+) -> int:
+    """Grava o modelo (troca atômica do arquivo). Retorna o tamanho."""
+    count, k = neighbors.shape
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as target:
+        target.write(HEADER.pack(MAGIC, k, count, time.time()))
+        target.write(np.ascontiguousarray(item_ids, dtype='<i8').tobytes())
+        target.write(np.ascontiguousarray(neighbors, dtype='<i4').tobytes())
+        target.write(np.ascontiguousarray(scores, dtype='<f4').tobytes())
+        target.flush()
+        os.fsync(target.fileno())
+    os.replace(temporary, path)
+    return os.path.getsize(path)
+
+
+class SimilarityModel:
+    """Leitor do modelo mapeado em memória (somente leitura)."""
+
+    def __init__(self, path: str = RECOMMENDATIONS_PATH) -> None:
+        self.path = path
+        self.built_at: Optional[datetime] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        # Trocados juntos numa única atribuição
+        self._arrays: Optional[ModelArrays] = None
+        self._missing_logged = False
+
+    def load(self) -> bool:
+        """(Re)abre o arquivo se ele mudou. False se não houver modelo."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if not self._missing_logged:
+                LOGGER.warning(
+                    f'[FAIL] Modelo de recomendações {self.path} não '
+                    'encontrado; gere com recommendation_build.'
+                )
+                self._missing_logged = True
+            return False
+
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return True
+
+        try:
+            arrays, built_at = self._map(self.path)
+        except (OSError, ValueError, struct.error) as e:
+            LOGGER.error(f'[FAIL] Modelo de recomendações inválido: {e}')
+            return self._arrays is not None
+
+        # O mmap anterior é liberado quando ninguém mais usa seus arrays
+        self._arrays = arrays
+        self._stamp = stamp
+        self.built_at = datetime.fromtimestamp(built_at, timezone.utc)
+        self._missing_logged = False
+        LOGGER.info(
+            f'[OK] Modelo de recomendações carregado: {len(arrays[0])} itens.'
+        )
+        return True
+
+    @staticmethod
+    def _map(path: str) -> Tuple[ModelArrays, float]:
+        with open(path, 'rb') as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, k, count, built_at = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f'{path} não é um modelo de recomendações')
+
+        offset = HEADER.size
+        item_ids = np.frombuffer(mapped, '<i8', count, offset)
+        offset += item_ids.nbytes
+        neighbors = np.frombuffer(mapped, '<i4', count * k, offset)
+        offset += neighbors.nbytes
+        scores = np.frombuffer(mapped, '<f4', count * k, offset)
+        return (
+            (item_ids, neighbors.reshape(count, k), scores.reshape(count, k)),
+            built_at,
+        )
+
+    def similar(
+        self, service_id: int, limit: int = 10
+    ) -> List[Tuple[int, float]]:
+        """[(id do serviço parecido, similaridade)], do mais parecido."""
+        arrays = self._arrays
+        if arrays is None:
+            if not self.load():
+                return []
+            arrays = self._arrays
+        item_ids, neighbors, scores = arrays
+
+        position = int(np.searchsorted(item_ids, service_id))
+        if position >= len(item_ids) or item_ids[position] != service_id:
+            return []
+
+        found = neighbors[position, :limit]
+        valid = found >= 0
+        return list(
+            zip(
+                found[valid].tolist(),
+                scores[position, :limit][valid].tolist(),
+            )
+        )
+
+    async def reload(self) -> None:
+        self.load()
+
+
+SIMILAR_SERVICES = SimilarityModel()
+
+register_periodic_task(
+    'recommendations-reload',
+    RECOMMENDATIONS_RELOAD_INTERVAL,
+    SIMILAR_SERVICES.reload,
+)
@@ -0,0 +1,286 @@
+"""
+Inventário por dia e reservas sem overbooking.
+
+Reservar é um UPDATE condicional (compare-and-swap) sobre a faixa de dias:
+
+    UPDATE service_inventory SET remaining = remaining - n
+    WHERE service_id = ? AND day >= ? AND day < ? AND remaining >= n
+
+Se o número de linhas alteradas for menor que o número de dias, algum dia
+não tinha vaga (ou não tem inventário) e a transação é desfeita. Nada é
+lido antes de gravar, então duas requisições simultâneas nunca vendem a
+mesma vaga; e não há LOCK TABLES: só as linhas dos dias pedidos são
+travadas pelo próprio UPDATE.
+
+A reserva nasce retida (HELD) por RESERVATION_HOLD_TTL segundos. Confirmar
+e expirar também são UPDATEs condicionais no status (só um dos dois
+vence), e só quem vence devolve as vagas ao estoque. Uma tarefa periódica
+expira as retenções vencidas.
+"""
+import os
+import secrets
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tortoise import BaseDBAsyncClient
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+from src.models.reservation import Inventory, Reservation, ReservationStatus
+
+RESERVATION_HOLD_TTL = int(os.getenv('RESERVATION_HOLD_TTL', '600'))
+RESERVATION_SWEEP_INTERVAL = float(
+    os.getenv('RESERVATION_SWEEP_INTERVAL', '30')
+)
+RESERVATION_SWEEP_BATCH = 500
+RESERVATION_MAX_DAYS = 60
+INVENTORY_MAX_DAYS = 366
+
+RESERVATION_FIELDS = (
+    'token',
+    'service_id',
+    'user_id',
+    'start_day',
+    'end_day',
+    'quantity',
+    'status',
+    'expires_in',
+)
+
+
+# (service_id, início, fim exclusivo) dos dias cujo estoque mudou
+ChangeListener = Callable[[int, date, date], Awaitable[None]]
+
+
+class SoldOut(Exception):
+    """Algum dia da faixa pedida não tem vagas suficientes."""
+
+
+def days_between(start: date, end: date) -> int:
+    return (end - start).days
+
+
+class ReservationEngine:
+    """
+    ReservationEngine: Inventário por dia e reservas com retenção (TTL),
+    usando apenas UPDATEs condicionais.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: List[ChangeListener] = []
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def on_change(self, listener: ChangeListener) -> ChangeListener:
+        """Registra quem precisa saber das mudanças de estoque."""
+        self._listeners.append(listener)
+        return listener
+
+    async def _notify(self, service_id: int, start: date, end: date) -> None:
+        # Depois do commit: uma falha aqui não desfaz a reserva
+        for listener in self._listeners:
+            try:
+                await listener(service_id, start, end)
+            except Exception as e:
+                LOGGER.error(f'[FAIL] Aviso de mudança de estoque: {e}')
+
+    # --- Inventário ---
+
+    async def set_capacity(
+        self, service_id: int, start: date, end: date, capacity: int
+    ) -> int:
+        """
+        Define a capacidade diária de `start` até `end` (exclusivo). Nos
+        dias que já existem, a diferença é somada ao que resta, sem deixar
+        o restante negativo (dias com mais vagas vendidas que a nova
+        capacidade ficam como estão). Retorna quantos dias foram gravados.
+        """
+        days = [
+            start + timedelta(days=i) for i in range(days_between(start, end))
+        ]
+        if not days:
+            return 0
+
+        # Dias novos; os existentes são ignorados e ajustados abaixo
+        await Inventory.bulk_create(
+            [
+                Inventory(
+                    service_id=service_id,
+                    day=day,
+                    capacity=capacity,
+                    remaining=capacity,
+                )
+                for day in days
+            ],
+            ignore_conflicts=True,
+        )
+        # `remaining` antes de `capacity`: o MySQL aplica o SET da esquerda
+        # para a direita e a diferença usa a capacidade antiga
+        updated = await Inventory.filter(
+            service_id=service_id,
+            day__gte=start,
+            day__lt=end,
+            remaining__gte=F('capacity') - capacity,
+        ).update(
+            remaining=F('remaining') + capacity - F('capacity'),
+            capacity=capacity,
+        )
+        await self._notify(service_id, start, end)
+        return updated
+
+    async def availability(
+        self, service_id: int, start: date, end: date
+    ) -> List[Dict[str, Any]]:
+        return (
+            await Inventory.filter(
+                service_id=service_id, day__gte=start, day__lt=end
+            )
+            .order_by('day')
+            .values('day', 'capacity', 'remaining')
+        )
+
+    @staticmethod
+    async def _restock(
+        connection: BaseDBAsyncClient, reservation: Dict[str, Any]
+    ) -> None:
+        await Inventory.filter(
+            service_id=reservation['service_id'],
+            day__gte=reservation['start_day'],
+            day__lt=reservation['end_day'],
+        ).using_db(connection).update(
+            remaining=F('remaining') + reservation['quantity']
+        )
+
+    # --- Reservas ---
+
+    async def reserve(
+        self,
+        service_id: int,
+        user_id: int,
+        start: date,
+        end: date,
+        quantity: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retém `quantity` vagas em cada dia da faixa. Retorna a reserva
+        (com o token e o vencimento da retenção) ou None se esgotado.
+        """
+        days = days_between(start, end)
+        values = {
+            'token': secrets.token_urlsafe(24),
+            'service_id': service_id,
+            'user_id': user_id,
+            'start_day': start,
+            'end_day': end,
+            'quantity': quantity,
+            'status': ReservationStatus.HELD,
+            'expires_in': self._now()
+            + timedelta(seconds=RESERVATION_HOLD_TTL),
+        }
+        try:
+            async with in_transaction('default') as connection:
+                taken = await Inventory.filter(
+                    service_id=service_id,
+                    day__gte=start,
+                    day__lt=end,
+                    remaining__gte=quantity,
+                ).using_db(connection).update(
+                    remaining=F('remaining') - quantity
+                )
+                if taken != days:
+                    raise SoldOut()   # desfaz os dias já descontados
+                await Reservation.create(using_db=connection, **values)
+        except SoldOut:
+            return None
+
+        await self._notify(service_id, start, end)
+        return values
+
+    async def confirm(self, token: str, user_id: int) -> bool:
+        """Confirma uma retenção ainda válida do usuário."""
+        return bool(
+            await Reservation.filter(
+                token=token,
+                user_id=user_id,
+                status=ReservationStatus.HELD,
+                expires_in__gt=self._now(),
+            ).update(status=ReservationStatus.CONFIRMED, expires_in=None)
+        )
+
+    async def _close(
+        self, reservation: Dict[str, Any], status: ReservationStatus, **where
+    ) -> bool:
+        """Troca o status (CAS) e, se venceu a troca, devolve as vagas."""
+        async with in_transaction('default') as connection:
+            closed = await Reservation.filter(
+                token=reservation['token'], **where
+            ).using_db(connection).update(status=status, expires_in=None)
+            if closed:
+                await self._restock(connection, reservation)
+
+        if closed:
+            await self._notify(
+                reservation['service_id'],
+                reservation['start_day'],
+                reservation['end_day'],
+            )
+        return bool(closed)
+
+    async def cancel(self, token: str, user_id: int) -> bool:
+        """Cancela (retida ou confirmada) e devolve as vagas."""
+        reservation = await Reservation.filter(
+            token=token, user_id=user_id
+        ).values(*RESERVATION_FIELDS)
+        if not reservation:
+            return False
+        return await self._close(
+            reservation[0],
+            ReservationStatus.RELEASED,
+            status__in=[ReservationStatus.HELD, ReservationStatus.CONFIRMED],
+        )
+
+    async def get(self, token: str, user_id: int) -> Optional[Dict[str, Any]]:
+        rows = await Reservation.filter(token=token, user_id=user_id).values(
+            *RESERVATION_FIELDS
+        )
+        return rows[0] if rows else None
+
+    async def sweep(self) -> int:
+        """Expira as retenções vencidas e devolve as vagas ao estoque."""
+        expired = 0
+        while True:
+            now = self._now()
+            due = (
+                await Reservation.filter(
+                    status=ReservationStatus.HELD, expires_in__lte=now
+                )
+                .limit(RESERVATION_SWEEP_BATCH)
+                .values(*RESERVATION_FIELDS)
+            )
+            for reservation in due:
+                # Uma confirmação simultânea vence o CAS e a vaga fica
+                expired += await self._close(
+                    reservation,
+                    ReservationStatus.EXPIRED,
+                    status=ReservationStatus.HELD,
+                    expires_in__lte=now,
+                )
+            if len(due) < RESERVATION_SWEEP_BATCH:
+                break
+
+        if expired:
+            LOGGER.info(
+                f'[OK] {expired} reservas expiradas; vagas devolvidas.'
+            )
+        return expired
+
+
+RESERVATIONS = ReservationEngine()
+
+register_periodic_task(
+    'sweep-reservations', RESERVATION_SWEEP_INTERVAL, RESERVATIONS.sweep
+)
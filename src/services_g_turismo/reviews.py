@@ -0,0 +1,321 @@
+"""
+Avaliações de viajantes e o agregado por serviço (`service_ratings`).
+
+Cada avaliação criada, editada ou removida ajusta o agregado na mesma
+transação, com `UPDATE ... SET count = count + 1, ...` (expressões F):
+não há leitura-e-gravação do agregado em Python, e a listagem lê nota e
+contagem prontas, sem AVG() sobre `reviews`.
+
+A nota bayesiana (`score`) puxa serviços com poucas avaliações para a
+média a priori:
+
+    score = (C * m + soma das estrelas) / (C + quantidade)
+
+com m = REVIEW_PRIOR_MEAN e C = REVIEW_PRIOR_WEIGHT.
+
+Uma tarefa periódica recalcula o agregado a partir de `reviews`, em lotes
+de serviços, e corrige (e registra no log) qualquer divergência.
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from tortoise import BaseDBAsyncClient
+from tortoise.exceptions import IntegrityError, OperationalError
+from tortoise.expressions import F
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+
+from src.global_utils.background import register_periodic_task
+from src.global_utils.logs import LOGGER
+from src.models.review import Review, ServiceRating
+from src.models.service import Service
+from src.services_g_turismo.facets import FACET_INDEX
+
+REVIEW_PRIOR_MEAN = float(os.getenv('REVIEW_PRIOR_MEAN', '3.5'))
+REVIEW_PRIOR_WEIGHT = float(os.getenv('REVIEW_PRIOR_WEIGHT', '10'))
+REVIEW_RECONCILE_INTERVAL = float(
+    os.getenv('REVIEW_RECONCILE_INTERVAL', '3600')
+)
+REVIEW_RECONCILE_BATCH = 500
+REVIEW_PAGE_SIZE = 20
+REVIEW_WRITE_ATTEMPTS = 3
+
+STARS = range(1, 6)
+AGGREGATE_FIELDS = ('count', 'total') + tuple(f'stars_{s}' for s in STARS)
+
+
+def bayesian_score(count: int, total: int) -> Optional[float]:
+    if count <= 0:
+        return None
+    return (REVIEW_PRIOR_WEIGHT * REVIEW_PRIOR_MEAN + total) / (
+        REVIEW_PRIOR_WEIGHT + count
+    )
+
+
+async def _refresh_scores(
+    connection: BaseDBAsyncClient, service_id: int
+) -> Dict[str, Any]:
+    """Recalcula média e nota bayesiana a partir do agregado (já travado)."""
+    rows = await (
+        ServiceRating.filter(service_id=service_id)
+        .using_db(connection)
+        .values(*AGGREGATE_FIELDS)
+    )
+    aggregate = rows[0]
+    count, total = aggregate['count'], aggregate['total']
+    aggregate['average'] = total / count if count else None
+    aggregate['score'] = bayesian_score(count, total)
+
+    await ServiceRating.filter(service_id=service_id).using_db(
+        connection
+    ).update(average=aggregate['average'], score=aggregate['score'])
+    return aggregate
+
+
+async def _apply_delta(
+    connection: BaseDBAsyncClient,
+    service_id: int,
+    count_delta: int,
+    stars_delta: Dict[int, int],
+) -> Dict[str, Any]:
+    """Soma os deltas no agregado (UPDATE condicional, sem ler antes)."""
+    changes: Dict[str, Any] = {
+        'count': F('count') + count_delta,
+        'total': F('total') + sum(s * d for s, d in stars_delta.items()),
+    }
+    for stars, delta in stars_delta.items():
+        if delta:
+            changes[f'stars_{stars}'] = F(f'stars_{stars}') + delta
+
+    query = ServiceRating.filter(service_id=service_id).using_db(connection)
+    if not await query.update(**changes):
+        # Primeira avaliação do serviço: cria a linha zerada e reaplica
+        try:
+            await ServiceRating.create(
+                service_id=service_id, using_db=connection
+            )
+        except IntegrityError:
+            pass   # outra transação criou a linha primeiro
+        await query.update(**changes)
+
+    return await _refresh_scores(connection, service_id)
+
+
+class ReviewConflict(Exception):
+    """Escritas simultâneas na avaliação esgotaram as tentativas."""
+
+
+async def submit_review(
+    service_id: int, user_id: int, stars: int, comment: str = ''
+) -> Tuple[Review, Dict[str, Any]]:
+    """Cria ou edita a avaliação do usuário. Retorna (avaliação, agregado)."""
+    for attempt in range(1, REVIEW_WRITE_ATTEMPTS + 1):
+        try:
+            review, aggregate = await _save_review(
+                service_id, user_id, stars, comment
+            )
+            break
+        except IntegrityError as e:
+            # Primeira avaliação enviada duas vezes ao mesmo tempo: a outra
+            # criou a linha (não havia o que travar) e esta vira edição
+            error: OperationalError = e
+        except OperationalError as e:
+            # Deadlock (MySQL) ou "database is locked" (SQLite)
+            error = e
+            await asyncio.sleep(0.05 * attempt)
+        if attempt == REVIEW_WRITE_ATTEMPTS:
+            LOGGER.warning(
+                f'[FAIL] Avaliação do serviço {service_id}: {error}'
+            )
+            raise ReviewConflict() from error
+
+    FACET_INDEX.set_rating(service_id, aggregate['average'])
+    return review, aggregate
+
+
+async def _save_review(
+    service_id: int, user_id: int, stars: int, comment: str
+) -> Tuple[Review, Dict[str, Any]]:
+    async with in_transaction('default') as connection:
+        review = await (
+            Review.filter(service_id=service_id, user_id=user_id)
+            .using_db(connection)
+            .select_for_update()
+            .first()
+        )
+        if review is None:
+            review = await Review.create(
+                service_id=service_id,
+                user_id=user_id,
+                stars=stars,
+                comment=comment,
+                using_db=connection,
+            )
+            count_delta, stars_delta = 1, {stars: 1}
+        else:
+            old_stars = review.stars
+            review.stars, review.comment = stars, comment
+            await review.save(using_db=connection)
+            count_delta = 0
+            stars_delta = {old_stars: -1}
+            stars_delta[stars] = stars_delta.get(stars, 0) + 1
+
+        aggregate = await _apply_delta(
+            connection, service_id, count_delta, stars_delta
+        )
+    return review, aggregate
+
+
+async def delete_review(service_id: int, user_id: int) -> bool:
+    """Remove a avaliação do usuário. False se ela não existir."""
+    async with in_transaction('default') as connection:
+        review = await (
+            Review.filter(service_id=service_id, user_id=user_id)
+            .using_db(connection)
+            .select_for_update()
+            .first()
+        )
+        if review is None:
+            return False
+
+        await review.delete(using_db=connection)
+        aggregate = await _apply_delta(
+            connection, service_id, -1, {review.stars: -1}
+        )
+
+    FACET_INDEX.set_rating(service_id, aggregate['average'])
+    return True
+
+
+async def list_reviews(
+    service_id: int,
+    cursor: Optional[int] = None,
+    limit: int = REVIEW_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Avaliações mais novas primeiro, paginadas por cursor (id)."""
+    query = Review.filter(service_id=service_id)
+    if cursor is not None:
+        query = query.filter(id__lt=cursor)
+
+    rows = await query.order_by('-id').limit(limit + 1).values(
+        'id', 'user_id', 'stars', 'comment', 'created_in', 'updated_in'
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]['id']
+    return rows, None
+
+
+async def get_rating(service_id: int) -> Dict[str, Any]:
+    """Agregado do serviço (zerado se ainda não houver avaliações)."""
+    rows = await ServiceRating.filter(service_id=service_id).values(
+        *AGGREGATE_FIELDS, 'average', 'score'
+    )
+    aggregate = rows[0] if rows else dict.fromkeys(AGGREGATE_FIELDS, 0)
+    return {
+        'count': aggregate['count'],
+        'average': aggregate.get('average'),
+        'score': aggregate.get('score'),
+        'histogram': {s: aggregate[f'stars_{s}'] for s in STARS},
+    }
+
+
+# --- Reconciliação ---
+
+
+async def _expected_aggregates(
+    connection: BaseDBAsyncClient, service_ids: List[int]
+) -> Dict[int, Dict[str, int]]:
+    """Agregados recalculados a partir de `reviews` (GROUP BY)."""
+    grouped = await (
+        Review.filter(service_id__in=service_ids)
+        .using_db(connection)
+        .annotate(amount=Count('id'))
+        .group_by('service_id', 'stars')
+        .values('service_id', 'stars', 'amount')
+    )
+    expected: Dict[int, Dict[str, int]] = {}
+    for row in grouped:
+        aggregate = expected.setdefault(
+            row['service_id'], dict.fromkeys(AGGREGATE_FIELDS, 0)
+        )
+        aggregate['count'] += row['amount']
+        aggregate['total'] += row['stars'] * row['amount']
+        aggregate[f'stars_{row["stars"]}'] += row['amount']
+    return expected
+
+
+async def _rewrite_aggregate(service_id: int) -> None:
+    """Regrava o agregado de um serviço com os valores recontados."""
+    async with in_transaction('default') as connection:
+        expected = (
+            await _expected_aggregates(connection, [service_id])
+        ).get(service_id, dict.fromkeys(AGGREGATE_FIELDS, 0))
+
+        query = ServiceRating.filter(service_id=service_id).using_db(
+            connection
+        )
+        if not await query.update(**expected):
+            await ServiceRating.create(
+                service_id=service_id, using_db=connection, **expected
+            )
+        aggregate = await _refresh_scores(connection, service_id)
+
+    FACET_INDEX.set_rating(service_id, aggregate['average'])
+
+
+async def reconcile_ratings(batch: int = REVIEW_RECONCILE_BATCH) -> int:
+    """Confere todos os agregados e corrige os divergentes. Retorna quantos."""
+    from tortoise import connections
+
+    drifted = 0
+    last_id = 0
+    while True:
+        service_ids = (
+            await Service.filter(id__gt=last_id)
+            .order_by('id')
+            .limit(batch)
+            .values_list('id', flat=True)
+        )
+        if not service_ids:
+            return drifted
+
+        expected = await _expected_aggregates(
+            connections.get('default'), service_ids
+        )
+        stored = {
+            row['service_id']: row
+            for row in await ServiceRating.filter(
+                service_id__in=service_ids
+            ).values('service_id', *AGGREGATE_FIELDS)
+        }
+
+        for service_id in service_ids:
+            want = expected.get(service_id)
+            have = stored.get(service_id)
+            if want is None and (have is None or not have['count']):
+                continue
+            want = want or dict.fromkeys(AGGREGATE_FIELDS, 0)
+            if have is None or any(
+                have[field] != want[field] for field in AGGREGATE_FIELDS
+            ):
+                drifted += 1
+                LOGGER.warning(
+                    f'[FAIL] Agregado de avaliações divergente no serviço '
+                    f'{service_id}; recalculando.'
+                )
+                await _rewrite_aggregate(service_id)
+
+        last_id = service_ids[-1]
+
+
+async def _reconcile_task() -> None:
+    drifted = await reconcile_ratings()
+    if drifted:
+        LOGGER.info(f'[OK] {drifted} agregados de avaliações corrigidos.')
+
+
+register_periodic_task(
+    'reconcile-review-aggregates', REVIEW_RECONCILE_INTERVAL, _reconcile_task
+)
@@ -0,0 +1,249 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Annotated, Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, PlainSerializer
+
+from src.models.reservation import ReservationStatus
+from src.models.service import ServiceKind
+
+CENTS = Decimal('0.01')
+
+
+def fixed_price(value: Any) -> str:
+    """Preço em ponto fixo com 2 casas: '400.00', nunca '4E+2'."""
+    return str(Decimal(str(value)).quantize(CENTS))
+
+
+# O banco pode devolver o Decimal normalizado (expoente); no JSON sai fixo
+Price = Annotated[
+    Decimal, PlainSerializer(fixed_price, return_type=str, when_used='json')
+]
+
+
+class ServiceCreate(BaseModel):
+    """Dados para publicar um serviço"""
+
+    kind: ServiceKind
+    title: str = Field(min_length=3, max_length=160)
+    description: str = Field(default='', max_length=10000)
+    city: str = Field(min_length=2, max_length=120)
+    state: Optional[str] = Field(default=None, max_length=60)
+    price: Decimal = Field(ge=0, max_digits=10, decimal_places=2)
+    currency: str = Field(default='BRL', min_length=3, max_length=3)
+    duration_days: int = Field(default=1, ge=1, le=365)
+    amenities: List[str] = Field(default_factory=list, max_length=50)
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+
+
+class ServiceOut(BaseModel):
+    """Serviço como aparece na listagem e no detalhe"""
+
+    id: int
+    owner_id: int
+    kind: ServiceKind
+    title: str
+    description: str
+    city: str
+    state: Optional[str] = None
+    price: Price
+    currency: str
+    duration_days: int = 1
+    amenities: Optional[List[str]] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    created_in: datetime
+    rating: Optional[float] = None
+    rating_score: Optional[float] = None
+    review_count: Optional[int] = None
+
+    model_config = {'from_attributes': True}
+
+
+class ServicePage(BaseModel):
+    """Página da listagem; envie `next_cursor` para buscar a próxima"""
+
+    items: List[ServiceOut]
+    next_cursor: Optional[int] = None
+
+
+class SearchHit(BaseModel):
+    """Resultado da busca textual, com relevância e trecho destacado"""
+
+    id: int
+    owner_id: int
+    kind: ServiceKind
+    title: str
+    city: str
+    state: Optional[str] = None
+    price: Price
+    currency: str
+    created_in: datetime
+    rating: Optional[float] = None
+    rating_score: Optional[float] = None
+    review_count: Optional[int] = None
+    # Relevância: maior = melhor (SQLite e MySQL)
+    score: float
+    snippet: Optional[str] = None
+
+
+class SearchPage(BaseModel):
+    """Página da busca; envie `next_cursor` para buscar a próxima"""
+
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+
+
+class NearHit(ServiceOut):
+    """Serviço encontrado pela busca por proximidade"""
+
+    distance_km: float
+
+
+class NearResult(BaseModel):
+    """Serviços mais próximos, do mais perto para o mais longe"""
+
+    items: List[NearHit]
+    radius_km: float
+
+
+class FacetResult(BaseModel):
+    """Serviços filtrados por facetas e as contagens de cada opção"""
+
+    total: int
+    counts: Dict[str, Dict[str, int]]
+    items: List[ServiceOut]
+    next_cursor: Optional[int] = None
+
+
+class CompareResult(BaseModel):
+    """
+    Comparação lado a lado. `scores` tem uma linha por item e uma coluna
+    por métrica, normalizadas em [0, 1] (1 = melhor); `total` é a média
+    ponderada. `raw` traz os valores originais (None = sem dado).
+    """
+
+    items: List[ServiceOut]
+    metrics: List[str]
+    raw: List[List[Optional[float]]]
+    scores: List[List[float]]
+    total: List[float]
+    amenities_overlap: List[List[float]]
+    missing: List[int]
+
+
+class ReviewCreate(BaseModel):
+    """Avaliação de 1 a 5 estrelas; reenviar substitui a anterior"""
+
+    stars: int = Field(ge=1, le=5)
+    comment: str = Field(default='', max_length=2000)
+
+
+class ReviewOut(BaseModel):
+    """Avaliação como aparece na listagem"""
+
+    id: int
+    user_id: int
+    stars: int
+    comment: str
+    created_in: datetime
+    updated_in: datetime
+
+    model_config = {'from_attributes': True}
+
+
+class ReviewPage(BaseModel):
+    """Página de avaliações; envie `next_cursor` para buscar a próxima"""
+
+    items: List[ReviewOut]
+    next_cursor: Optional[int] = None
+
+
+class RatingSummary(BaseModel):
+    """
+    Agregado das avaliações: média simples, nota bayesiana (`score`, usada
+    para ordenar) e quantidade por número de estrelas.
+    """
+
+    count: int
+    average: Optional[float] = None
+    score: Optional[float] = None
+    histogram: Dict[int, int]
+
+
+class InventoryUpdate(BaseModel):
+    """Capacidade diária de `start` até `end` (exclusivo)"""
+
+    start: date
+    end: date
+    capacity: int = Field(ge=0, le=100000)
+
+
+class DayAvailability(BaseModel):
+    """Vagas de um dia"""
+
+    day: date
+    capacity: int
+    remaining: int
+
+
+class ReservationCreate(BaseModel):
+    """Reserva de `quantity` vagas por dia, de `start` até `end` (saída)"""
+
+    start: date
+    end: date
+    quantity: int = Field(default=1, ge=1, le=50)
+
+
+class ReservationOut(BaseModel):
+    """
+    Reserva. Retida (`held`) até `expires_in`: confirme antes disso ou as
+    vagas voltam ao estoque.
+    """
+
+    token: str
+    service_id: int
+    start_day: date
+    end_day: date
+    quantity: int
+    status: ReservationStatus
+    expires_in: Optional[datetime] = None
+
+
+class SimilarHit(ServiceOut):
+    """Serviço parecido, com a similaridade (cosseno, 0 a 1)"""
+
+    similarity: float
+
+
+class SimilarResult(BaseModel):
+    """Serviços parecidos, do mais para o menos parecido"""
+
+    items: List[SimilarHit]
+    model_built_in: Optional[datetime] = None
+
+
+class FavoriteHit(ServiceOut):
+    """Serviço favoritado"""
+
+    favorited_in: datetime
+
+
+class FavoriteList(BaseModel):
+    """Favoritos do usuário, do mais recente"""
+
+    items: List[FavoriteHit]
+
+
+class HistoryHit(ServiceOut):
+    """Serviço visto, com o total de visualizações do usuário"""
+
+    views: int
+    last_viewed_in: datetime
+
+
+class HistoryList(BaseModel):
+    """Histórico de visualizações, do visto mais recentemente"""
+
+    items: List[HistoryHit]
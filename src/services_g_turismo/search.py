@@ -0,0 +1,135 @@
+"""
+Busca textual no catálogo de serviços.
+
+SQLite: tabela FTS5 `services_fts` (conteúdo externo, mantida por triggers
+em toda inserção/edição/remoção de `services`), tokenizer `unicode61` com
+`remove_diacritics 2` (“sao paulo” encontra “São Paulo”), ordenação por
+BM25 e trecho destacado com `snippet()`.
+
+MySQL: índice FULLTEXT com MATCH ... AGAINST (sem trecho destacado).
+
+A paginação usa cursor sobre (relevância, id), então páginas profundas não
+pagam OFFSET. O schema é criado pela migração 3 (src/database/migrations.py).
+"""
+import base64
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from tortoise import connections
+
+from src.database.router import choose_read_connection
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+SEARCH_MAX_TERMS = 8
+# Cursor da primeira página (MySQL não aceita infinito como parâmetro)
+_FIRST_PAGE_SCORE = 1e308
+
+# Pesos do BM25 por coluna: title, description, city, state
+_BM25_WEIGHTS = '10.0, 1.0, 5.0, 2.0'
+_RESULT_COLUMNS = (
+    's.id, s.owner_id, s.kind, s.title, s.city, s.state, s.price, '
+    's.currency, s.created_in, '
+    'sr.average AS rating, sr.score AS rating_score, sr.count AS review_count'
+)
+# Nota lida do agregado (src/services_g_turismo/reviews.py)
+_RATING_JOIN = 'LEFT JOIN service_ratings sr ON sr.service_id = s.id'
+
+# Relevância (`score`): maior = melhor nos dois bancos. O BM25 do SQLite
+# é negativo (menor = melhor), então sai negado; o MATCH do MySQL já é
+# positivo. O desempate é o id.
+#
+# No SQLite a subconsulta precisa ser materializada: achatada, o filtro do
+# cursor avaliaria bm25() fora da consulta FTS e a página seguinte viria
+# errada.
+SQLITE_SEARCH_SQL = f"""
+WITH ranked AS MATERIALIZED (
+    SELECT {_RESULT_COLUMNS},
+        -bm25(services_fts, {_BM25_WEIGHTS}) AS score,
+        snippet(services_fts, 1, '<mark>', '</mark>', '…', 16) AS snippet
+    FROM services_fts
+    JOIN services s ON s.id = services_fts.rowid
+    {_RATING_JOIN}
+    WHERE services_fts MATCH ? AND s.published = 1
+)
+SELECT * FROM ranked
+WHERE score < ? OR (score = ? AND id > ?)
+ORDER BY score DESC, id
+LIMIT ?
+"""
+
+MYSQL_SEARCH_SQL = f"""
+SELECT * FROM (
+    SELECT {_RESULT_COLUMNS},
+        MATCH (s.title, s.description, s.city, s.state)
+            AGAINST (%s IN NATURAL LANGUAGE MODE) AS score,
+        NULL AS snippet
+    FROM services s
+    {_RATING_JOIN}
+    WHERE MATCH (s.title, s.description, s.city, s.state)
+            AGAINST (%s IN NATURAL LANGUAGE MODE)
+        AND s.published = 1
+) AS ranked
+WHERE score < %s OR (score = %s AND id > %s)
+ORDER BY score DESC, id
+LIMIT %s
+"""
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    Converte o texto digitado numa consulta FTS5 segura: cada palavra vira
+    um termo entre aspas (sem operadores do usuário) e a última aceita
+    prefixo, para a busca funcionar enquanto o usuário digita.
+    """
+    terms = _TERM.findall(text)[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def encode_cursor(score: float, service_id: int) -> str:
+    raw = f'{score!r}:{service_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Levanta ValueError se o cursor for inválido."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    score, service_id = base64.urlsafe_b64decode(padded).decode().split(':')
+    return float(score), int(service_id)
+
+
+async def search_services(
+    text: str,
+    cursor: Optional[str] = None,
+    limit: int = SEARCH_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Uma página de resultados e o cursor da próxima (None no fim)."""
+    query = fts_query(text)
+    if query is None:
+        return [], None
+    limit = max(1, min(limit, SEARCH_MAX_PAGE_SIZE))
+
+    score, last_id = (
+        decode_cursor(cursor) if cursor else (_FIRST_PAGE_SCORE, 0)
+    )
+    connection = connections.get(choose_read_connection())
+    if connection.capabilities.dialect == 'mysql':
+        words = ' '.join(_TERM.findall(text)[:SEARCH_MAX_TERMS])
+        rows = await connection.execute_query_dict(
+            MYSQL_SEARCH_SQL, [words, words, score, score, last_id, limit + 1]
+        )
+    else:
+        rows = await connection.execute_query_dict(
+            SQLITE_SEARCH_SQL, [query, score, score, last_id, limit + 1]
+        )
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1]['score'], rows[-1]['id'])
+    return rows, None